@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Benchmark the soft delete hot paths against a local PostgreSQL database.
+
+For every size, a synthetic manual model ``x_sd_bench_<size>`` is created and
+filled with ``size`` rows, soft delete is enabled on it, then each operation is
+timed and its SQL queries are counted. The results are written as JSON and can
+be compared with a stored baseline.
+
+The script writes to the database: always run it against a disposable one.
+
+    python benchmarks/soft_delete_bench.py -d bench_db --addons-path=/opt/odoo/addons,. \\
+        --sizes 10000,100000,1000000 --report report.json --baseline baseline.json
+
+Exit status is 1 when a query count grows with the number of rows faster than
+the operation allows, or when an operation is slower than the baseline by more
+than --max-slowdown.
+"""
+import argparse
+import json
+import logging
+import math
+import platform
+import sys
+import time
+from contextlib import contextmanager
+
+import odoo
+from odoo import api, SUPERUSER_ID
+
+_logger = logging.getLogger('soft_delete_bench')
+
+# Extra queries allowed per 1000 rows: 0 means the query count must not depend on
+# the number of rows. ORM writes, name_get() and unlink() work in chunks of
+# cr.IN_MAX (1000) ids, hence a bounded allowance for those operations.
+QUERY_ALLOWANCE_PER_1000_ROWS = {
+    'set_values': 0,
+    'dashboard_init': 0,
+    'reconcile_counters': 0,
+    'patched_unlink': 10,
+    'populate_wizard_records': 10,
+    'restore_records': 10,
+    'permanent_delete_records': 25,
+}
+
+
+class Measure:
+    def __init__(self):
+        self.results = {}
+
+    @contextmanager
+    def __call__(self, env, operation, rows):
+        cr = env.cr
+        queries_before = cr.sql_log_count
+        start = time.perf_counter()
+        yield
+        env.flush_all()
+        self.results[operation] = {
+            'seconds': round(time.perf_counter() - start, 4),
+            'queries': cr.sql_log_count - queries_before,
+            'rows': rows,
+        }
+        _logger.info("%-26s rows=%-8s %8.3fs %6d queries", operation, rows,
+                     self.results[operation]['seconds'], self.results[operation]['queries'])
+
+
+def create_synthetic_model(env, size):
+    """Create (or reuse) a manual model with ``size`` rows and return its name."""
+    model_name = f'x_sd_bench_{size}'
+    IrModel = env['ir.model']
+    if not IrModel.search([('model', '=', model_name)]):
+        IrModel.create({
+            'name': f'Soft Delete Bench {size}',
+            'model': model_name,
+            'state': 'manual',
+            'field_id': [(0, 0, {'name': 'x_name', 'field_description': 'Name', 'ttype': 'char'})],
+        })
+    table = env[model_name]._table
+    env.cr.execute(f'TRUNCATE "{table}"')
+    env.cr.execute(f"""
+        INSERT INTO "{table}" (x_name, create_uid, write_uid, create_date, write_date)
+        SELECT 'Record ' || g, %s, %s, now() at time zone 'UTC', now() at time zone 'UTC'
+        FROM generate_series(1, %s) g
+    """, (SUPERUSER_ID, SUPERUSER_ID, size))
+    env.cr.execute(f'ANALYZE "{table}"')
+    return model_name
+
+
+def run_size(registry, size):
+    measure = Measure()
+    with registry.cursor() as cr:
+        env = api.Environment(cr, SUPERUSER_ID, {})
+        model_name = create_synthetic_model(env, size)
+        model_id = env['ir.model']._get_id(model_name)
+
+        settings = env['res.config.settings'].create({'model_ids': [(6, 0, [model_id])]})
+        with measure(env, 'set_values', size):
+            settings.set_values()
+        cr.commit()  # builds the indexes (post-commit)
+
+    with registry.cursor() as cr:
+        env = api.Environment(cr, SUPERUSER_ID, {'soft_delete_job_running': True})
+        Settings = env['res.config.settings']
+        Model = env[model_name].with_context(active_test=False)
+        wizard_model_name = f"x_{model_name.replace('.', '_')}_wizard"
+
+        records = Model.search([])
+        with measure(env, 'patched_unlink', size):
+            records.unlink()
+        cr.commit()
+
+        with measure(env, 'populate_wizard_records', size):
+            Settings.populate_wizard_records(model_name, wizard_model_name)
+        cr.commit()
+
+        with measure(env, 'dashboard_init', size):
+            env['soft.delete.manager.all.modules'].init()
+
+        with measure(env, 'reconcile_counters', size):
+            env['soft.delete.counter']._reconcile_counters([model_name])
+        cr.commit()
+
+        ids = Model.search([('x_is_deleted', '=', True)]).ids
+        with measure(env, 'restore_records', size):
+            Settings.restore_records(model_name, ids)
+        cr.commit()
+
+        Model.browse(ids).unlink()
+        cr.commit()
+        env.invalidate_all()
+        with measure(env, 'permanent_delete_records', size):
+            Settings.permanent_delete_records(model_name, ids)
+        cr.commit()
+
+    return measure.results
+
+
+def check_scaling(report):
+    """Return the operations whose query count grows with N beyond their allowance."""
+    failures = []
+    sizes = sorted(int(size) for size in report['results'])
+    if len(sizes) < 2:
+        return failures
+    smallest = report['results'][str(sizes[0])]
+    for size in sizes[1:]:
+        results = report['results'][str(size)]
+        for operation, allowance in QUERY_ALLOWANCE_PER_1000_ROWS.items():
+            if operation not in results or operation not in smallest:
+                continue
+            allowed = smallest[operation]['queries'] + allowance * math.ceil((size - sizes[0]) / 1000)
+            if results[operation]['queries'] > allowed:
+                failures.append(
+                    f"{operation}: {results[operation]['queries']} queries at N={size}, "
+                    f"at most {allowed} allowed ({smallest[operation]['queries']} at N={sizes[0]})"
+                )
+    return failures
+
+
+def compare_with_baseline(report, baseline, max_slowdown):
+    """Return the operations slower than the baseline by more than ``max_slowdown``, or issuing more queries."""
+    failures = []
+    for size, results in report['results'].items():
+        for operation, result in results.items():
+            reference = baseline.get('results', {}).get(size, {}).get(operation)
+            if not reference:
+                continue
+            if result['queries'] > reference['queries']:
+                failures.append(
+                    f"{operation} N={size}: {result['queries']} queries, baseline {reference['queries']}"
+                )
+            if reference['seconds'] and result['seconds'] > reference['seconds'] * max_slowdown:
+                failures.append(
+                    f"{operation} N={size}: {result['seconds']}s, baseline {reference['seconds']}s"
+                )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-d', '--database', required=True, help='disposable database with the module installed')
+    parser.add_argument('--addons-path', help='Odoo addons path, including this repository')
+    parser.add_argument('-c', '--config', help='Odoo configuration file')
+    parser.add_argument('--sizes', default='10000,100000,1000000', help='comma separated row counts')
+    parser.add_argument('--report', default='soft_delete_bench.json', help='where to write the JSON report')
+    parser.add_argument('--baseline', help='JSON report to compare with')
+    parser.add_argument('--max-slowdown', type=float, default=1.5, help='allowed duration ratio against the baseline')
+    args = parser.parse_args()
+
+    odoo_args = ['-d', args.database]
+    if args.config:
+        odoo_args += ['-c', args.config]
+    if args.addons_path:
+        odoo_args += [f'--addons-path={args.addons_path}']
+    odoo.tools.config.parse_config(odoo_args)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    registry = odoo.registry(args.database)
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+
+    report = {
+        'meta': {
+            'odoo': odoo.release.version,
+            'python': platform.python_version(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'sizes': sizes,
+        },
+        'results': {},
+    }
+    for size in sizes:
+        _logger.info("Benchmarking N=%s", size)
+        report['results'][str(size)] = run_size(registry, size)
+
+    failures = check_scaling(report)
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            failures += compare_with_baseline(report, json.load(baseline_file), args.max_slowdown)
+    report['failures'] = failures
+
+    with open(args.report, 'w') as report_file:
+        json.dump(report, report_file, indent=2, sort_keys=True)
+    _logger.info("Report written to %s", args.report)
+
+    for failure in failures:
+        _logger.error(failure)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
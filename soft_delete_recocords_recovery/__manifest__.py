@@ -17,16 +17,28 @@
     'depends': ['base', 'web'],
     'data': [
         'security/ir.model.access.csv',
-        'views/soft_delete_config_settings_views.xml',
+        'data/soft_delete_cron.xml',
         'views/base_module_uninstall_views_inherit.xml',
         'views/soft_delete_manager_all_modules_view.xml',
+        'views/soft_delete_index_views.xml',
+        'views/soft_delete_job_views.xml',
+        'views/soft_delete_model_policy_views.xml',
+        'views/soft_delete_journal_views.xml',
+        'views/soft_delete_slow_operation_views.xml',
+        'views/soft_delete_cleanup_report_views.xml',
+        'views/soft_delete_bulk_restore_views.xml',
+        'views/soft_delete_export_views.xml',
+        'views/soft_delete_config_settings_views.xml',
     ],
     'assets': {
         'web.assets_backend': [
+            'soft_delete_recocords_recovery/static/src/js/soft_delete_deleted_count.js',
             'soft_delete_recocords_recovery/static/src/js/soft_delete_kanban_view_header_button.js',
             'soft_delete_recocords_recovery/static/src/js/soft_delete_tree_view_header_button.js',
+            'soft_delete_recocords_recovery/static/src/js/soft_delete_recovery_browser.js',
             'soft_delete_recocords_recovery/static/src/xml/soft_delete_kanban_view_header_button.xml',
             'soft_delete_recocords_recovery/static/src/xml/soft_delete_tree_view_header_button.xml',
+            'soft_delete_recocords_recovery/static/src/xml/soft_delete_recovery_browser.xml',
         ],
     },
     'images': [
@@ -0,0 +1,15 @@
+from odoo import http
+from odoo.http import request
+
+
+class SoftDeleteController(http.Controller):
+
+    @http.route('/soft_delete_recocords_recovery/recover', type='json', auth='user')
+    def recover(self, model, view_type='list'):
+        """Single round trip of the Recover button: returns the action to open and the deleted count."""
+        return request.env['soft.delete.recovery.browser'].get_recover_action(model, view_type)
+
+    @http.route('/soft_delete_recocords_recovery/deleted_counts', type='json', auth='user')
+    def deleted_counts(self, models):
+        """Deleted counts of the header badges, for many models in one call."""
+        return request.env['soft.delete.counter'].get_deleted_counts(models)
@@ -1,14 +1,71 @@
 from odoo import api, SUPERUSER_ID
+from .models.soft_delete_purge import _iter_id_chunks, _process_chunk
 import logging
+import time
 
 _logger = logging.getLogger(__name__)
 
+DEFAULT_CHUNK_SIZE = 1000
+# soft.delete.progress keys of the uninstall restores
+PROGRESS_PREFIX = 'uninstall:'
+
+
+def _save_progress(env, key, last_id):
+    env['soft.delete.progress'].sudo()._set(key, last_id)
+    # Commit each chunk so that an interrupted uninstall resumes where it stopped
+    if not env.registry.in_test_mode():
+        env.cr.commit()
+
+
+def _restore_model(env, model_name, chunk_size):
+    """Restore the soft-deleted records of a model."""
+    Model = env[model_name].sudo().with_context(
+        active_test=False, soft_delete_include_deleted=True, soft_delete_job_running=True)
+    settings = env['res.config.settings'].sudo().with_context(soft_delete_job_running=True)
+    Journal = env['soft.delete.journal'].sudo()
+    key = f"{PROGRESS_PREFIX}restore:{model_name}"
+    last_id = env['soft.delete.progress'].sudo()._get(key)
+
+    if Journal._is_journal_model(model_name):
+        query = """
+            SELECT record_id FROM soft_delete_journal
+            WHERE model = %s AND NOT is_cascade AND record_id > %s
+            ORDER BY record_id LIMIT %s
+        """
+        params = [model_name]
+
+        def operation(ids):
+            Journal._restore(model_name, ids)
+    else:
+        Model.flush_model(['x_is_deleted'])
+        query = f'SELECT id FROM "{Model._table}" WHERE x_is_deleted AND id > %s ORDER BY id LIMIT %s'
+        params = []
+        restore_vals = settings._get_restore_vals(Model)
+
+        def operation(ids):
+            Model.browse(ids).write(restore_vals)
+
+    done = skipped = 0
+    start = time.perf_counter()
+    for ids in _iter_id_chunks(env, query, params, last_id, chunk_size):
+        skipped_ids = _process_chunk(env, operation, model_name, ids)
+        done += len(ids) - len(skipped_ids)
+        skipped += len(skipped_ids)
+        _save_progress(env, key, ids[-1])
+        duration = time.perf_counter() - start
+        _logger.info(
+            f"Uninstall: restore {model_name}: {done} done, {skipped} skipped, "
+            f"{done / duration if duration else 0:.1f} rows/s"
+        )
+
+
 def uninstall_hook(cr, registry):
     env = api.Environment(cr, SUPERUSER_ID, {})
     _logger.info("Running soft delete uninstall cleanup")
 
     try:
         ICPSudo = env['ir.config_parameter'].sudo()
+        chunk_size = int(ICPSudo.get_param('soft_delete_recocords_recovery.job_chunk_size', DEFAULT_CHUNK_SIZE)) or DEFAULT_CHUNK_SIZE
 
         # Get saved values
         model_ids_str = ICPSudo.get_param('soft_delete_recocords_recovery.model_ids', '')
@@ -17,27 +74,28 @@ def uninstall_hook(cr, registry):
         recover_ids_str = ICPSudo.get_param('soft_delete_recocords_recovery.specific_models_recover', '')
         recover_model_ids = [int(x) for x in recover_ids_str.split(',') if x.strip().isdigit()]
 
-        # Recover selected
-        for model in env['ir.model'].browse(recover_model_ids):
-            if model.model in env and 'x_is_deleted' in env[model.model]._fields:
-                env[model.model].sudo().search([('x_is_deleted', '=', True)]).write({'x_is_deleted': False})
-
-        # Permanent delete others
-        for model in env['ir.model'].browse(all_model_ids):
-            if model.id in recover_model_ids:
+        # Recover selected, permanent delete others
+        purge_model_names = []
+        for model in env['ir.model'].browse(list(dict.fromkeys(all_model_ids + recover_model_ids))).exists():
+            if model.model not in env or 'x_is_deleted' not in env[model.model]._fields:
                 continue
-            if model.model in env and 'x_is_deleted' in env[model.model]._fields:
-                records = env[model.model].sudo().search([('x_is_deleted', '=', True)])
-                if records:
-                    try:
-                        records.unlink()
-                    except:
-                        table = model.model.replace('.', '_')
-                        cr.execute(f"DELETE FROM {table} WHERE x_is_deleted = TRUE")
+            if model.id in recover_model_ids:
+                _restore_model(env, model.model, chunk_size)
+            elif not env['soft.delete.journal']._is_journal_model(model.model):
+                purge_model_names.append(model.model)
+
+        # Independent models are purged in parallel, the journal table is dropped with the module.
+        # The workers use their own cursors: they must see the restores above.
+        if not env.registry.in_test_mode():
+            env.cr.commit()
+        report = env['soft.delete.purge'].purge(purge_model_names, chunk_size)
+        if report['failed']:
+            _logger.warning(f"Uninstall: purge failed for {report['failed']}, their deleted records are kept")
 
         # Run cleanup
         env['res.config.settings'].sudo().create({}).action_cleanup_soft_delete()
+        env['soft.delete.progress'].sudo()._clear_prefix(PROGRESS_PREFIX)
 
     except Exception as e:
         _logger.error(f"Uninstall hook error: {e}")
-        raise
\ No newline at end of file
+        raise
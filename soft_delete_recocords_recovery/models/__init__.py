@@ -1,4 +1,21 @@
 from . import soft_delete_config_settings
 from . import soft_delete_mixin
+from . import soft_delete_slow_operation
 from . import base_module_uninstall_inherit
+from . import base_inherit
+from . import soft_delete_counter
 from . import soft_delete_manager_all_modules
+from . import soft_delete_wizard_sync
+from . import soft_delete_index
+from . import soft_delete_recovery_browser
+from . import soft_delete_job
+from . import soft_delete_model_policy
+from . import soft_delete_journal
+from . import soft_delete_cleanup
+from . import soft_delete_cascade
+from . import soft_delete_bulk_restore
+from . import soft_delete_purge
+from . import soft_delete_export
+from . import soft_delete_trigger
+from . import soft_delete_restore_check
+from . import soft_delete_progress
@@ -0,0 +1,27 @@
+from odoo import models, api
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class Base(models.AbstractModel):
+    _inherit = 'base'
+
+    @api.model
+    def _where_calc(self, domain, active_test=True):
+        """
+        Exclude soft-deleted rows from every search on the enabled models: name_search,
+        read_group, search_count, related searches, API clients...
+
+        Searches whose domain filters on x_is_deleted themselves, or run with the
+        ``soft_delete_include_deleted`` context key (recovery screens), are left untouched.
+        """
+        query = super()._where_calc(domain, active_test)
+        if (
+            'x_is_deleted' in self._fields
+            and not self._context.get('soft_delete_include_deleted')
+            and self._name in self.env['res.config.settings']._get_enabled_model_names()
+            and not any(isinstance(leaf, (list, tuple)) and leaf[0] == 'x_is_deleted' for leaf in domain or [])
+        ):
+            query.add_where(f'"{self._table}"."x_is_deleted" IS NOT TRUE')
+        return query
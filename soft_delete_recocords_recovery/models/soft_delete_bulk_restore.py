@@ -0,0 +1,355 @@
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+from markupsafe import Markup, escape
+import logging
+import time
+
+from .soft_delete_cascade import METADATA_FIELDS
+from .soft_delete_slow_operation import soft_delete_profiler
+
+_logger = logging.getLogger(__name__)
+
+
+class _RollbackProbe(Exception):
+    """Raised to roll back the savepoint of a trial re-insert."""
+
+
+class SoftDeleteBulkRestore(models.AbstractModel):
+    _name = 'soft.delete.bulk.restore'
+    _description = 'Soft Delete Bulk Restore Engine'
+
+    @api.model
+    def _check_predicate(self, date_from=False, date_to=False, user_id=False, batch_id=False):
+        if not (date_from or date_to or user_id or batch_id):
+            raise UserError(_("Set a deletion period, a user or a deletion batch to select the records to restore."))
+        if date_from and date_to and date_from > date_to:
+            raise UserError(_("The start of the deletion period must be before its end."))
+
+    @api.model
+    def _get_restore_order(self, model_names):
+        """
+        Sort ``model_names`` so that the targets of stored many2one fields come before
+        the models referencing them: parents are restored before their children.
+        Models in a reference cycle keep the alphabetical order.
+        """
+        model_names = sorted(set(model_names))
+        parents = {
+            model_name: {
+                field.comodel_name for field in self.env[model_name]._fields.values()
+                if field.type == 'many2one' and field.store
+                and field.comodel_name in model_names and field.comodel_name != model_name
+            }
+            for model_name in model_names
+        }
+        ordered = []
+        while parents:
+            ready = [model_name for model_name, deps in parents.items() if not deps - set(ordered)]
+            if not ready:
+                _logger.warning(f"Reference cycle between {sorted(parents)}, restoring them in alphabetical order")
+                ready = sorted(parents)
+            for model_name in ready:
+                ordered.append(model_name)
+                del parents[model_name]
+        return ordered
+
+    @api.model
+    def _get_model_names(self, model_names=None):
+        """Enabled models with deletion metadata, in restore order."""
+        enabled = self.env['res.config.settings']._get_enabled_model_names()
+        model_names = [
+            name for name in (model_names or enabled)
+            if name in enabled and name in self.env
+            and all(field in self.env[name]._fields for field in METADATA_FIELDS)
+        ]
+        return self._get_restore_order(model_names)
+
+    @api.model
+    def _where_clause(self, date_from=False, date_to=False, user_id=False, batch_id=False):
+        """SQL condition and parameters selecting the soft-deleted rows matching the predicate."""
+        clauses, params = ['x_is_deleted'], []
+        if date_from:
+            clauses.append('x_deleted_at >= %s')
+            params.append(date_from)
+        if date_to:
+            clauses.append('x_deleted_at <= %s')
+            params.append(date_to)
+        if user_id:
+            clauses.append('x_deleted_by = %s')
+            params.append(user_id)
+        if batch_id:
+            clauses.append('x_delete_batch_id = %s')
+            params.append(batch_id)
+        return ' AND '.join(clauses), params
+
+    @api.model
+    def _journal_domain(self, model_name, date_from=False, date_to=False, user_id=False, batch_id=False):
+        domain = [('model', '=', model_name), ('is_cascade', '=', False)]
+        if date_from:
+            domain.append(('deleted_at', '>=', date_from))
+        if date_to:
+            domain.append(('deleted_at', '<=', date_to))
+        if user_id:
+            domain.append(('deleted_by', '=', user_id))
+        if batch_id:
+            domain.append(('batch_id', '=', batch_id))
+        return domain
+
+    @api.model
+    def _filter_allowed(self, model_name, record_ids):
+        """Keep the soft-deleted ``record_ids`` the user may write according to the record rules."""
+        if self.env.su or not record_ids or not self.env['ir.rule']._compute_domain(model_name, 'write'):
+            return record_ids
+        Model = self.env[model_name].with_context(active_test=False, soft_delete_include_deleted=True)
+        return Model.browse(record_ids)._filter_access_rules('write').ids
+
+    @api.model
+    def _filter_allowed_journal(self, model_name, record_ids):
+        """
+        Journaled rows are not in the table, so the record rules cannot be evaluated
+        on them there: re-insert them under a savepoint, filter, then roll back.
+        """
+        if self.env.su or not record_ids or not self.env['ir.rule']._compute_domain(model_name, 'write'):
+            return record_ids
+        allowed = []
+        try:
+            with self.env.cr.savepoint():
+                self.env['soft.delete.journal'].sudo()._restore(model_name, record_ids)
+                allowed = self._filter_allowed(model_name, record_ids)
+                raise _RollbackProbe()
+        except _RollbackProbe:
+            pass
+        except Exception as e:
+            # Nothing is restored when the rules cannot be evaluated
+            _logger.warning(f"Could not evaluate the record rules of journaled {model_name} records: {e}")
+        self.env.invalidate_all()
+        return allowed
+
+    @api.model
+    def _select_ids(self, model_name, where, params, last_id=0, limit=0):
+        """Ids of the soft-deleted rows matching the predicate, after ``last_id``."""
+        Model = self.env[model_name]
+        limit = f'LIMIT {int(limit)}' if limit else ''
+        self.env.cr.execute(
+            f'SELECT id FROM "{Model._table}" WHERE {where} AND id > %s ORDER BY id {limit}', params + [last_id])
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    @api.model
+    def preview(self, date_from=False, date_to=False, user_id=False, batch_id=False, model_names=None):
+        """
+        Return [(model, number of records to restore)] in restore order, without changing
+        anything. Only the records the user may write are counted.
+        """
+        self._check_predicate(date_from, date_to, user_id, batch_id)
+        Journal = self.env['soft.delete.journal'].sudo()
+        where, params = self._where_clause(date_from, date_to, user_id, batch_id)
+        counts = []
+        for model_name in self._get_model_names(model_names):
+            has_rules = not self.env.su and self.env['ir.rule']._compute_domain(model_name, 'write')
+            if Journal._is_journal_model(model_name):
+                entries = Journal.search(self._journal_domain(model_name, date_from, date_to, user_id, batch_id))
+                record_ids = entries.mapped('record_id')
+                if has_rules:
+                    restorable = self.env['soft.delete.restore.check'].sudo()._classify(model_name, record_ids)['restorable']
+                    record_ids = self._filter_allowed_journal(model_name, restorable)
+                count = len(record_ids)
+            else:
+                Model = self.env[model_name]
+                Model.flush_model(METADATA_FIELDS)
+                if has_rules:
+                    count = len(self._filter_allowed(model_name, self._select_ids(model_name, where, params)))
+                else:
+                    self.env.cr.execute(f'SELECT COUNT(*) FROM "{Model._table}" WHERE {where}', params)
+                    count = self.env.cr.fetchone()[0]
+            if count:
+                counts.append((model_name, count))
+        return counts
+
+    @api.model
+    def restore(self, date_from=False, date_to=False, user_id=False, batch_id=False, model_names=None, chunk_size=0):
+        """
+        Restore the soft-deleted records of every enabled model matching a deletion
+        period, a deleting user and/or a deletion batch.
+
+        Models are restored in dependency order, each with set-based UPDATEs. The rows
+        the user may not write according to the record rules, and those the restore
+        pre-check finds conflicting or orphaned, are skipped. With ``chunk_size`` the
+        rows are restored ``chunk_size`` at a time and each chunk is committed;
+        otherwise the whole restore runs in the current transaction.
+
+        Returns {'models': [{'model', 'restored', 'skipped', 'duration_ms'}], 'total',
+        'skipped', 'duration_ms'}.
+        """
+        self._check_predicate(date_from, date_to, user_id, batch_id)
+        start = time.perf_counter()
+        lines = []
+        with soft_delete_profiler(self.env, 'bulk_restore') as profiler:
+            for model_name in self._get_model_names(model_names):
+                self.env[model_name].check_access_rights('write')
+                model_start = time.perf_counter()
+                with profiler.phase(model_name) as stats:
+                    stats['rows'], skipped = self._restore_model(
+                        model_name, date_from, date_to, user_id, batch_id, chunk_size)
+                if stats['rows'] or skipped:
+                    lines.append({
+                        'model': model_name,
+                        'restored': stats['rows'],
+                        'skipped': skipped,
+                        'duration_ms': round((time.perf_counter() - model_start) * 1000, 1),
+                    })
+            profiler.rows = sum(line['restored'] for line in lines)
+
+        result = {
+            'models': lines,
+            'total': profiler.rows,
+            'skipped': sum(line['skipped'] for line in lines),
+            'duration_ms': round((time.perf_counter() - start) * 1000, 1),
+        }
+        _logger.info(
+            f"Bulk restored {result['total']} records in {len(lines)} models in {result['duration_ms']:.0f}ms, "
+            f"{result['skipped']} skipped"
+        )
+        return result
+
+    @api.model
+    def _restore_model(self, model_name, date_from, date_to, user_id, batch_id, chunk_size=0):
+        """
+        Restore the matching rows of one model the user may write and the pre-check
+        lets through. Returns (number of restored records, number of skipped records).
+        """
+        cr = self.env.cr
+        Check = self.env['soft.delete.restore.check'].sudo()
+        Journal = self.env['soft.delete.journal'].sudo()
+        if Journal._is_journal_model(model_name):
+            entries = Journal.search(self._journal_domain(model_name, date_from, date_to, user_id, batch_id))
+            record_ids = entries.mapped('record_id')
+            if not record_ids:
+                return 0, 0
+            size = chunk_size or len(record_ids)
+            restored = skipped = 0
+            for chunk_start in range(0, len(record_ids), size):
+                chunk = record_ids[chunk_start:chunk_start + size]
+                # Pre-check first: the record rules are evaluated on a trial re-insert, which must not conflict
+                restorable = self._filter_allowed_journal(model_name, Check._classify(model_name, chunk)['restorable'])
+                if restorable:
+                    restored += Journal._restore(model_name, restorable)
+                skipped += len(chunk) - len(restorable)
+                self._commit_chunk(chunk_size)
+            return restored, skipped
+
+        Model = self.env[model_name]
+        Model.flush_model(METADATA_FIELDS)
+        where, params = self._where_clause(date_from, date_to, user_id, batch_id)
+        ir_model_id = self.env['ir.model']._get_id(model_name)
+        wizard_model_name = f"x_{model_name.replace('.', '_')}_wizard"
+        restored = skipped = last_id = 0
+        while True:
+            # Keyset pagination: the skipped rows stay deleted and must not be selected again
+            record_ids = self._select_ids(model_name, where, params, last_id, chunk_size)
+            if not record_ids:
+                break
+            last_id = record_ids[-1]
+            restorable = Check._classify(model_name, self._filter_allowed(model_name, record_ids))['restorable']
+            skipped += len(record_ids) - len(restorable)
+            if restorable:
+                cr.execute(f"""
+                    UPDATE "{Model._table}"
+                    SET x_is_deleted = FALSE,
+                        x_deleted_at = NULL,
+                        x_deleted_by = NULL,
+                        x_delete_batch_id = NULL,
+                        write_uid = %s,
+                        write_date = now() at time zone 'UTC'
+                    WHERE id = ANY(%s) AND x_is_deleted
+                    RETURNING id
+                """, (self.env.uid, restorable))
+                ids = [row[0] for row in cr.fetchall()]
+                restored += len(ids)
+                self.env['soft.delete.counter'].sudo()._apply_delta(model_name, -len(ids))
+                if wizard_model_name in self.env:
+                    cr.execute(
+                        f'DELETE FROM "{self.env[wizard_model_name]._table}" WHERE x_model_id = %s AND x_record_id = ANY(%s)',
+                        (ir_model_id, ids))
+            self._commit_chunk(chunk_size)
+            if not chunk_size:
+                break
+        Model.invalidate_model(METADATA_FIELDS + ['write_uid', 'write_date'])
+        if wizard_model_name in self.env:
+            self.env[wizard_model_name].invalidate_model()
+        if skipped:
+            _logger.warning(f"Bulk restore of {model_name}: {skipped} records skipped by the record rules or the pre-check")
+        return restored, skipped
+
+    @api.model
+    def _commit_chunk(self, chunk_size):
+        # Chunked restores keep what is done when a later chunk fails
+        if chunk_size and not self.env.registry.in_test_mode():
+            self.env.cr.commit()
+
+
+class SoftDeleteBulkRestoreWizard(models.TransientModel):
+    _name = 'soft.delete.bulk.restore.wizard'
+    _description = 'Soft Delete Bulk Restore'
+
+    date_from = fields.Datetime(string='Deleted From')
+    date_to = fields.Datetime(string='Deleted To')
+    user_id = fields.Many2one('res.users', string='Deleted By')
+    batch_id = fields.Char(string='Deletion Batch')
+    model_ids = fields.Many2many(
+        'ir.model', string='Models',
+        help='Restrict the restore to these models. Leave empty to restore every enabled model.'
+    )
+    chunk_size = fields.Integer(
+        string='Chunk Size', default=0,
+        help='Restore and commit this many records at a time. 0 restores everything in one transaction.'
+    )
+    state = fields.Selection([('draft', 'Draft'), ('preview', 'Preview'), ('done', 'Done')], default='draft')
+    summary_html = fields.Html(string='Summary', readonly=True, sanitize=False)
+
+    def _get_predicate(self):
+        self.ensure_one()
+        return {
+            'date_from': self.date_from,
+            'date_to': self.date_to,
+            'user_id': self.user_id.id,
+            'batch_id': (self.batch_id or '').strip() or False,
+            'model_names': self.model_ids.mapped('model') or None,
+        }
+
+    @api.model
+    def _render(self, header, rows):
+        return Markup('<table class="table table-sm"><thead><tr>%s</tr></thead><tbody>%s</tbody></table>') % (
+            Markup('').join(Markup('<th>%s</th>') % escape(title) for title in header),
+            Markup('').join(
+                Markup('<tr>%s</tr>') % Markup('').join(Markup('<td>%s</td>') % value for value in row)
+                for row in rows
+            ),
+        )
+
+    def _reopen(self):
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Bulk Restore'),
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+    def action_preview(self):
+        counts = self.env['soft.delete.bulk.restore'].preview(**self._get_predicate())
+        self.write({
+            'state': 'preview',
+            'summary_html': self._render([_('Model'), _('Records to Restore')], counts) if counts
+            else _("No deleted record matches."),
+        })
+        return self._reopen()
+
+    def action_restore(self):
+        result = self.env['soft.delete.bulk.restore'].restore(chunk_size=self.chunk_size, **self._get_predicate())
+        rows = [(line['model'], line['restored'], line['skipped'], line['duration_ms']) for line in result['models']]
+        rows.append((_('Total'), result['total'], result['skipped'], result['duration_ms']))
+        self.write({
+            'state': 'done',
+            'summary_html': self._render([_('Model'), _('Restored'), _('Skipped'), _('Duration (ms)')], rows),
+        })
+        return self._reopen()
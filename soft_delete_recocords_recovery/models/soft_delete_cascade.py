@@ -0,0 +1,170 @@
+from odoo import models, api
+import logging
+
+_logger = logging.getLogger(__name__)
+
+METADATA_FIELDS = ['x_is_deleted', 'x_deleted_at', 'x_deleted_by', 'x_delete_batch_id']
+
+
+class SoftDeleteCascade(models.AbstractModel):
+    _name = 'soft.delete.cascade'
+    _description = 'Soft Delete Cascade Engine'
+
+    @api.model
+    def _get_cascade_children(self, model_name):
+        """
+        Return the (child model, foreign key column) pairs reached from ``model_name``
+        through one2many fields whose inverse many2one is ``ondelete='cascade'``,
+        restricted to children where soft delete (with its metadata) is enabled.
+        """
+        children = []
+        for field in self.env[model_name]._fields.values():
+            if field.type != 'one2many' or field.comodel_name not in self.env:
+                continue
+            child = self.env[field.comodel_name]
+            inverse = child._fields.get(field.inverse_name)
+            if not inverse or inverse.type != 'many2one' or not inverse.store or inverse.ondelete != 'cascade':
+                continue
+            if not all(name in child._fields for name in METADATA_FIELDS):
+                continue
+            pair = (field.comodel_name, field.inverse_name)
+            if pair not in children:
+                children.append(pair)
+        return children
+
+    @api.model
+    def _cascade_soft_delete(self, model_name, parent_ids, batch_id):
+        """
+        Soft-delete the live children of ``parent_ids`` with one UPDATE per child
+        model and level, tagging them with the parent's ``batch_id``.
+        Returns {model_name: number of soft-deleted children}.
+        """
+        counts = {}
+        if not parent_ids or not batch_id:
+            return counts
+        cr = self.env.cr
+        for child_model, fk in self._get_cascade_children(model_name):
+            Child = self.env[child_model]
+            Child.flush_model([fk] + METADATA_FIELDS)
+            cr.execute(f"""
+                UPDATE "{Child._table}"
+                SET x_is_deleted = TRUE,
+                    x_deleted_at = now() at time zone 'UTC',
+                    x_deleted_by = %s,
+                    x_delete_batch_id = %s,
+                    write_uid = %s,
+                    write_date = now() at time zone 'UTC'
+                WHERE "{fk}" = ANY(%s) AND x_is_deleted IS NOT TRUE
+                RETURNING id
+            """, (self.env.uid, batch_id, self.env.uid, list(parent_ids)))
+            child_ids = [row[0] for row in cr.fetchall()]
+            Child.invalidate_model(METADATA_FIELDS + ['write_uid', 'write_date'])
+            if not child_ids:
+                continue
+            self.env['soft.delete.counter'].sudo()._apply_delta(child_model, len(child_ids))
+            counts[child_model] = counts.get(child_model, 0) + len(child_ids)
+            _logger.info(f"Cascade soft-deleted {len(child_ids)} {child_model} records (batch {batch_id})")
+            for grandchild_model, count in self._cascade_soft_delete(child_model, child_ids, batch_id).items():
+                counts[grandchild_model] = counts.get(grandchild_model, 0) + count
+        return counts
+
+    @api.model
+    def _cascade_restore(self, model_name, parent_ids, batch_ids):
+        """
+        Restore the children of ``parent_ids`` that were soft-deleted together with
+        them (same deletion batch), with one UPDATE per child model and level.
+        Returns {model_name: number of restored children}.
+        """
+        counts = {}
+        batch_ids = [batch for batch in batch_ids if batch]
+        if not parent_ids or not batch_ids:
+            return counts
+        cr = self.env.cr
+        for child_model, fk in self._get_cascade_children(model_name):
+            Child = self.env[child_model]
+            Child.flush_model([fk] + METADATA_FIELDS)
+            cr.execute(f"""
+                UPDATE "{Child._table}"
+                SET x_is_deleted = FALSE,
+                    x_deleted_at = NULL,
+                    x_deleted_by = NULL,
+                    x_delete_batch_id = NULL,
+                    write_uid = %s,
+                    write_date = now() at time zone 'UTC'
+                WHERE "{fk}" = ANY(%s) AND x_is_deleted AND x_delete_batch_id = ANY(%s)
+                RETURNING id
+            """, (self.env.uid, list(parent_ids), batch_ids))
+            child_ids = [row[0] for row in cr.fetchall()]
+            Child.invalidate_model(METADATA_FIELDS + ['write_uid', 'write_date'])
+            if not child_ids:
+                continue
+            self.env['soft.delete.counter'].sudo()._apply_delta(child_model, -len(child_ids))
+            counts[child_model] = counts.get(child_model, 0) + len(child_ids)
+            _logger.info(f"Cascade restored {len(child_ids)} {child_model} records")
+            for grandchild_model, count in self._cascade_restore(child_model, child_ids, batch_ids).items():
+                counts[grandchild_model] = counts.get(grandchild_model, 0) + count
+        return counts
+
+    @api.model
+    def _cascade_deleted_counts(self, model_name, parent_ids):
+        """
+        Count the soft-deleted descendants of ``parent_ids`` that the database will
+        remove with them (ON DELETE CASCADE) on a permanent delete.
+        Returns {model_name: count}.
+        """
+        counts = {}
+        if parent_ids:
+            self._count_cascade_deleted(model_name, 'SELECT unnest(%s::int[]) AS id', [list(parent_ids)], counts, [model_name])
+        return counts
+
+    @api.model
+    def _count_cascade_deleted(self, model_name, ids_query, params, counts, path):
+        """
+        Add to ``counts`` the soft-deleted descendants of the ``model_name`` rows
+        selected by ``ids_query``. The descendants are counted in SQL, one query per
+        relation: the levels are nested subqueries, only aggregates come back.
+        """
+        cr = self.env.cr
+        Model = self.env[model_name]
+        children = self._get_cascade_children(model_name)
+
+        # Self-referencing hierarchies: the whole subtree in one recursive query, cycles stop on UNION
+        self_fks = [fk for child_model, fk in children if child_model == model_name]
+        if self_fks:
+            Model.flush_model(self_fks + ['x_is_deleted'])
+            join = ' OR '.join(f'c."{fk}" = d.id' for fk in self_fks)
+            subtree = f"""
+                WITH RECURSIVE d(id) AS (
+                    SELECT id FROM ({ids_query}) roots
+                    UNION
+                    SELECT c.id FROM "{Model._table}" c JOIN d ON {join}
+                )
+                SELECT id FROM d
+            """
+            cr.execute(f"""
+                SELECT COUNT(*) FROM "{Model._table}"
+                WHERE x_is_deleted AND id IN ({subtree}) AND id NOT IN ({ids_query})
+            """, params + params)
+            deleted = cr.fetchone()[0]
+            if deleted:
+                counts[model_name] = counts.get(model_name, 0) + deleted
+            ids_query = subtree
+
+        for child_model, fk in children:
+            if child_model == model_name:
+                continue
+            if child_model in path:
+                _logger.warning(f"Cascade cycle {' -> '.join(path + [child_model])}, not counted further")
+                continue
+            Child = self.env[child_model]
+            Child.flush_model([fk, 'x_is_deleted'])
+            cr.execute(f"""
+                SELECT COUNT(*), COUNT(*) FILTER (WHERE x_is_deleted) FROM "{Child._table}"
+                WHERE "{fk}" IN ({ids_query})
+            """, params)
+            total, deleted = cr.fetchone()
+            if deleted:
+                counts[child_model] = counts.get(child_model, 0) + deleted
+            if total:
+                child_query = f'SELECT id FROM "{Child._table}" WHERE "{fk}" IN ({ids_query})'
+                self._count_cascade_deleted(child_model, child_query, params, counts, path + [child_model])
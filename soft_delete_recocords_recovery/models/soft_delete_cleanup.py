@@ -0,0 +1,252 @@
+from odoo import models, fields, api, _
+from markupsafe import Markup, escape
+import logging
+import time
+
+from .soft_delete_config_settings import SOFT_DELETE_FIELDS, DYNAMIC_VIEW_NAMES
+from .soft_delete_trigger import TRIGGER_NAME
+
+_logger = logging.getLogger(__name__)
+
+ACTION_DOMAIN = "[('x_is_deleted', '=', False)]"
+# Cost model of the dry-run estimate
+SECONDS_PER_STATEMENT = 0.05
+SECONDS_PER_CATALOG_ROW = 0.0005
+DROPPED_BYTES_PER_SECOND = 1e9
+REGISTRY_RELOAD_SECONDS = 2.0
+
+
+class SoftDeleteCleanup(models.AbstractModel):
+    _name = 'soft.delete.cleanup'
+    _description = 'Soft Delete Cleanup Engine'
+
+    @api.model
+    def _plan(self):
+        """
+        Collect everything the cleanup removes, with a constant number of queries.
+        The plan is used both by the dry run report and by the cleanup itself.
+        """
+        cr = self.env.cr
+        self.env.flush_all()
+        plan = {}
+
+        cr.execute("SELECT id, model, name FROM ir_model_fields WHERE name = ANY(%s)", (SOFT_DELETE_FIELDS,))
+        plan['fields'] = cr.fetchall()
+
+        cr.execute("SELECT id, model FROM ir_model WHERE model LIKE 'x\\_%%'")
+        plan['x_models'] = cr.fetchall()
+        x_model_ids = [row[0] for row in plan['x_models']]
+        x_model_names = [row[1] for row in plan['x_models']]
+
+        cr.execute("""
+            SELECT v.id, COALESCE(p.model, v.model) FROM ir_ui_view v
+            LEFT JOIN ir_ui_view p ON p.id = v.inherit_id
+            WHERE v.name = ANY(%s) OR v.model LIKE 'x\\_%%'
+        """, (DYNAMIC_VIEW_NAMES,))
+        plan['views'] = cr.fetchall()
+
+        cr.execute("""
+            SELECT id, res_model FROM ir_act_window
+            WHERE domain = %s AND (view_mode ILIKE '%%tree%%' OR view_mode ILIKE '%%form%%' OR view_mode ILIKE '%%kanban%%')
+        """, (ACTION_DOMAIN,))
+        plan['actions'] = cr.fetchall()
+
+        # Server actions of the wizard models, and the 'Populate ... Records' actions of the source models
+        cr.execute("""
+            SELECT a.id, m.model FROM ir_act_server a JOIN ir_model m ON m.id = a.model_id
+            WHERE a.model_id = ANY(%s) OR a.name->>'en_US' LIKE 'Populate x\\_%%\\_wizard Records'
+        """, (x_model_ids,))
+        plan['server_actions'] = cr.fetchall()
+
+        cr.execute("SELECT name, model FROM soft_delete_index")
+        plan['indexes'] = cr.fetchall()
+
+        # Database mode triggers, dropped with their function
+        cr.execute("""
+            SELECT p.proname, c.relname FROM pg_trigger t
+            JOIN pg_class c ON c.oid = t.tgrelid
+            JOIN pg_proc p ON p.oid = t.tgfoid
+            WHERE t.tgname = %s
+        """, (TRIGGER_NAME,))
+        table_models = {model._table: name for name, model in self.env.registry.items() if not model._abstract}
+        plan['triggers'] = [(function, table_models.get(table, table)) for function, table in cr.fetchall()]
+
+        cr.execute("SELECT model, deleted_count FROM soft_delete_counter")
+        plan['deleted_rows'] = dict(cr.fetchall())
+
+        # Tables dropped with the x_ models: estimated rows and size, without scanning them
+        tables = {name: self.env[name]._table if name in self.env else name.replace('.', '_') for name in x_model_names}
+        cr.execute("""
+            SELECT c.relname, c.reltuples::bigint, pg_total_relation_size(c.oid)
+            FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = current_schema() AND c.relkind = 'r' AND c.relname = ANY(%s)
+        """, (list(tables.values()),))
+        table_stats = {row[0]: (max(row[1], 0), row[2]) for row in cr.fetchall()}
+        plan['tables'] = {name: (table,) + table_stats[table] for name, table in tables.items() if table in table_stats}
+        return plan
+
+    @api.model
+    def _report(self, plan):
+        """Per model summary of the plan, with an estimated duration."""
+        per_model = {}
+
+        def entry(model_name):
+            return per_model.setdefault(model_name, {
+                'model': model_name, 'fields': [], 'views': 0, 'actions': 0, 'server_actions': 0,
+                'indexes': 0, 'triggers': 0, 'table_dropped': False, 'table_rows': 0, 'table_bytes': 0,
+                'deleted_rows': plan['deleted_rows'].get(model_name, 0),
+            })
+
+        for __, model_name, field_name in plan['fields']:
+            entry(model_name)['fields'].append(field_name)
+        for __, model_name in plan['views']:
+            entry(model_name)['views'] += 1
+        for __, model_name in plan['actions']:
+            entry(model_name)['actions'] += 1
+        for __, model_name in plan['server_actions']:
+            entry(model_name)['server_actions'] += 1
+        for __, model_name in plan['indexes']:
+            entry(model_name)['indexes'] += 1
+        for __, model_name in plan['triggers']:
+            entry(model_name)['triggers'] += 1
+        for model_name, (__, rows, size) in plan['tables'].items():
+            entry(model_name).update({'table_dropped': True, 'table_rows': rows, 'table_bytes': size})
+
+        catalog_rows = (len(plan['fields']) + len(plan['x_models']) + len(plan['views'])
+                        + len(plan['actions']) + len(plan['server_actions']) + len(plan['indexes'])
+                        + len(plan['triggers']))
+        dropped_bytes = sum(stats[2] for stats in plan['tables'].values())
+        estimated = (
+            SECONDS_PER_STATEMENT * len(self._get_phases())
+            + SECONDS_PER_CATALOG_ROW * catalog_rows
+            + dropped_bytes / DROPPED_BYTES_PER_SECOND
+            + REGISTRY_RELOAD_SECONDS
+        )
+        return {
+            'models': sorted(per_model.values(), key=lambda line: line['model']),
+            'estimated_seconds': round(estimated, 1),
+        }
+
+    @api.model
+    def _get_phases(self):
+        return ['triggers', 'indexes', 'columns', 'model_data', 'fields', 'views', 'actions', 'server_actions',
+                'tables', 'models', 'counters', 'index_records']
+
+    @api.model
+    def dry_run(self):
+        """Return what the cleanup would remove, per model, without changing anything."""
+        return self._report(self._plan())
+
+    @api.model
+    def _run(self, plan=None):
+        """
+        Remove everything in the plan, each phase in one set-based statement, then
+        reload the registry once.
+        """
+        cr = self.env.cr
+        plan = plan or self._plan()
+        start = time.perf_counter()
+
+        x_model_ids = [row[0] for row in plan['x_models']]
+        x_model_names = {row[1] for row in plan['x_models']}
+        field_ids = [row[0] for row in plan['fields'] if row[1] not in x_model_names]
+        view_ids = [row[0] for row in plan['views']]
+        server_action_ids = [row[0] for row in plan['server_actions']]
+
+        def phase(name, query, params=None):
+            if not query:
+                return
+            phase_start = time.perf_counter()
+            cr.execute(query, params)
+            _logger.info(f"Cleanup {name}: {cr.rowcount} rows in {time.perf_counter() - phase_start:.3f}s")
+
+        function_names = [row[0] for row in plan['triggers']]
+        phase('triggers', function_names and 'DROP FUNCTION IF EXISTS ' + ', '.join(
+            f'"{name}"()' for name in function_names) + ' CASCADE')
+
+        index_names = [row[0] for row in plan['indexes']]
+        phase('indexes', index_names and 'DROP INDEX IF EXISTS ' + ', '.join(f'"{name}"' for name in index_names))
+
+        # Columns of the kept tables: one ALTER TABLE per table, sent as a single batch
+        columns = {}
+        for __, model_name, field_name in plan['fields']:
+            if model_name not in x_model_names and model_name in self.env:
+                columns.setdefault(self.env[model_name]._table, []).append(field_name)
+        phase('columns', '; '.join(
+            f'ALTER TABLE "{table}" ' + ', '.join(f'DROP COLUMN IF EXISTS "{column}"' for column in names)
+            for table, names in columns.items()
+        ))
+
+        phase('model_data', """
+            DELETE FROM ir_model_data
+            WHERE (model = 'ir.model.fields' AND (res_id = ANY(%s)
+                   OR res_id IN (SELECT id FROM ir_model_fields WHERE model_id = ANY(%s))))
+               OR (model = 'ir.ui.view' AND res_id = ANY(%s))
+               OR (model = 'ir.actions.server' AND res_id = ANY(%s))
+               OR (model = 'ir.model' AND res_id = ANY(%s))
+        """, (field_ids, x_model_ids, view_ids, server_action_ids, x_model_ids))
+        phase('fields', field_ids and 'DELETE FROM ir_model_fields WHERE id = ANY(%s)', (field_ids,))
+        phase('views', view_ids and 'DELETE FROM ir_ui_view WHERE id = ANY(%s)', (view_ids,))
+        phase('actions', plan['actions'] and 'UPDATE ir_act_window SET domain = NULL WHERE id = ANY(%s)',
+              ([row[0] for row in plan['actions']],))
+        phase('server_actions', server_action_ids and 'DELETE FROM ir_act_server WHERE id = ANY(%s)', (server_action_ids,))
+        phase('tables', plan['tables'] and 'DROP TABLE IF EXISTS ' + ', '.join(
+            f'"{stats[0]}"' for stats in plan['tables'].values()) + ' CASCADE')
+        # Fields, access rights, record rules and server actions of the models follow (ON DELETE CASCADE)
+        phase('models', x_model_ids and 'DELETE FROM ir_model WHERE id = ANY(%s)', (x_model_ids,))
+        phase('counters', 'DELETE FROM soft_delete_counter')
+        phase('index_records', 'DELETE FROM soft_delete_index')
+
+        _logger.info(f"Cleanup statements done in {time.perf_counter() - start:.3f}s")
+        return True
+
+    @api.model
+    def _reload_registry(self):
+        """Drop the removed models and fields from the registry, once, and signal the other workers."""
+        self.env.invalidate_all()
+        self.env.registry.clear_caches()
+        self.env.registry.setup_models(self.env.cr)
+        self.env.registry.registry_invalidated = True
+
+
+class SoftDeleteCleanupReport(models.TransientModel):
+    _name = 'soft.delete.cleanup.report'
+    _description = 'Soft Delete Cleanup Dry Run'
+
+    report_html = fields.Html(string='Objects to Remove', readonly=True, sanitize=False)
+    estimated_seconds = fields.Float(string='Estimated Duration (s)', readonly=True, digits=(16, 1))
+
+    @api.model
+    def _render(self, report):
+        header = [_('Model'), _('Fields'), _('Views'), _('Action Domains'), _('Server Actions'),
+                  _('Indexes'), _('Triggers'), _('Dropped Table Rows'), _('Dropped Table Size (MB)'), _('Soft-Deleted Rows')]
+        rows = Markup('').join(
+            Markup('<tr>%s</tr>') % Markup('').join(Markup('<td>%s</td>') % value for value in [
+                line['model'], ', '.join(line['fields']), line['views'], line['actions'],
+                line['server_actions'], line['indexes'], line['triggers'], line['table_rows'],
+                round(line['table_bytes'] / 1048576, 1),
+                line['deleted_rows'],
+            ])
+            for line in report['models']
+        )
+        return Markup('<table class="table table-sm"><thead><tr>%s</tr></thead><tbody>%s</tbody></table>') % (
+            Markup('').join(Markup('<th>%s</th>') % escape(title) for title in header), rows)
+
+    @api.model
+    def action_open(self):
+        report = self.env['soft.delete.cleanup'].dry_run()
+        wizard = self.create({
+            'report_html': self._render(report),
+            'estimated_seconds': report['estimated_seconds'],
+        })
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Soft Delete Cleanup Dry Run'),
+            'res_model': self._name,
+            'res_id': wizard.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+    def action_run_cleanup(self):
+        return self.env['res.config.settings'].action_cleanup_soft_delete()
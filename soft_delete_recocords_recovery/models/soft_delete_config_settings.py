@@ -1,11 +1,40 @@
-from odoo import models, fields, api, _, SUPERUSER_ID
+from odoo import models, fields, api, tools, _, SUPERUSER_ID
 import logging
 from lxml import etree
 from odoo.exceptions import AccessError
 from odoo.exceptions import UserError
+import uuid
+import hashlib
+import json
+from .soft_delete_slow_operation import soft_delete_profiler
+from .soft_delete_trigger import soft_delete_trigger_bypass
 
 _logger = logging.getLogger(__name__)
 
+SOFT_DELETE_FIELD_DEFINITIONS = [
+    {'name': 'x_is_deleted', 'field_description': 'Is Deleted', 'ttype': 'boolean'},
+    {'name': 'x_deleted_at', 'field_description': 'Deleted On', 'ttype': 'datetime'},
+    {'name': 'x_deleted_by', 'field_description': 'Deleted By', 'ttype': 'many2one',
+     'relation': 'res.users', 'on_delete': 'set null'},
+    {'name': 'x_delete_batch_id', 'field_description': 'Deletion Batch', 'ttype': 'char'},
+]
+SOFT_DELETE_FIELDS = [field_data['name'] for field_data in SOFT_DELETE_FIELD_DEFINITIONS]
+
+TREE_VIEW_NAMES = [
+    'x_soft_delete_manager.tree.view.inherit.dynamic',
+    'x_soft_delete_manager.tree.view.x_is_deleted.inherit.dynamic',
+    'x_soft_delete_manager.tree.view.js_class.inherit.dynamic',
+]
+KANBAN_VIEW_NAMES = [
+    'x_soft_delete_manager.kanban.view.inherit.dynamic',
+    'x_soft_delete_manager.kanban.view.x_is_deleted.inherit.dynamic',
+    'x_soft_delete_manager.kanban.view.js_class.inherit.dynamic',
+]
+DYNAMIC_VIEW_NAMES = TREE_VIEW_NAMES + KANBAN_VIEW_NAMES
+
+# Bump when the per-model setup changes, so that the next save applies it to every model
+SETUP_FINGERPRINT_VERSION = 1
+
 class SoftDeleteConfigSettings(models.TransientModel):
     _inherit = 'res.config.settings'
 
@@ -33,6 +62,72 @@ class SoftDeleteConfigSettings(models.TransientModel):
         relation='soft_delete_specific_models_rel'
     )
 
+    soft_delete_live_index = fields.Boolean(
+        string='Index Live Records',
+        help='Also build a composite (x_is_deleted, id) index used by the list views of enabled models.'
+    )
+
+    soft_delete_recovery_mode = fields.Selection([
+        ('virtual', 'Browse deleted records in place'),
+        ('wizard', 'Copy deleted records to a recovery wizard'),
+    ], string='Recovery Screen', default='virtual',
+        help='In place: the recovery screen pages through the deleted records of the model itself, nothing is copied.\n'
+             'Wizard: deleted records are copied to a per-model wizard table before being displayed.'
+    )
+
+    soft_delete_job_threshold = fields.Integer(
+        string='Background Job Threshold',
+        default=5000,
+        help='Restore and permanent delete operations on more records than this run as chunked background jobs. 0 disables jobs.'
+    )
+
+    soft_delete_job_chunk_size = fields.Integer(
+        string='Background Job Chunk Size',
+        default=1000,
+        help='Number of records processed (and committed) per chunk by background jobs.'
+    )
+
+    soft_delete_purge_batch_size = fields.Integer(
+        string='Purge Batch Size',
+        default=1000,
+        help='Number of expired records permanently deleted (and committed) per batch by the retention purge.'
+    )
+
+    soft_delete_purge_time_budget = fields.Integer(
+        string='Purge Time Budget (s)',
+        default=300,
+        help='Maximum duration of one retention purge run; the remaining records are purged on the next run.'
+    )
+
+    soft_delete_purge_workers = fields.Integer(
+        string='Purge Workers',
+        default=4,
+        help='Number of models purged in parallel, each on its own database connection, by a full purge.'
+    )
+
+    soft_delete_export_format = fields.Selection([
+        ('jsonl', 'JSON Lines'),
+        ('csv', 'CSV'),
+    ], string='Export Format', default='jsonl',
+        help='Format of the gzipped files the deleted records are exported to before a purge.'
+    )
+
+    soft_delete_export_directory = fields.Char(
+        string='Export Directory',
+        help='Server directory receiving the export files. Leave empty to store them in the filestore as attachments.'
+    )
+
+    soft_delete_slow_threshold_ms = fields.Integer(
+        string='Slow Operation Threshold (ms)',
+        default=1000,
+        help='Soft delete operations (settings save, delete, populate, restore, purge) taking longer are logged. 0 disables the log.'
+    )
+
+    soft_delete_profile = fields.Boolean(
+        string='Profile Soft Delete Operations',
+        help='Attach a cProfile report to logged slow operations. Adds overhead to every operation: enable only while investigating.'
+    )
+
     def get_values(self):
         res = super().get_values()
         ICPSudo = self.env['ir.config_parameter'].sudo()
@@ -46,10 +141,33 @@ class SoftDeleteConfigSettings(models.TransientModel):
         recover_ids_str = ICPSudo.get_param('soft_delete_recocords_recovery.specific_models_recover', default='')
         recover_ids = [int(x) for x in recover_ids_str.split(',') if x.strip().isdigit()]
 
+        live_index = ICPSudo.get_param('soft_delete_recocords_recovery.live_index', 'False') == 'True'
+        recovery_mode = ICPSudo.get_param('soft_delete_recocords_recovery.recovery_mode', 'virtual')
+        job_threshold = int(ICPSudo.get_param('soft_delete_recocords_recovery.job_threshold', 5000))
+        job_chunk_size = int(ICPSudo.get_param('soft_delete_recocords_recovery.job_chunk_size', 1000))
+        purge_batch_size = int(ICPSudo.get_param('soft_delete_recocords_recovery.purge_batch_size', 1000))
+        purge_time_budget = int(ICPSudo.get_param('soft_delete_recocords_recovery.purge_time_budget', 300))
+        purge_workers = int(ICPSudo.get_param('soft_delete_recocords_recovery.purge_workers', 4))
+        export_format = ICPSudo.get_param('soft_delete_recocords_recovery.export_format', 'jsonl')
+        export_directory = ICPSudo.get_param('soft_delete_recocords_recovery.export_directory', '')
+        slow_threshold_ms = int(ICPSudo.get_param('soft_delete_recocords_recovery.slow_threshold_ms', 1000))
+        profile = ICPSudo.get_param('soft_delete_recocords_recovery.profile', 'False') == 'True'
+
         res.update({
             # 'model_ids': [(6, 0, model_ids)],
             'select_all_permanent_delete': select_all,
             'specific_models_recover': [(6, 0, recover_ids)],
+            'soft_delete_live_index': live_index,
+            'soft_delete_recovery_mode': recovery_mode,
+            'soft_delete_job_threshold': job_threshold,
+            'soft_delete_job_chunk_size': job_chunk_size,
+            'soft_delete_purge_batch_size': purge_batch_size,
+            'soft_delete_purge_time_budget': purge_time_budget,
+            'soft_delete_purge_workers': purge_workers,
+            'soft_delete_export_format': export_format,
+            'soft_delete_export_directory': export_directory,
+            'soft_delete_slow_threshold_ms': slow_threshold_ms,
+            'soft_delete_profile': profile,
         })
         return res
 
@@ -57,41 +175,207 @@ class SoftDeleteConfigSettings(models.TransientModel):
         super().set_values()
         ICPSudo = self.env['ir.config_parameter'].sudo()
 
-        # Save model_ids
-        model_ids = self.model_ids.ids
-        ICPSudo.set_param('soft_delete_recocords_recovery.model_ids', ','.join(map(str, model_ids)) or '')
-
         # Save other params
         ICPSudo.set_param('soft_delete_recocords_recovery.select_all_permanent_delete', str(self.select_all_permanent_delete))
         ICPSudo.set_param('soft_delete_recocords_recovery.specific_models_recover', ','.join(map(str, self.specific_models_recover.ids)) or '')
+        ICPSudo.set_param('soft_delete_recocords_recovery.live_index', str(self.soft_delete_live_index))
+        ICPSudo.set_param('soft_delete_recocords_recovery.recovery_mode', self.soft_delete_recovery_mode or 'virtual')
+        ICPSudo.set_param('soft_delete_recocords_recovery.job_threshold', str(self.soft_delete_job_threshold))
+        ICPSudo.set_param('soft_delete_recocords_recovery.job_chunk_size', str(self.soft_delete_job_chunk_size or 1000))
+        ICPSudo.set_param('soft_delete_recocords_recovery.purge_batch_size', str(self.soft_delete_purge_batch_size or 1000))
+        ICPSudo.set_param('soft_delete_recocords_recovery.purge_time_budget', str(self.soft_delete_purge_time_budget))
+        ICPSudo.set_param('soft_delete_recocords_recovery.purge_workers', str(self.soft_delete_purge_workers or 4))
+        ICPSudo.set_param('soft_delete_recocords_recovery.export_format', self.soft_delete_export_format or 'jsonl')
+        ICPSudo.set_param('soft_delete_recocords_recovery.export_directory', (self.soft_delete_export_directory or '').strip())
+        ICPSudo.set_param('soft_delete_recocords_recovery.slow_threshold_ms', str(self.soft_delete_slow_threshold_ms))
+        ICPSudo.set_param('soft_delete_recocords_recovery.profile', str(self.soft_delete_profile))
+
+        self._apply_enabled_models(self.model_ids.ids)
 
+    @api.model
+    def _apply_enabled_models(self, model_ids):
+        """
+        Save ``model_ids`` as the soft delete enabled models and set them up: fields,
+        indexes, counters, unlink patches, views, actions and wizards. Shared by the
+        settings and the manager configuration.
+        """
+        ICPSudo = self.env['ir.config_parameter'].sudo()
         previous_model_ids = self._get_previous_model_ids()
+        ICPSudo.set_param('soft_delete_recocords_recovery.model_ids', ','.join(map(str, model_ids)) or '')
+        # The registry hooks run again when the fields below are created
+        self.clear_caches()
+        live_index = ICPSudo.get_param('soft_delete_recocords_recovery.live_index', 'False') == 'True'
+
         new_model_ids = model_ids
+        removed_model_ids = self.env['ir.model'].browse(list(set(previous_model_ids) - set(new_model_ids))).exists().ids
+
+        with soft_delete_profiler(self.env, 'set_values') as profiler:
+            # Only the models whose setup changed since the last save are processed
+            with profiler.phase('fingerprints') as stats:
+                stored_fingerprints = self._get_stored_fingerprints()
+                fingerprints = self._get_model_fingerprints(new_model_ids)
+                changed_model_ids = [
+                    model_id for model_id in new_model_ids
+                    if stored_fingerprints.get(str(model_id)) != fingerprints.get(model_id)
+                ]
+                stats['rows'] = len(changed_model_ids)
+            profiler.rows = len(changed_model_ids) + len(removed_model_ids)
+            _logger.info(
+                f"Soft delete configuration: {len(changed_model_ids)} models to set up, "
+                f"{len(removed_model_ids)} removed, {len(new_model_ids) - len(changed_model_ids)} unchanged"
+            )
+
+            with profiler.phase('field_creation'):
+                self._ensure_is_deleted_field(changed_model_ids)
+
+            # Index x_is_deleted once the new columns are committed
+            with profiler.phase('indexes_and_counters'):
+                indexed_models = self.env['ir.model'].browse(model_ids).filtered(lambda m: not m.transient).mapped('model')
+                self.env['soft.delete.index']._ensure_indexes(indexed_models, live=live_index)
+                self.env['soft.delete.counter']._ensure_counters(indexed_models)
+
+            # After _ensure_is_deleted_field(...)
+            with profiler.phase('unlink_patching') as stats:
+                stats['rows'] = self._apply_unlink_patches()
+                self.env['soft.delete.trigger']._sync_triggers()
+                if set(previous_model_ids) != set(new_model_ids):
+                    # The other workers reload their registry, which patches unlink from _register_hook
+                    self.env.registry.registry_invalidated = True
+
+            # Apply view inheritances and js_class
+            with profiler.phase('view_inheritances'):
+                self._apply_view_inheritances_and_params(changed_model_ids, removed_model_ids)
+
+            with profiler.phase('action_domains'):
+                self._apply_domain_to_actions(changed_model_ids, removed_model_ids)
+
+            # Ensure server actions and wizards
+            with profiler.phase('wizard_creation') as stats:
+                for model in self.env['ir.model'].browse(changed_model_ids):
+                    wizard_model_name = self._create_dynamic_wizard_model_and_view(model.model)
+                    self._ensure_server_action(model, wizard_model_name)
+                    stats['rows'] += 1
+
+            if changed_model_ids or removed_model_ids:
+                with profiler.phase('store_fingerprints'):
+                    fingerprints.update(self._get_model_fingerprints(changed_model_ids))
+                    self._set_stored_fingerprints(fingerprints)
+
+    def _get_previous_model_ids(self):
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        ids_str = ICPSudo.get_param('soft_delete_recocords_recovery.model_ids', default='')
+        return [int(x) for x in ids_str.split(',') if x.strip().isdigit()]
 
-        self._ensure_is_deleted_field(model_ids)
+    @api.model
+    def _get_stored_fingerprints(self):
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        try:
+            return json.loads(ICPSudo.get_param('soft_delete_recocords_recovery.model_fingerprints', '{}'))
+        except ValueError:
+            return {}
 
-        # After _ensure_is_deleted_field(...)
-        IrModel = self.env['ir.model']
-        for model_rec in IrModel.browse(new_model_ids):
-            model_name = model_rec.model
-            if model_rec.transient:
-                continue  # wizards shouldn't be soft-deleted anyway
-            self._patch_unlink_method(model_name)
+    @api.model
+    def _set_stored_fingerprints(self, fingerprints):
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        ICPSudo.set_param('soft_delete_recocords_recovery.model_fingerprints', json.dumps(
+            {str(model_id): fingerprint for model_id, fingerprint in fingerprints.items()}, sort_keys=True
+        ))
 
-        # Apply view inheritances and js_class
-        self._apply_view_inheritances_and_params(new_model_ids)
+    @api.model
+    def _get_model_fingerprints(self, model_ids):
+        """
+        Fingerprint of the soft delete setup of each model: its deletion fields, the
+        primary views and window action it is attached to, its dynamic views and
+        its wizard. A model whose fingerprint is unchanged since the last save is
+        skipped. Returns {model_id: fingerprint}, with a constant number of queries.
+        """
+        ir_models = self.env['ir.model'].browse(model_ids).exists()
+        if not ir_models:
+            return {}
+        names = ir_models.mapped('model')
+        wizard_names = [f"x_{name.replace('.', '_')}_wizard" for name in names]
+        parts = {name: {'version': SETUP_FINGERPRINT_VERSION, 'fields': [], 'views': [], 'dynamic_views': []} for name in names}
+
+        for field_data in self.env['ir.model.fields'].sudo().search_read(
+                [('model', 'in', names), ('name', 'in', SOFT_DELETE_FIELDS)], ['model', 'name']):
+            parts[field_data['model']]['fields'].append(field_data['name'])
+
+        # Same views as _apply_view_inheritances_and_params: the first primary tree and kanban view
+        seen = set()
+        for view in self.env['ir.ui.view'].search_read(
+                [('model', 'in', names), ('type', 'in', ('tree', 'kanban')), ('mode', '=', 'primary')],
+                ['model', 'type', 'write_date']):
+            if (view['model'], view['type']) not in seen:
+                seen.add((view['model'], view['type']))
+                parts[view['model']]['views'].append([view['type'], view['id'], str(view['write_date'])])
+
+        for view in self.env['ir.ui.view'].search_read(
+                [('model', 'in', names), ('name', 'in', DYNAMIC_VIEW_NAMES)], ['model', 'inherit_id']):
+            parts[view['model']]['dynamic_views'].append(view['inherit_id'] and view['inherit_id'][0])
+
+        for action in self.env['ir.actions.act_window'].search_read([
+            ('res_model', 'in', names),
+            '|', '|',
+            ('view_mode', 'ilike', 'tree'),
+            ('view_mode', 'ilike', 'form'),
+            ('view_mode', 'ilike', 'kanban'),
+        ], ['res_model', 'domain']):
+            parts[action['res_model']].setdefault('action', [action['id'], action['domain']])
+
+        existing_wizards = set(self.env['ir.model'].search([('model', 'in', wizard_names)]).mapped('model'))
+        for name, wizard_name in zip(names, wizard_names):
+            parts[name]['wizard'] = wizard_name in existing_wizards
+
+        return {
+            ir_model.id: hashlib.sha1(json.dumps(parts[ir_model.model], sort_keys=True).encode()).hexdigest()
+            for ir_model in ir_models
+        }
 
-        self._apply_domain_to_actions(new_model_ids)
+    @api.model
+    @tools.ormcache()
+    def _get_enabled_model_names(self):
+        """Names of the models with soft delete enabled, cached per registry."""
+        model_ids = self._get_previous_model_ids()
+        ir_models = self.env['ir.model'].sudo().browse(model_ids).exists()
+        return tuple(ir_model.model for ir_model in ir_models if not ir_model.transient)
+
+    def _register_hook(self):
+        """
+        Patch unlink on the enabled models whenever the registry is (re)loaded, so
+        every worker soft-deletes, including after a restart or a registry reload.
+        """
+        super()._register_hook()
+        try:
+            self._apply_unlink_patches()
+        except Exception as e:
+            _logger.error(f"Failed to apply soft delete unlink patches: {str(e)}", exc_info=True)
 
-        # Ensure server actions and wizards
-        for model in self.env['ir.model'].browse(new_model_ids):
-            wizard_model_name = self._create_dynamic_wizard_model_and_view(model.model)
-            self._ensure_server_action(model, wizard_model_name)
+    def _unregister_hook(self):
+        for model_name in list(self.env.registry):
+            self._unpatch_unlink_method(model_name)
+        super()._unregister_hook()
 
-    def _get_previous_model_ids(self):
-        ICPSudo = self.env['ir.config_parameter'].sudo()
-        ids_str = ICPSudo.get_param('soft_delete_recocords_recovery.model_ids', default='')
-        return [int(x) for x in ids_str.split(',') if x.strip().isdigit()]
+    @api.model
+    def _apply_unlink_patches(self):
+        """Patch unlink on the enabled models and restore it on the others. Returns the number of patched models."""
+        enabled = set(self._get_enabled_model_names())
+        for model_name in list(self.env.registry):
+            if model_name not in enabled:
+                self._unpatch_unlink_method(model_name)
+        for model_name in enabled:
+            if model_name in self.env.registry:
+                self._patch_unlink_method(model_name)
+        return len(enabled)
+
+    def _unpatch_unlink_method(self, model_name):
+        """Restore the original unlink of a patched model class."""
+        ModelClass = self.env.registry[model_name]
+        if not ModelClass.__dict__.get('_soft_delete_patched'):
+            return
+        ModelClass.unlink = ModelClass.unlink_original
+        del ModelClass.unlink_original
+        del ModelClass._soft_delete_patched
+        _logger.info(f"Restored original unlink for {model_name}")
 
     def _patch_unlink_method(self, model_name):
         """
@@ -102,8 +386,8 @@ class SoftDeleteConfigSettings(models.TransientModel):
             ModelClass = self.env.registry[model_name]
 
             # Already patched? Skip
-            if getattr(ModelClass, '_soft_delete_patched', False):
-                _logger.info(f"unlink already patched for {model_name}, skipping.")
+            if ModelClass.__dict__.get('_soft_delete_patched'):
+                _logger.debug(f"unlink already patched for {model_name}, skipping.")
                 return
 
             original_unlink = ModelClass.unlink
@@ -113,11 +397,47 @@ class SoftDeleteConfigSettings(models.TransientModel):
                 if not self:
                     return True
 
+                # Journal storage: snapshot the rows to the trash journal, then really delete them
+                Journal = self.env['soft.delete.journal'].sudo()
+                if 'x_is_deleted' in self._fields and Journal._is_journal_model(model_name):
+                    with soft_delete_profiler(self.env, 'unlink', model_name) as profiler:
+                        profiler.rows = len(self)
+                        with profiler.phase('journal') as stats:
+                            Journal._archive(self)
+                            stats['rows'] = len(self)
+                        with profiler.phase('delete') as stats:
+                            original_unlink(self, *args, **kwargs)
+                            stats['rows'] = len(self)
+                    return True
+
+                # Database mode: one DELETE statement, turned into a soft delete by the table's trigger
+                Trigger = self.env['soft.delete.trigger']
+                if 'x_is_deleted' in self._fields and Trigger._is_trigger_model(model_name):
+                    with soft_delete_profiler(self.env, 'unlink', model_name) as profiler:
+                        profiler.rows = len(self)
+                        with profiler.phase('trigger_delete') as stats:
+                            Trigger._delete(self)
+                            stats['rows'] = len(self)
+                    return True
+
                 # Only soft-delete if the field exists
                 if 'x_is_deleted' in self._fields:
-                    # We write on all records at once (more efficient)
-                    self.write({'x_is_deleted': True})
-                    _logger.info(f"Soft-deleted {len(self)} records in {model_name}")
+                    with soft_delete_profiler(self.env, 'unlink', model_name) as profiler:
+                        # We write on all records at once (more efficient)
+                        to_delete = self.filtered(lambda rec: not rec.x_is_deleted)
+                        profiler.rows = len(to_delete)
+                        if to_delete:
+                            with profiler.phase('soft_delete') as stats:
+                                vals = self.env['res.config.settings']._get_soft_delete_vals(to_delete)
+                                to_delete.write(vals)
+                                self.env['soft.delete.counter'].sudo()._apply_delta(model_name, len(to_delete))
+                                stats['rows'] = len(to_delete)
+                            # Soft-delete the ondelete='cascade' children in the same batch
+                            with profiler.phase('cascade_soft_delete') as stats:
+                                cascade_counts = self.env['soft.delete.cascade'].sudo()._cascade_soft_delete(
+                                    model_name, to_delete.ids, vals.get('x_delete_batch_id'))
+                                stats['rows'] = sum(cascade_counts.values())
+                    _logger.info(f"Soft-deleted {len(to_delete)} records in {model_name}")
                 else:
                     # Fallback to hard delete if field missing (shouldn't happen)
                     _logger.warning(f"x_is_deleted missing in {model_name} → hard delete")
@@ -161,7 +481,8 @@ class SoftDeleteConfigSettings(models.TransientModel):
 
     def _ensure_is_deleted_field(self, model_ids):
         """
-        Ensure x_is_deleted Boolean field exists on selected models
+        Ensure x_is_deleted Boolean field and the deletion metadata fields
+        (x_deleted_at, x_deleted_by, x_delete_batch_id) exist on selected models
         """
         IrModelFields = self.env['ir.model.fields'].sudo()
 
@@ -171,34 +492,55 @@ class SoftDeleteConfigSettings(models.TransientModel):
             if model.transient:
                 continue
 
-            existing_field = IrModelFields.search([
-                ('name', '=', 'x_is_deleted'),
+            existing_names = IrModelFields.search([
+                ('name', 'in', SOFT_DELETE_FIELDS),
                 ('model', '=', model.model),
-            ], limit=1)
+            ]).mapped('name')
 
-            if not existing_field:
-                _logger.info("Creating x_is_deleted field on model %s", model.model)
+            vals_list = []
+            for field_data in SOFT_DELETE_FIELD_DEFINITIONS:
+                if field_data['name'] in existing_names:
+                    continue
+                _logger.info("Creating %s field on model %s", field_data['name'], model.model)
+                vals_list.append(dict(
+                    field_data,
+                    model_id=model.id,
+                    model=model.model,
+                    store=True,
+                    readonly=False,
+                    required=False,
+                    copied=False,
+                    state='manual',
+                ))
 
-                created_field = IrModelFields.create({
-                    'name': 'x_is_deleted',
-                    'field_description': 'Is Deleted',
-                    'ttype': 'boolean',
-                    'model_id': model.id,
-                    'model': model.model,
-                    'store': True,
-                    'readonly': False,
-                    'required': False,
-                    'copied': False,
-                    'state': 'manual',
-                })
+            if vals_list:
+                created_fields = IrModelFields.create(vals_list)
+                _logger.info(
+                    "%s fields successfully created on model %s",
+                    created_fields.mapped('name'), model.model
+                )
 
-                if created_field:
-                    _logger.info(
-                        "x_is_deleted field successfully created on model %s",
-                        model.model
-                    )
+    @api.model
+    def _get_soft_delete_vals(self, records, batch_id=None):
+        """Values written by the soft delete: the flag and the deletion metadata."""
+        vals = {'x_is_deleted': True}
+        if 'x_deleted_at' in records._fields:
+            vals.update({
+                'x_deleted_at': fields.Datetime.now(),
+                'x_deleted_by': self.env.uid,
+                'x_delete_batch_id': batch_id or uuid.uuid4().hex,
+            })
+        return vals
 
-    def _apply_view_inheritances_and_params(self, new_model_ids):
+    @api.model
+    def _get_restore_vals(self, records):
+        """Values written by a restore: clear the flag and the deletion metadata."""
+        vals = {'x_is_deleted': False}
+        if 'x_deleted_at' in records._fields:
+            vals.update({'x_deleted_at': False, 'x_deleted_by': False, 'x_delete_batch_id': False})
+        return vals
+
+    def _apply_view_inheritances_and_params(self, new_model_ids, removed_model_ids=()):
         ICPSudo = self.env['ir.config_parameter'].sudo()
         ICPSudo.set_param('soft_delete_recocords_recovery.select_all_permanent_delete', self.select_all_permanent_delete)
         ICPSudo.set_param('soft_delete_recocords_recovery.specific_models_recover', ','.join(map(str, self.specific_models_recover.ids)))
@@ -208,31 +550,22 @@ class SoftDeleteConfigSettings(models.TransientModel):
         IrModelData = self.env['ir.model.data']
         IrActionsServer = self.env['ir.actions.server']
 
-        all_models = IrModel.search([]).mapped('model')
-
-        tree_view_names = [
-            'x_soft_delete_manager.tree.view.inherit.dynamic',
-            'x_soft_delete_manager.tree.view.x_is_deleted.inherit.dynamic',
-            'x_soft_delete_manager.tree.view.js_class.inherit.dynamic',
-        ]
+        # Only the models being set up or removed: the other ones keep their views
+        affected_models = IrModel.browse(list(new_model_ids) + list(removed_model_ids)).exists().mapped('model')
+        if not affected_models:
+            return
 
-        kanban_view_names = [
-            'x_soft_delete_manager.kanban.view.inherit.dynamic',
-            'x_soft_delete_manager.kanban.view.x_is_deleted.inherit.dynamic',
-            'x_soft_delete_manager.kanban.view.js_class.inherit.dynamic',
-        ]
-
-        # Remove outdated inherited views (for all models, to avoid leftovers)
+        # Remove outdated inherited views
         existing_tree_views = IrUiView.search([
-            ('inherit_id.model', 'in', all_models),
-            ('name', 'in', tree_view_names),
+            ('inherit_id.model', 'in', affected_models),
+            ('name', 'in', TREE_VIEW_NAMES),
         ])
         existing_tree_views.unlink()
 
         # 🔹 Remove existing KANBAN dynamic views
         existing_kanban_views = IrUiView.search([
-            ('inherit_id.model', 'in', all_models),
-            ('name', 'in', kanban_view_names),
+            ('inherit_id.model', 'in', affected_models),
+            ('name', 'in', KANBAN_VIEW_NAMES),
         ])
         existing_kanban_views.unlink()
 
@@ -428,35 +761,14 @@ class SoftDeleteConfigSettings(models.TransientModel):
         try:
             _logger.info(f"Populating wizard {wizard_model_name} for model {model_name}")
 
-            model = self.env[model_name]
-            wizard_model = self.env[wizard_model_name]
-            ir_model = self.env['ir.model'].search([('model', '=', model_name)], limit=1)
-
-            if not ir_model:
+            if not self.env['ir.model'].search([('model', '=', model_name)], limit=1):
                 raise ValueError(f"Model {model_name} not found in ir.model")
 
-            # Get soft-deleted records
-            deleted_records = model.with_context(active_test=False).search([('x_is_deleted', '=', True)])
-
-            # Clear outdated wizard records
-            existing_wizards = wizard_model.search([('x_model_id', '=', ir_model.id)])
-            for wiz in existing_wizards:
-                if not model.browse(wiz.x_record_id).exists() or not model.browse(wiz.x_record_id).x_is_deleted:
-                    wiz.unlink()
-
-            # Create new wizard entries
-            vals_list = []
-            for record in deleted_records:
-                if not wizard_model.search([('x_model_id', '=', ir_model.id), ('x_record_id', '=', record.id)], limit=1):
-                    vals_list.append({
-                        'x_model_id': ir_model.id,
-                        'x_record_id': record.id,
-                        'x_display_name': record.display_name or f"Record {record.id}",
-                    })
-
-            if vals_list:
-                wizard_model.create(vals_list)
-                _logger.info(f"Created {len(vals_list)} wizard records for {wizard_model_name}")
+            with soft_delete_profiler(self.env, 'populate', model_name) as profiler:
+                with profiler.phase('sync') as stats:
+                    result = self.env['soft.delete.wizard.sync'].sync(model_name, wizard_model_name)
+                    stats['rows'] = profiler.rows = result['inserted'] + result['removed']
+            return result
 
         except Exception as e:
             _logger.error(f"Failed to populate wizard records for {model_name}: {e}")
@@ -465,146 +777,125 @@ class SoftDeleteConfigSettings(models.TransientModel):
     @api.model
     def restore_records(self, model_name, record_ids):
         """
-        Restore soft-deleted records by setting x_is_deleted = False
-        """
-        try:
-            records = self.env[model_name].browse(record_ids)
-            if not records:
-                return True
-
-            records.write({'x_is_deleted': False})
-            _logger.info(f"Restored {len(records)} records in {model_name}")
+        Restore soft-deleted records by setting x_is_deleted = False.
+        Large selections are queued as a chunked background job.
 
-            # Clean up wizard entries
-            wizard_model_name = f"x_{model_name.replace('.', '_')}_wizard"
-            self.env[wizard_model_name].search([
-                ('x_record_id', 'in', record_ids)
-            ]).unlink()
-
-            return True
-        except Exception as e:
-            _logger.error(f"Failed to restore records in {model_name}: {e}")
-            raise
-
-    @api.model
-    def permanent_delete_records(self, model_name, record_ids):
-        """
-        Permanently delete soft-deleted records using original unlink
+        Records whose unique key is now used by a live record, or whose required
+        parent is deleted, are left deleted: a notification action listing them is
+        returned instead of True.
         """
         try:
-            records = self.env[model_name].browse(record_ids)
-            if not records:
-                return True
-
-            # Use the original unlink if patched
-            if hasattr(records, 'unlink_original'):
-                records.unlink_original()
-            else:
-                records.unlink()
-
-            _logger.info(f"Permanently deleted {len(records)} records in {model_name}")
-
-            # Clean up wizard entries
-            wizard_model_name = f"x_{model_name.replace('.', '_')}_wizard"
-            self.env[wizard_model_name].search([
-                ('x_record_id', 'in', record_ids)
-            ]).unlink()
-
-            return True
+            if self.env['soft.delete.job']._should_enqueue(record_ids):
+                return self.env['soft.delete.job']._enqueue(model_name, 'restore', record_ids)
+            check = self._restore_records(model_name, record_ids)
+            return self.env['soft.delete.restore.check'].sudo()._get_skipped_notification(model_name, check) or True
         except Exception as e:
-            _logger.error(f"Failed to permanently delete records in {model_name}: {e}")
-            raise
-
-    @api.model
-    def populate_wizard_records(self, model_name, wizard_model_name):
-        """
-        Populate the wizard with soft-deleted records of the given model.
-        Called by the 'Populate ... Records' server action.
-        """
-        try:
-            _logger.info(f"Populating wizard {wizard_model_name} for model {model_name}")
-
-            model = self.env[model_name]
-            wizard_model = self.env[wizard_model_name]
-            ir_model = self.env['ir.model'].search([('model', '=', model_name)], limit=1)
-
-            if not ir_model:
-                raise ValueError(f"Model {model_name} not found in ir.model")
-
-            # Get soft-deleted records
-            deleted_records = model.with_context(active_test=False).search([('x_is_deleted', '=', True)])
-
-            # Clear outdated wizard records
-            existing_wizards = wizard_model.search([('x_model_id', '=', ir_model.id)])
-            for wiz in existing_wizards:
-                if not model.browse(wiz.x_record_id).exists() or not model.browse(wiz.x_record_id).x_is_deleted:
-                    wiz.unlink()
-
-            # Create new wizard entries
-            vals_list = []
-            for record in deleted_records:
-                if not wizard_model.search([('x_model_id', '=', ir_model.id), ('x_record_id', '=', record.id)], limit=1):
-                    vals_list.append({
-                        'x_model_id': ir_model.id,
-                        'x_record_id': record.id,
-                        'x_display_name': record.display_name or f"Record {record.id}",
-                    })
-
-            if vals_list:
-                wizard_model.create(vals_list)
-                _logger.info(f"Created {len(vals_list)} wizard records for {wizard_model_name}")
-
-        except Exception as e:
-            _logger.error(f"Failed to populate wizard records for {model_name}: {e}")
+            _logger.error(f"Failed to restore records in {model_name}: {e}")
             raise
 
     @api.model
-    def restore_records(self, model_name, record_ids):
-        """
-        Restore soft-deleted records by setting x_is_deleted = False
-        """
-        try:
-            records = self.env[model_name].browse(record_ids)
+    def _restore_records(self, model_name, record_ids):
+        """Restore the records the pre-check lets through. Returns the pre-check result."""
+        Check = self.env['soft.delete.restore.check'].sudo()
+        Journal = self.env['soft.delete.journal'].sudo()
+        if Journal._is_journal_model(model_name):
+            self.env[model_name].check_access_rights('write')
+            Journal._check_access_rule(model_name, record_ids, 'write')
+            with soft_delete_profiler(self.env, 'restore', model_name) as profiler:
+                with profiler.phase('conflict_check') as stats:
+                    check = Check._classify(model_name, record_ids)
+                    stats['rows'] = len(record_ids) - len(check['restorable'])
+                if check['restorable']:
+                    with profiler.phase('journal_restore') as stats:
+                        stats['rows'] = profiler.rows = Journal._restore(model_name, check['restorable'])
+            return check
+
+        with soft_delete_profiler(self.env, 'restore', model_name) as profiler:
+            with profiler.phase('conflict_check') as stats:
+                check = Check._classify(model_name, record_ids)
+                stats['rows'] = len(record_ids) - len(check['restorable'])
+            record_ids = check['restorable']
+            records = self.env[model_name].browse(record_ids).exists()
             if not records:
-                return True
-
-            records.write({'x_is_deleted': False})
+                return check
+            profiler.rows = len(records)
+
+            with profiler.phase('restore') as stats:
+                deleted = records.filtered('x_is_deleted')
+                batch_ids = set(deleted.mapped('x_delete_batch_id')) if 'x_delete_batch_id' in records._fields else set()
+                records.write(self._get_restore_vals(records))
+                self.env['soft.delete.counter'].sudo()._apply_delta(model_name, -len(deleted))
+                stats['rows'] = len(records)
+
+            # Bring back the children soft-deleted in the same batches
+            with profiler.phase('cascade_restore') as stats:
+                cascade_counts = self.env['soft.delete.cascade'].sudo()._cascade_restore(model_name, deleted.ids, list(batch_ids))
+                stats['rows'] = sum(cascade_counts.values())
             _logger.info(f"Restored {len(records)} records in {model_name}")
 
             # Clean up wizard entries
-            wizard_model_name = f"x_{model_name.replace('.', '_')}_wizard"
-            self.env[wizard_model_name].search([
-                ('x_record_id', 'in', record_ids)
-            ]).unlink()
-
-            return True
-        except Exception as e:
-            _logger.error(f"Failed to restore records in {model_name}: {e}")
-            raise
+            with profiler.phase('wizard_cleanup'):
+                wizard_model_name = f"x_{model_name.replace('.', '_')}_wizard"
+                self.env[wizard_model_name].search([
+                    ('x_record_id', 'in', record_ids)
+                ]).unlink()
+        return check
 
     @api.model
     def permanent_delete_records(self, model_name, record_ids):
         """
-        Permanently delete soft-deleted records using original unlink
+        Permanently delete soft-deleted records using original unlink.
+        Large selections are queued as a chunked background job.
         """
         try:
-            records = self.env[model_name].browse(record_ids)
-            if not records:
+            if self.env['soft.delete.job']._should_enqueue(record_ids):
+                return self.env['soft.delete.job']._enqueue(model_name, 'purge', record_ids)
+
+            # Archive the rows first when the model's policy requires it: a failed export aborts the purge
+            Export = self.env['soft.delete.export'].sudo()
+            if not self.env.context.get('soft_delete_exported') and Export._is_export_required(model_name):
+                Export._export(model_name, record_ids=record_ids)
+
+            Journal = self.env['soft.delete.journal'].sudo()
+            if Journal._is_journal_model(model_name):
+                self.env[model_name].check_access_rights('unlink')
+                Journal._check_access_rule(model_name, record_ids, 'unlink')
+                with soft_delete_profiler(self.env, 'purge', model_name) as profiler:
+                    with profiler.phase('journal_purge') as stats:
+                        stats['rows'] = profiler.rows = Journal._purge(model_name, record_ids)
                 return True
 
-            # Use the original unlink if patched
-            if hasattr(records, 'unlink_original'):
-                records.unlink_original()
-            else:
-                records.unlink()
+            with soft_delete_profiler(self.env, 'purge', model_name) as profiler:
+                records = self.env[model_name].browse(record_ids).exists()
+                if not records:
+                    return True
+                profiler.rows = len(records)
+
+                with profiler.phase('cascade_count') as stats:
+                    deleted_count = len(records.filtered('x_is_deleted'))
+                    # Soft-deleted children removed by the database cascade
+                    cascade_counts = self.env['soft.delete.cascade'].sudo()._cascade_deleted_counts(model_name, records.ids)
+                    stats['rows'] = deleted_count + sum(cascade_counts.values())
+
+                # Use the original unlink if patched, past the database mode trigger
+                with profiler.phase('unlink') as stats, soft_delete_trigger_bypass(self.env.cr):
+                    if hasattr(records, 'unlink_original'):
+                        records.unlink_original()
+                    else:
+                        records.unlink()
+                    stats['rows'] = len(records)
+                    self.env['soft.delete.counter'].sudo()._apply_delta(model_name, -deleted_count)
+                    for child_model, count in cascade_counts.items():
+                        self.env['soft.delete.counter'].sudo()._apply_delta(child_model, -count)
 
-            _logger.info(f"Permanently deleted {len(records)} records in {model_name}")
+                _logger.info(f"Permanently deleted {len(records)} records in {model_name}")
 
-            # Clean up wizard entries
-            wizard_model_name = f"x_{model_name.replace('.', '_')}_wizard"
-            self.env[wizard_model_name].search([
-                ('x_record_id', 'in', record_ids)
-            ]).unlink()
+                # Clean up wizard entries
+                with profiler.phase('wizard_cleanup'):
+                    wizard_model_name = f"x_{model_name.replace('.', '_')}_wizard"
+                    self.env[wizard_model_name].search([
+                        ('x_record_id', 'in', record_ids)
+                    ]).unlink()
 
             return True
         except Exception as e:
@@ -624,11 +915,19 @@ class SoftDeleteConfigSettings(models.TransientModel):
     #         self._ensure_server_action(model, wizard_model_name)
     #     _logger.info("Verified server actions for all configured models")
 
-    def _apply_domain_to_actions(self, model_ids):
+    def _apply_domain_to_actions(self, model_ids, removed_model_ids=()):
         IrModel = self.env['ir.model']
         IrModelData = self.env['ir.model.data']
         IrActionsActWindow = self.env['ir.actions.act_window']
 
+        # Give back their unfiltered action to the models that are no longer soft-deleted
+        removed_models = IrModel.browse(removed_model_ids).exists().mapped('model')
+        if removed_models:
+            IrActionsActWindow.search([
+                ('res_model', 'in', removed_models),
+                ('domain', '=', "[('x_is_deleted', '=', False)]"),
+            ]).write({'domain': False})
+
         # raise UserError(model_ids)
 
         for model in IrModel.browse(model_ids):
@@ -769,9 +1068,12 @@ class SoftDeleteConfigSettings(models.TransientModel):
                 'name': restore_action_name,
                 'model_id': wizard_model.id,
                 'state': 'code',
-                'code': f"""
-                    env['res.config.settings'].restore_records('{model_name}', records.mapped('x_record_id'))
-                """,
+                # Large selections are queued as a job: show the returned notification
+                'code': (
+                    f"result = env['res.config.settings'].restore_records('{model_name}', records.mapped('x_record_id'))\n"
+                    "if isinstance(result, dict):\n"
+                    "    action = result\n"
+                ),
             })
             _logger.info(f"Created restore server action '{restore_action_name}' for wizard {wizard_model_name}")
         else:
@@ -789,9 +1091,12 @@ class SoftDeleteConfigSettings(models.TransientModel):
                 'name': delete_action_name,
                 'model_id': wizard_model.id,
                 'state': 'code',
-                'code': f"""
-                    env['res.config.settings'].permanent_delete_records('{model_name}', records.mapped('x_record_id'))
-                """,
+                # Large selections are queued as a job: show the returned notification
+                'code': (
+                    f"result = env['res.config.settings'].permanent_delete_records('{model_name}', records.mapped('x_record_id'))\n"
+                    "if isinstance(result, dict):\n"
+                    "    action = result\n"
+                ),
             })
             _logger.info(f"Created permanent delete server action '{delete_action_name}' for wizard {wizard_model_name}")
         else:
@@ -833,136 +1138,16 @@ class SoftDeleteConfigSettings(models.TransientModel):
             # Begin transaction
             # self.env.cr.execute("BEGIN;")
 
-            # Step 1: Remove 'x_is_deleted' field from all models
-            _logger.info("Starting cleanup of 'x_is_deleted' fields from all models")
-            x_is_deleted_fields = self.env['ir.model.fields'].search([('name', '=', 'x_is_deleted')])
-            if x_is_deleted_fields:
-                model_names = [field.model for field in x_is_deleted_fields]
-                _logger.info(f"Found {len(x_is_deleted_fields)} 'x_is_deleted' fields in models: {model_names}")
-                x_is_deleted_fields.with_context(_force_unlink=True).unlink()
-                _logger.info(f"Deleted {len(x_is_deleted_fields)} 'x_is_deleted' fields")
-            else:
-                _logger.info("No 'x_is_deleted' fields found in any models")
-
-            # Step 2: Remove inherited views containing 'x_is_deleted' domain
-            _logger.info("Starting cleanup of inherited views with 'x_is_deleted' domain")
-            inherited_views = self.env['ir.ui.view'].search([
-                ('name', 'in', [
-                    'x_soft_delete_manager.tree.view.inherit.dynamic',
-                    'x_soft_delete_manager.tree.view.x_is_deleted.inherit.dynamic',
-                    'x_soft_delete_manager.tree.view.js_class.inherit.dynamic',
-                    'x_soft_delete_manager.kanban.view.inherit.dynamic',
-                    'x_soft_delete_manager.kanban.view.x_is_deleted.inherit.dynamic',
-                    'x_soft_delete_manager.kanban.view.js_class.inherit.dynamic',
-                ])
-            ])
-            if inherited_views:
-                view_data = self.env['ir.model.data'].search([
-                    ('model', '=', 'ir.ui.view'),
-                    ('res_id', 'in', inherited_views.ids)
-                ])
-                if view_data:
-                    view_data.with_context(_force_unlink=True).unlink()
-                    _logger.info(f"Force deleted {len(view_data)} ir.model.data entries for inherited views")
-                inherited_views.with_context(_force_unlink=True).unlink()
-                _logger.info(f"Deleted {len(inherited_views)} inherited views with 'x_is_deleted' domain")
-            else:
-                _logger.info("No inherited views found with 'x_is_deleted' domain")
+            # Steps 0-7: indexes, soft delete fields, dynamic views, action domains, 'x_' models,
+            # their views and server actions, counters: one set-based statement per phase
+            Cleanup = self.env['soft.delete.cleanup']
+            Cleanup._run(Cleanup._plan())
 
-            # Step 3: Clear domains from ir.actions.act_window
-            _logger.info("Starting cleanup of domains from ir.actions.act_window")
-            actions = self.env['ir.actions.act_window'].search([
-                ('domain', '=', "[('x_is_deleted', '=', False)]"),
-                '|', '|',
-                ('view_mode', 'ilike', 'tree'),
-                ('view_mode', 'ilike', 'form'),
-                ('view_mode', 'ilike', 'kanban'),
-            ])
-            if actions:
-                for action in actions:
-                    action.write({'domain': False})
-                    xml_id_record = self.env['ir.model.data'].search([
-                        ('model', '=', 'ir.actions.act_window'),
-                        ('res_id', '=', action.id)
-                    ], limit=1)
-                    if xml_id_record:
-                        _logger.info(f"Cleared domain for action {xml_id_record.module}.{xml_id_record.name}")
-                    else:
-                        _logger.info(f"Cleared domain for action (no XML ID) with ID {action.id}")
-            else:
-                _logger.info("No actions found with x_is_deleted domain")
-
-            # Step 4: Remove models starting with 'x_'
-            _logger.info("Starting cleanup of models starting with 'x_'")
-            model_ids = self.env['ir.model'].search([('model', '=like', 'x_%'), ('model', '!=', 'soft.delete.manager.all.modules')]).ids
-            if model_ids:
-                models = self.env['ir.model'].browse(model_ids)
-                model_names = [model.model for model in models]
-                _logger.info(f"Found {len(model_names)} models to delete: {model_names}")
-
-                # Force delete ir.model.data entries, including noupdate=1
-                model_data = self.env['ir.model.data'].search([('model', '=', 'ir.model'), ('res_id', 'in', model_ids)])
-                if model_data:
-                    model_data.with_context(_force_unlink=True).unlink()
-                    _logger.info(f"Force deleted {len(model_data)} ir.model.data entries for models")
-
-                # Remove related fields (excluding x_is_deleted, already handled)
-                fields = self.env['ir.model.fields'].search([('model_id', 'in', model_ids), ('name', '!=', 'x_is_deleted')])
-                if fields:
-                    fields.with_context(_force_unlink=True).unlink()
-                    _logger.info(f"Deleted {len(fields)} fields for models")
-
-                # Drop database tables for these models
-                for model_name in model_names:
-                    table_name = model_name.replace('.', '_')
-                    try:
-                        self.env.cr.execute(f"DROP TABLE IF EXISTS {table_name} CASCADE;")
-                        _logger.info(f"Dropped table {table_name}")
-                    except Exception as e:
-                        _logger.warning(f"Failed to drop table {table_name}: {str(e)}")
-
-                # Delete the models
-                models.with_context(_force_unlink=True).unlink()
-                _logger.info(f"Deleted {len(model_ids)} models starting with 'x_'")
-
-            # Step 5: Remove views associated with models starting with 'x_'
-            _logger.info("Starting cleanup of views for models starting with 'x_'")
-            view_ids = self.env['ir.ui.view'].search([('model', '=like', 'x_%')]).ids
-            if view_ids:
-                views = self.env['ir.ui.view'].browse(view_ids)
-                _logger.info(f"Found {len(view_ids)} views to delete for models starting with 'x_'")
-                
-                # Force delete ir.model.data entries for views
-                view_data = self.env['ir.model.data'].search([('model', '=', 'ir.ui.view'), ('res_id', 'in', view_ids)])
-                if view_data:
-                    view_data.with_context(_force_unlink=True).unlink()
-                    _logger.info(f"Force deleted {len(view_data)} ir.model.data entries for views")
-                
-                # Delete the views
-                views.with_context(_force_unlink=True).unlink()
-                _logger.info(f"Deleted {len(view_ids)} views for models starting with 'x_'")
-            else:
-                _logger.info("No views found for models starting with 'x_'")
-
-            # Step 6: Remove server actions related to models starting with 'x_'
-            _logger.info("Starting cleanup of server actions for models starting with 'x_'")
-            action_ids = self.env['ir.actions.server'].search([('model_id.model', '=like', 'x_%')]).ids
-            if action_ids:
-                actions = self.env['ir.actions.server'].browse(action_ids)
-                _logger.info(f"Found {len(action_ids)} server actions to delete for models starting with 'x_'")
-                
-                # Force delete ir.model.data entries for actions
-                action_data = self.env['ir.model.data'].search([('model', '=', 'ir.actions.server'), ('res_id', 'in', action_ids)])
-                if action_data:
-                    action_data.with_context(_force_unlink=True).unlink()
-                    _logger.info(f"Force deleted {len(action_data)} ir.model.data entries for server actions")
-                
-                # Delete the actions
-                actions.with_context(_force_unlink=True).unlink()
-                _logger.info(f"Deleted {len(action_ids)} server actions for models starting with 'x_'")
-
-            # Step 7: Clean up soft delete configuration
+            # Step 8: Clean up soft delete configuration
             _logger.info("Cleaning up soft delete configuration")
+            self.env['ir.config_parameter'].sudo().set_param('soft_delete_recocords_recovery.model_ids', '')
+            # Everything was removed: the next save sets every model up again
+            self.env['ir.config_parameter'].sudo().set_param('soft_delete_recocords_recovery.model_fingerprints', False)
             config = self.env['res.config.settings'].search([], limit=1)
             if config:
                 config_data = self.env['ir.model.data'].search([('model', '=', 'res.config.settings'), ('res_id', '=', config.id)])
@@ -972,6 +1157,9 @@ class SoftDeleteConfigSettings(models.TransientModel):
                 config.unlink()
                 _logger.info("Deleted res.config.settings record")
 
+            # Single registry reload, which also restores the original unlink methods
+            Cleanup._reload_registry()
+
             # Commit the transaction
             # self.env.cr.execute("COMMIT;")
             _logger.info("Cleanup action completed successfully")
@@ -992,6 +1180,14 @@ class SoftDeleteConfigSettings(models.TransientModel):
             _logger.error(f"Error during cleanup action: {str(e)}")
             raise
 
+    def action_cleanup_soft_delete_dry_run(self):
+        """Show, per model, what the cleanup would remove and its estimated duration."""
+        return self.env['soft.delete.cleanup.report'].action_open()
+
+    def action_purge_all_deleted(self):
+        """Permanently delete the soft-deleted records of every enabled model, models purged in parallel."""
+        return self.env['soft.delete.purge'].action_purge_all()
+
     @api.onchange('specific_models_recover')
     def _onchange_specific_models_recover(self):
         if self.specific_models_recover:
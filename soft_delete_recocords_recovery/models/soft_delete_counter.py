@@ -0,0 +1,150 @@
+from odoo import models, fields, api
+from odoo.tools import sql
+import logging
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+# Deleted counts served to the list and kanban header badges: {(dbname, model): (expires at, count)}
+DELETED_COUNT_CACHE_TTL = 30
+_deleted_count_cache = {}
+_deleted_count_cache_lock = threading.Lock()
+
+
+class SoftDeleteCounter(models.Model):
+    _name = 'soft.delete.counter'
+    _description = 'Soft Delete Counter'
+    _order = 'model'
+
+    model = fields.Char(string='Model Name', required=True, readonly=True, index=True)
+    model_id = fields.Many2one('ir.model', string='Model', ondelete='cascade', readonly=True)
+    deleted_count = fields.Integer(string='Deleted Records', readonly=True)
+
+    _sql_constraints = [
+        ('model_uniq', 'unique(model)', 'A counter already exists for this model.'),
+    ]
+
+    @api.model
+    def _apply_delta(self, model_name, delta):
+        """
+        Add ``delta`` to the deleted-record counter of ``model_name``.
+        Runs in the caller's transaction, so the counter is rolled back with it.
+        """
+        if not delta:
+            return
+        self.env.cr.execute("""
+            INSERT INTO soft_delete_counter
+                (model, model_id, deleted_count, create_uid, write_uid, create_date, write_date)
+            SELECT %(model)s, (SELECT id FROM ir_model WHERE model = %(model)s), GREATEST(%(delta)s, 0),
+                   %(uid)s, %(uid)s, now() at time zone 'UTC', now() at time zone 'UTC'
+            ON CONFLICT (model) DO UPDATE
+            SET deleted_count = GREATEST(soft_delete_counter.deleted_count + %(delta)s, 0),
+                write_uid = EXCLUDED.write_uid,
+                write_date = EXCLUDED.write_date
+        """, {'model': model_name, 'delta': delta, 'uid': self.env.uid})
+        self.invalidate_model(['deleted_count'])
+        self._invalidate_deleted_count_cache([model_name])
+
+    @api.model
+    def _reconcile_counters(self, model_names=None):
+        """
+        Rebuild the counters from the source tables, one COUNT per model
+        served by the partial x_is_deleted index. Defaults to all enabled models.
+        """
+        if model_names is None:
+            model_ids = self.env['res.config.settings']._get_previous_model_ids()
+            model_names = self.env['ir.model'].browse(model_ids).filtered(lambda m: not m.transient).mapped('model')
+
+        cr = self.env.cr
+        for model_name in model_names:
+            if model_name not in self.env:
+                continue
+            table_name = self.env[model_name]._table
+            if not sql.column_exists(cr, table_name, 'x_is_deleted'):
+                continue
+            Journal = self.env['soft.delete.journal'].sudo()
+            if Journal._is_journal_model(model_name):
+                count = Journal._count(model_name)
+            else:
+                self.env[model_name].flush_model(['x_is_deleted'])
+                cr.execute(f'SELECT COUNT(*) FROM "{table_name}" WHERE x_is_deleted')
+                count = cr.fetchone()[0]
+            cr.execute("""
+                INSERT INTO soft_delete_counter
+                    (model, model_id, deleted_count, create_uid, write_uid, create_date, write_date)
+                SELECT %(model)s, (SELECT id FROM ir_model WHERE model = %(model)s), %(count)s,
+                       %(uid)s, %(uid)s, now() at time zone 'UTC', now() at time zone 'UTC'
+                ON CONFLICT (model) DO UPDATE
+                SET deleted_count = EXCLUDED.deleted_count,
+                    write_uid = EXCLUDED.write_uid,
+                    write_date = EXCLUDED.write_date
+            """, {'model': model_name, 'count': count, 'uid': self.env.uid})
+            _logger.info(f"Reconciled soft delete counter for {model_name}: {count}")
+        self.invalidate_model(['deleted_count'])
+        self._invalidate_deleted_count_cache(model_names)
+        return True
+
+    @api.model
+    def _invalidate_deleted_count_cache(self, model_names):
+        """
+        Drop the cached badge counts of ``model_names`` now and once the transaction
+        commits, so that no reader caches the count of the uncommitted state.
+        Other workers catch up when their entries expire.
+        """
+        keys = [(self.env.cr.dbname, model_name) for model_name in model_names]
+
+        def invalidate():
+            with _deleted_count_cache_lock:
+                for key in keys:
+                    _deleted_count_cache.pop(key, None)
+
+        invalidate()
+        self.env.cr.postcommit.add(invalidate)
+
+    @api.model
+    def get_deleted_counts(self, model_names):
+        """
+        Return {model: deleted count} for the header badges of many models at once.
+
+        Counts come from a short-lived in-memory cache, then from the counters in
+        one query; models without a counter yet count 0, no table is scanned here.
+        Models the user cannot read are left out.
+        """
+        dbname = self.env.cr.dbname
+        now = time.monotonic()
+        model_names = [
+            name for name in dict.fromkeys(model_names or [])
+            if name in self.env and 'x_is_deleted' in self.env[name]._fields
+            and self.env[name].check_access_rights('read', raise_exception=False)
+        ]
+
+        counts = {}
+        with _deleted_count_cache_lock:
+            for model_name in model_names:
+                cached = _deleted_count_cache.get((dbname, model_name))
+                if cached and cached[0] > now:
+                    counts[model_name] = cached[1]
+        missing = [name for name in model_names if name not in counts]
+        if missing:
+            self.env.cr.execute(
+                "SELECT model, deleted_count FROM soft_delete_counter WHERE model = ANY(%s)", (missing,))
+            # Models without a counter yet show no badge until the enable path or the cron creates it
+            fetched = dict(self.env.cr.fetchall())
+            expires = now + DELETED_COUNT_CACHE_TTL
+            with _deleted_count_cache_lock:
+                for model_name in missing:
+                    counts[model_name] = fetched.get(model_name, 0)
+                    _deleted_count_cache[(dbname, model_name)] = (expires, counts[model_name])
+        return counts
+
+    @api.model
+    def _ensure_counters(self, model_names):
+        """Reconcile the models that have no counter yet (e.g. newly enabled ones)."""
+        missing = set(model_names) - set(self.search([('model', 'in', model_names)]).mapped('model'))
+        if missing:
+            self._reconcile_counters(sorted(missing))
+
+    @api.model
+    def _cron_reconcile_counters(self):
+        self._reconcile_counters()
@@ -0,0 +1,235 @@
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+import csv
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+
+_logger = logging.getLogger(__name__)
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_FETCH_SIZE = 2000
+EXPORT_FILESTORE_DIR = 'soft_delete_exports'
+JOURNAL_COLUMNS = ['record_id', 'name', 'deleted_at', 'deleted_by', 'batch_id', 'payload']
+
+
+class SoftDeleteExport(models.Model):
+    """Archive of soft-deleted rows, streamed to a gzipped JSONL or CSV file before they are purged."""
+    _name = 'soft.delete.export'
+    _description = 'Soft Delete Export'
+    _order = 'id desc'
+
+    model = fields.Char(string='Model Name', required=True, readonly=True, index=True)
+    batch_id = fields.Char(string='Deletion Batch', readonly=True)
+    file_format = fields.Selection([('jsonl', 'JSON Lines'), ('csv', 'CSV')], string='Format', readonly=True)
+    state = fields.Selection([('done', 'Done'), ('failed', 'Failed')], string='Status', readonly=True)
+    row_count = fields.Integer(string='Rows', readonly=True)
+    file_size = fields.Integer(string='File Size (bytes)', readonly=True)
+    file_path = fields.Char(string='File', readonly=True)
+    checksum = fields.Char(string='SHA-256', readonly=True)
+    attachment_id = fields.Many2one('ir.attachment', string='Attachment', readonly=True, ondelete='set null')
+    duration_ms = fields.Float(string='Duration (ms)', readonly=True, digits=(16, 1))
+    error = fields.Text(string='Error', readonly=True)
+
+    @api.model
+    def _is_export_required(self, model_name):
+        return model_name in self.env['soft.delete.model.policy']._get_export_required_model_names()
+
+    @api.model
+    def _get_export_params(self):
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        file_format = ICPSudo.get_param('soft_delete_recocords_recovery.export_format', 'jsonl')
+        directory = ICPSudo.get_param('soft_delete_recocords_recovery.export_directory', '')
+        return file_format, directory
+
+    @api.model
+    def _get_export_query(self, model_name, file_format, batch_id=False, record_ids=None):
+        """Query selecting the rows to export, one JSON text per row for JSON Lines."""
+        if self.env['soft.delete.journal']._is_journal_model(model_name):
+            where, params = 'model = %s AND NOT is_cascade', [model_name]
+            if batch_id:
+                where += ' AND batch_id = %s'
+                params.append(batch_id)
+            if record_ids is not None:
+                where += ' AND record_id = ANY(%s)'
+                params.append(list(record_ids))
+            if file_format == 'jsonl':
+                select = 'jsonb_build_object({})::text'.format(', '.join(f"'{col}', {col}" for col in JOURNAL_COLUMNS))
+            else:
+                select = ', '.join(JOURNAL_COLUMNS)
+            return f'SELECT {select} FROM soft_delete_journal WHERE {where} ORDER BY record_id', params
+
+        Model = self.env[model_name]
+        Model.flush_model()
+        where, params = 't.x_is_deleted', []
+        if batch_id:
+            where += ' AND t.x_delete_batch_id = %s'
+            params.append(batch_id)
+        if record_ids is not None:
+            where += ' AND t.id = ANY(%s)'
+            params.append(list(record_ids))
+        select = 'to_jsonb(t)::text' if file_format == 'jsonl' else 't.*'
+        return f'SELECT {select} FROM "{Model._table}" t WHERE {where} ORDER BY t.id', params
+
+    @api.model
+    def _get_target_path(self, model_name, file_format, batch_id, directory):
+        """Return (full path, filestore relative name or False) of a new export file."""
+        file_name = (
+            f"{model_name}-{batch_id or 'all'}-{fields.Datetime.now():%Y%m%d%H%M%S}-"
+            f"{uuid.uuid4().hex[:8]}.{file_format}.gz"
+        )
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            return os.path.join(directory, file_name), False
+        store_fname = f'{EXPORT_FILESTORE_DIR}/{file_name}'
+        full_path = self.env['ir.attachment']._full_path(store_fname)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        return full_path, store_fname
+
+    @api.model
+    def _write_file(self, path, query, params, file_format):
+        """
+        Stream the rows of ``query`` through a server-side cursor into a gzipped
+        file, EXPORT_FETCH_SIZE rows at a time: memory does not depend on the row
+        count. Returns the number of rows written.
+        """
+        # A named cursor on the same connection sees the rows of the current transaction
+        named_cursor = self.env.cr._cnx.cursor(f'soft_delete_export_{uuid.uuid4().hex}')
+        named_cursor.itersize = EXPORT_FETCH_SIZE
+        rows = 0
+        try:
+            named_cursor.execute(query, params)
+            with gzip.open(path, 'wt', encoding='utf-8', newline='') as stream:
+                writer = None
+                while True:
+                    chunk = named_cursor.fetchmany(EXPORT_FETCH_SIZE)
+                    if not chunk:
+                        break
+                    if file_format == 'jsonl':
+                        stream.writelines(f'{row[0]}\n' for row in chunk)
+                    else:
+                        if writer is None:
+                            writer = csv.writer(stream)
+                            writer.writerow([column.name for column in named_cursor.description])
+                        writer.writerows([self._csv_value(value) for value in row] for row in chunk)
+                    rows += len(chunk)
+        finally:
+            named_cursor.close()
+        return rows
+
+    @api.model
+    def _csv_value(self, value):
+        if value is None:
+            return ''
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, default=str)
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        return value
+
+    @api.model
+    def _file_digests(self, path):
+        """SHA-256 and SHA-1 of a file, read block by block."""
+        sha256, sha1 = hashlib.sha256(), hashlib.sha1()
+        with open(path, 'rb') as stream:
+            for block in iter(lambda: stream.read(1 << 20), b''):
+                sha256.update(block)
+                sha1.update(block)
+        return sha256.hexdigest(), sha1.hexdigest()
+
+    @api.model
+    def _export(self, model_name, batch_id=False, record_ids=None, file_format=None, raise_on_error=True):
+        """
+        Export the soft-deleted rows of ``model_name`` (optionally of one deletion
+        batch, or restricted to ``record_ids``) to a gzipped file in the configured
+        directory, or in the filestore as an attachment when none is configured.
+        Returns the soft.delete.export record.
+        """
+        default_format, directory = self._get_export_params()
+        file_format = file_format or default_format
+        query, params = self._get_export_query(model_name, file_format, batch_id, record_ids)
+        path, store_fname = self._get_target_path(model_name, file_format, batch_id, directory)
+        part_path = f'{path}.part'
+        vals = {'model': model_name, 'batch_id': batch_id, 'file_format': file_format}
+        start = time.perf_counter()
+        try:
+            with self.env.cr.savepoint():
+                rows = self._write_file(part_path, query, params, file_format)
+            os.replace(part_path, path)
+        except Exception as e:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            _logger.error(f"Export of deleted {model_name} records failed: {e}")
+            if raise_on_error:
+                raise UserError(_("Export of the deleted %(model)s records failed: %(error)s", model=model_name, error=e))
+            vals.update({'state': 'failed', 'error': str(e), 'duration_ms': (time.perf_counter() - start) * 1000})
+            return self.sudo().create(vals)
+
+        sha256, sha1 = self._file_digests(path)
+        vals.update({
+            'state': 'done',
+            'row_count': rows,
+            'file_size': os.path.getsize(path),
+            'file_path': path,
+            'checksum': sha256,
+            'duration_ms': (time.perf_counter() - start) * 1000,
+        })
+        export = self.sudo().create(vals)
+        if store_fname:
+            export.attachment_id = self._attach(export, store_fname, sha1)
+        _logger.info(f"Exported {rows} deleted {model_name} records to {path} in {vals['duration_ms']:.0f}ms")
+        return export
+
+    @api.model
+    def _attach(self, export, store_fname, sha1):
+        """Reference a file already written in the filestore from an attachment, without loading it."""
+        Attachment = self.env['ir.attachment'].sudo()
+        # Removed by the filestore garbage collector if the transaction is rolled back
+        Attachment._mark_for_gc(store_fname)
+        attachment = Attachment.create({
+            'name': os.path.basename(store_fname),
+            'type': 'binary',
+            'mimetype': 'application/gzip',
+            'res_model': self._name,
+            'res_id': export.id,
+        })
+        # store_fname, file_size and checksum cannot be written through the ORM
+        self.env.cr.execute("""
+            UPDATE ir_attachment SET store_fname = %s, file_size = %s, checksum = %s WHERE id = %s
+        """, (store_fname, export.file_size, sha1, attachment.id))
+        attachment.invalidate_recordset(['store_fname', 'file_size', 'checksum'])
+        return attachment
+
+
+class SoftDeleteExportWizard(models.TransientModel):
+    _name = 'soft.delete.export.wizard'
+    _description = 'Export Deleted Records'
+
+    model_id = fields.Many2one(
+        'ir.model', string='Model', required=True, ondelete='cascade',
+        domain="[('field_id.name', '=', 'x_is_deleted')]"
+    )
+    batch_id = fields.Char(string='Deletion Batch', help='Export only the records deleted in this batch.')
+    file_format = fields.Selection(
+        [('jsonl', 'JSON Lines'), ('csv', 'CSV')], string='Format', required=True,
+        default=lambda self: self.env['soft.delete.export']._get_export_params()[0]
+    )
+
+    def action_export(self):
+        self.ensure_one()
+        export = self.env['soft.delete.export']._export(
+            self.model_id.model, (self.batch_id or '').strip() or False,
+            file_format=self.file_format, raise_on_error=False,
+        )
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Export'),
+            'res_model': 'soft.delete.export',
+            'res_id': export.id,
+            'view_mode': 'form',
+            'target': 'current',
+        }
@@ -0,0 +1,184 @@
+from odoo import models, fields, api, SUPERUSER_ID
+from odoo.tools import sql, escape_psql
+import hashlib
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# kind: (index name suffix, index definition, required column)
+INDEX_DEFINITIONS = {
+    'recovery': ('x_is_deleted_partial_idx', '(id) WHERE x_is_deleted', 'x_is_deleted'),
+    'deleted_at': ('x_deleted_at_idx', '(x_deleted_at) WHERE x_is_deleted', 'x_deleted_at'),
+    'batch': ('x_delete_batch_idx', '(x_delete_batch_id) WHERE x_is_deleted', 'x_delete_batch_id'),
+    'live': ('x_is_deleted_live_idx', '(x_is_deleted, id)', 'x_is_deleted'),
+    # Definition and column depend on the model's searchable name, see _get_name_index_definition
+    'name': ('x_name_search_idx', None, None),
+}
+
+
+class SoftDeleteIndex(models.Model):
+    _name = 'soft.delete.index'
+    _description = 'Soft Delete Index'
+    _order = 'model, kind'
+
+    name = fields.Char(string='Index Name', required=True, readonly=True)
+    model_id = fields.Many2one('ir.model', string='Model', required=True, ondelete='cascade', readonly=True)
+    model = fields.Char(related='model_id.model', string='Model Name', store=True, readonly=True)
+    table_name = fields.Char(string='Table', required=True, readonly=True)
+    kind = fields.Selection([
+        ('recovery', 'Recovery (partial)'),
+        ('deleted_at', 'Deletion Date'),
+        ('batch', 'Deletion Batch'),
+        ('live', 'Live (composite)'),
+        ('name', 'Name Search'),
+    ], string='Kind', required=True, readonly=True)
+    state = fields.Selection([
+        ('missing', 'Missing'),
+        ('invalid', 'Building / Invalid'),
+        ('valid', 'Valid'),
+    ], string='Status', compute='_compute_pg_status')
+    size = fields.Char(string='Size', compute='_compute_pg_status')
+
+    _sql_constraints = [
+        ('name_uniq', 'unique(name)', 'An index with this name is already managed.'),
+    ]
+
+    def _compute_pg_status(self):
+        status = {}
+        if self:
+            self.env.cr.execute("""
+                SELECT c.relname, i.indisvalid, pg_size_pretty(pg_relation_size(c.oid))
+                FROM pg_class c
+                JOIN pg_index i ON i.indexrelid = c.oid
+                WHERE c.relname IN %s
+            """, (tuple(self.mapped('name')),))
+            status = {name: (valid, size) for name, valid, size in self.env.cr.fetchall()}
+        for record in self:
+            if record.name in status:
+                valid, size = status[record.name]
+                record.state = 'valid' if valid else 'invalid'
+                record.size = size
+            else:
+                record.state = 'missing'
+                record.size = False
+
+    @api.model
+    def _get_index_name(self, table_name, kind):
+        """Build the index name, shortened with a hash to fit PostgreSQL's 63 characters."""
+        suffix = INDEX_DEFINITIONS[kind][0]
+        name = f"{table_name}_{suffix}"
+        if len(name) > 63:
+            digest = hashlib.md5(table_name.encode()).hexdigest()[:8]
+            name = f"{table_name[:62 - len(suffix) - 9]}_{digest}_{suffix}"
+        return name
+
+    @api.model
+    def _ensure_indexes(self, model_names, live=False):
+        """
+        Register the indexes of the given models and schedule their creation.
+        The indexes are built with CREATE INDEX CONCURRENTLY once the current
+        transaction is committed, as that statement cannot run inside it.
+        """
+        kinds = ['recovery', 'deleted_at', 'batch', 'name'] + (['live'] if live else [])
+        IrModel = self.env['ir.model']
+        Browser = self.env['soft.delete.recovery.browser']
+        existing = self.search([('model', 'in', model_names)])
+
+        # Live indexes are optional: drop them when the option is disabled
+        existing.filtered(lambda idx: idx.kind not in kinds)._drop_indexes()
+
+        vals_list = []
+        for model_name in model_names:
+            table_name = self.env[model_name]._table
+            for kind in kinds:
+                if kind == 'name' and not Browser._get_sort_field(self.env[model_name]):
+                    continue
+                index_name = self._get_index_name(table_name, kind)
+                if not existing.filtered(lambda idx: idx.name == index_name):
+                    vals_list.append({
+                        'name': index_name,
+                        'model_id': IrModel._get_id(model_name),
+                        'table_name': table_name,
+                        'kind': kind,
+                    })
+        if vals_list:
+            self.create(vals_list)
+            _logger.info(f"Registered {len(vals_list)} soft delete indexes for {model_names}")
+
+        self._schedule_build()
+
+    @api.model
+    def _schedule_build(self):
+        postcommit = self.env.cr.postcommit
+        if postcommit.data.get('soft_delete_build_indexes'):
+            return
+        postcommit.data['soft_delete_build_indexes'] = True
+        registry = self.env.registry
+
+        @postcommit.add
+        def build_indexes():
+            with registry.cursor() as cr:
+                # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+                cr._cnx.autocommit = True
+                env = api.Environment(cr, SUPERUSER_ID, {})
+                env['soft.delete.index'].search([])._build_indexes()
+
+    def _build_indexes(self):
+        """Create the missing indexes, rebuilding the ones left invalid by a failed build."""
+        cr = self.env.cr
+        for index in self:
+            state = index.state
+            if state == 'valid':
+                continue
+            suffix, definition, column = INDEX_DEFINITIONS[index.kind]
+            if index.kind == 'name':
+                column = self.env['soft.delete.recovery.browser']._get_sort_field(self.env[index.model])
+                if not column:
+                    continue
+                definition = self._get_name_index_definition(column, where='x_is_deleted')
+            if not sql.column_exists(cr, index.table_name, column):
+                _logger.warning(f"Column {column} missing on {index.table_name}, skipping index {index.name}")
+                continue
+            try:
+                if state == 'invalid':
+                    cr.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{index.name}"')
+                cr.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{index.name}" ON "{index.table_name}" {definition}')
+                _logger.info(f"Created index {index.name} on {index.table_name}")
+            except Exception as e:
+                _logger.error(f"Failed to create index {index.name} on {index.table_name}: {str(e)}")
+        self.invalidate_recordset(['state', 'size'])
+
+    @api.model
+    def _get_name_index_definition(self, column, where=None):
+        """
+        Index serving substring searches on ``column``: a pg_trgm GIN index, or a
+        b-tree on lower(column) serving prefix searches when pg_trgm is unavailable.
+        """
+        where = f' WHERE {where}' if where else ''
+        if self.env.registry.has_trigram:
+            return f'USING gin ("{column}" gin_trgm_ops){where}'
+        return f'(lower("{column}") text_pattern_ops){where}'
+
+    @api.model
+    def _get_name_search_domain(self, field_name, table, search, where='TRUE', params=()):
+        """
+        Domain matching ``search`` in ``field_name`` through its name index: a
+        substring match with pg_trgm, otherwise a prefix match on lower(column).
+        """
+        if self.env.registry.has_trigram:
+            return [(field_name, 'ilike', search)]
+        return [('id', 'inselect', (
+            f'SELECT id FROM "{table}" WHERE {where} AND lower("{field_name}") LIKE %s',
+            list(params) + [escape_psql(search.lower()) + '%'],
+        ))]
+
+    def _drop_indexes(self):
+        """Drop the given indexes from the database and stop managing them."""
+        for index in self:
+            self.env.cr.execute(f'DROP INDEX IF EXISTS "{index.name}"')
+            _logger.info(f"Dropped index {index.name} on {index.table_name}")
+        self.unlink()
+
+    def action_rebuild(self):
+        self._schedule_build()
+        return True
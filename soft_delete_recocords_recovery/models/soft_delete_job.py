@@ -0,0 +1,226 @@
+from odoo import models, fields, api, _
+import json
+import logging
+import time
+
+from .soft_delete_purge import _process_chunk
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_JOB_THRESHOLD = 5000
+# Seconds a cron run may spend on jobs before handing over to the next run
+CRON_TIME_BUDGET = 240
+
+
+class SoftDeleteJob(models.Model):
+    _name = 'soft.delete.job'
+    _description = 'Soft Delete Background Job'
+    _order = 'id desc'
+
+    name = fields.Char(string='Job', compute='_compute_name')
+    model = fields.Char(string='Model Name', required=True, readonly=True, index=True)
+    model_id = fields.Many2one('ir.model', string='Model', ondelete='cascade', readonly=True)
+    user_id = fields.Many2one(
+        'res.users', string='User', readonly=True,
+        help='The job runs with the access rights of the user who queued it.'
+    )
+    operation = fields.Selection([
+        ('restore', 'Restore'),
+        ('purge', 'Permanent Delete'),
+    ], string='Operation', required=True, readonly=True)
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('partial', 'Done with Skipped Records'),
+        ('failed', 'Failed'),
+    ], string='Status', default='pending', required=True, readonly=True, index=True)
+    record_ids = fields.Text(string='Record IDs', readonly=True)
+    chunk_size = fields.Integer(string='Chunk Size', default=DEFAULT_CHUNK_SIZE, readonly=True)
+    total_count = fields.Integer(string='Total', readonly=True)
+    done_count = fields.Integer(string='Done', readonly=True)
+    skipped_count = fields.Integer(string='Skipped', readonly=True)
+    skipped_details = fields.Text(string='Skipped Records', readonly=True)
+    processed_seconds = fields.Float(string='Processing Time (s)', readonly=True)
+    started_at = fields.Datetime(string='Started', readonly=True)
+    finished_at = fields.Datetime(string='Finished', readonly=True)
+    error = fields.Text(string='Error', readonly=True)
+
+    progress = fields.Float(string='Progress', compute='_compute_progress')
+    rate = fields.Float(string='Rows / Second', compute='_compute_progress', digits=(16, 1))
+    eta = fields.Char(string='ETA', compute='_compute_progress')
+
+    @api.depends('operation', 'model', 'total_count')
+    def _compute_name(self):
+        labels = dict(self._fields['operation'].selection)
+        for job in self:
+            job.name = f"{labels.get(job.operation, '')} {job.total_count} records of {job.model}"
+
+    @api.depends('done_count', 'skipped_count', 'total_count', 'processed_seconds')
+    def _compute_progress(self):
+        for job in self:
+            handled = job.done_count + job.skipped_count
+            job.progress = 100.0 * handled / job.total_count if job.total_count else 0.0
+            job.rate = handled / job.processed_seconds if job.processed_seconds else 0.0
+            remaining = job.total_count - handled
+            if job.state in ('pending', 'running') and job.rate and remaining:
+                minutes, seconds = divmod(int(remaining / job.rate), 60)
+                job.eta = f"{minutes}m {seconds:02d}s"
+            else:
+                job.eta = False
+
+    @api.model
+    def _get_job_params(self):
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        threshold = int(ICPSudo.get_param('soft_delete_recocords_recovery.job_threshold', DEFAULT_JOB_THRESHOLD))
+        chunk_size = int(ICPSudo.get_param('soft_delete_recocords_recovery.job_chunk_size', DEFAULT_CHUNK_SIZE))
+        return threshold, max(chunk_size, 1)
+
+    @api.model
+    def _should_enqueue(self, record_ids):
+        """Whether an operation on ``record_ids`` is large enough to run in the background."""
+        if self.env.context.get('soft_delete_job_running'):
+            return False
+        threshold = self._get_job_params()[0]
+        return 0 < threshold < len(record_ids)
+
+    @api.model
+    def _check_access(self, model_name, operation, record_ids):
+        """The job runs later as the cron user: check now that the caller may run it on every record."""
+        mode = 'write' if operation == 'restore' else 'unlink'
+        self.env[model_name].check_access_rights(mode)
+        Journal = self.env['soft.delete.journal']
+        if Journal.sudo()._is_journal_model(model_name):
+            Journal._check_access_rule(model_name, record_ids, mode)
+        else:
+            records = self.env[model_name].with_context(
+                active_test=False, soft_delete_include_deleted=True).browse(record_ids).exists()
+            records.check_access_rule(mode)
+
+    @api.model
+    def _enqueue(self, model_name, operation, record_ids):
+        """Create a job for ``operation`` on ``record_ids`` and wake up the job cron."""
+        chunk_size = self._get_job_params()[1]
+        record_ids = sorted(set(record_ids))
+        self._check_access(model_name, operation, record_ids)
+        job = self.sudo().create({
+            'model': model_name,
+            'model_id': self.env['ir.model']._get_id(model_name),
+            'user_id': self.env.uid,
+            'operation': operation,
+            'record_ids': json.dumps(record_ids),
+            'total_count': len(record_ids),
+            'chunk_size': chunk_size,
+        })
+        self.env.ref('soft_delete_recocords_recovery.ir_cron_soft_delete_jobs').sudo()._trigger()
+        _logger.info(f"Queued soft delete job {job.id}: {operation} {len(record_ids)} records of {model_name}")
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Queued'),
+                'message': _('%s records will be processed in the background (Soft Delete > Jobs).', len(record_ids)),
+                'type': 'info',
+                'sticky': False,
+            }
+        }
+
+    def _get_runnable_jobs(self):
+        """Oldest unfinished job of each model: jobs on the same model run one after the other."""
+        jobs = self.search([('state', 'in', ('pending', 'running'))], order='id')
+        runnable = self.browse()
+        seen_models = set()
+        for job in jobs:
+            if job.model not in seen_models:
+                seen_models.add(job.model)
+                runnable |= job
+        return runnable
+
+    def _lock(self):
+        """Lock the job row so that a concurrent runner skips it instead of processing it twice."""
+        self.env.cr.execute(
+            "SELECT id FROM soft_delete_job WHERE id = %s FOR UPDATE SKIP LOCKED", (self.id,)
+        )
+        return bool(self.env.cr.fetchone())
+
+    def _run_chunk(self):
+        """
+        Process the next chunk of the job. Records the restore pre-check leaves out,
+        and records failing on their own, are skipped and listed on the job. The
+        caller commits.
+        """
+        self.ensure_one()
+        record_ids = json.loads(self.record_ids or '[]')
+        position = self.done_count + self.skipped_count
+        chunk = record_ids[position:position + self.chunk_size]
+        start = time.perf_counter()
+
+        # Jobs queued before the user was stored run as their creator
+        user = self.user_id or self.create_uid
+        settings = self.env['res.config.settings'].with_user(user).with_context(soft_delete_job_running=True)
+        reasons = {}
+        if self.operation == 'restore':
+            def operation(ids):
+                check = settings._restore_records(self.model, ids)
+                for kind in ('conflicting', 'orphaned'):
+                    reasons.update((record_id, '; '.join(why)) for record_id, why in check[kind].items())
+        else:
+            def operation(ids):
+                settings.permanent_delete_records(self.model, ids)
+        for record_id in _process_chunk(self.env, operation, self.model, chunk):
+            reasons[record_id] = _("could not be processed, see the server log")
+
+        skipped_count = self.skipped_count + len(reasons)
+        vals = {
+            'done_count': self.done_count + len(chunk) - len(reasons),
+            'skipped_count': skipped_count,
+            'processed_seconds': self.processed_seconds + time.perf_counter() - start,
+        }
+        if reasons:
+            lines = [f"#{record_id}: {reason}" for record_id, reason in sorted(reasons.items())]
+            vals['skipped_details'] = '\n'.join(filter(None, [self.skipped_details] + lines))
+        if position + len(chunk) >= self.total_count:
+            vals.update({'state': 'partial' if skipped_count else 'done', 'finished_at': fields.Datetime.now()})
+        self.write(vals)
+
+    @api.model
+    def _cron_process_jobs(self):
+        """
+        Process queued jobs chunk by chunk, committing after each chunk so that an
+        interrupted run resumes from the last committed chunk.
+        """
+        deadline = time.monotonic() + CRON_TIME_BUDGET
+        cr = self.env.cr
+        while time.monotonic() < deadline:
+            jobs = self._get_runnable_jobs()
+            if not jobs:
+                return
+            for job in jobs:
+                if time.monotonic() >= deadline:
+                    break
+                if not job._lock():
+                    continue
+                if job.state == 'pending':
+                    job.write({'state': 'running', 'started_at': fields.Datetime.now()})
+                try:
+                    job._run_chunk()
+                    cr.commit()
+                except Exception as e:
+                    cr.rollback()
+                    _logger.error(f"Soft delete job {job.id} failed on {job.model}: {str(e)}")
+                    job.write({'state': 'failed', 'error': str(e), 'finished_at': fields.Datetime.now()})
+                    cr.commit()
+                    continue
+                if job.state in ('done', 'partial'):
+                    _logger.info(
+                        f"Soft delete job {job.id} done: {job.done_count}/{job.total_count} records of {job.model}, "
+                        f"{job.skipped_count} skipped, in {job.processed_seconds:.1f}s ({job.rate:.1f} rows/s)"
+                    )
+        # Time budget exhausted: continue in a new cron run
+        self.env.ref('soft_delete_recocords_recovery.ir_cron_soft_delete_jobs')._trigger()
+
+    def action_retry(self):
+        self.filtered(lambda job: job.state == 'failed').write({'state': 'pending', 'error': False})
+        self.env.ref('soft_delete_recocords_recovery.ir_cron_soft_delete_jobs').sudo()._trigger()
+        return True
@@ -0,0 +1,427 @@
+from odoo import models, fields, api, _
+from odoo.exceptions import AccessError, UserError
+from odoo.tools import sql
+from odoo.tools.query import Query
+import json
+import logging
+import psycopg2
+import uuid
+
+from .soft_delete_cascade import METADATA_FIELDS
+
+_logger = logging.getLogger(__name__)
+
+# Payload key holding the many2many links removed together with the row
+M2M_KEY = '__many2many__'
+DEFAULT_PAGE_SIZE = 80
+
+
+class SoftDeleteJournal(models.Model):
+    """
+    Append-only trash of the models in journal storage mode: the patched unlink
+    snapshots the rows here, then really deletes them from the source table.
+    """
+    _name = 'soft.delete.journal'
+    _description = 'Soft Delete Journal'
+    _order = 'id desc'
+    _log_access = False
+
+    model = fields.Char(string='Model Name', required=True, readonly=True)
+    record_id = fields.Integer(string='Record ID', required=True, readonly=True)
+    name = fields.Char(string='Name', readonly=True)
+    payload = fields.Json(string='Payload', readonly=True)
+    deleted_at = fields.Datetime(string='Deleted On', readonly=True)
+    deleted_by = fields.Many2one('res.users', string='Deleted By', readonly=True, ondelete='set null')
+    batch_id = fields.Char(string='Deletion Batch', readonly=True, index=True)
+    is_cascade = fields.Boolean(
+        string='Deleted With Its Parent', readonly=True,
+        help='Child row removed by the database cascade: it is restored and purged together with its parent.'
+    )
+
+    def init(self):
+        # Keyset pagination of the recovery screen and lookups by original id
+        sql.create_index(self._cr, 'soft_delete_journal_model_record_idx', self._table, ['model', 'record_id'])
+        # Name part of the recovery screen search box
+        definition = self.env['soft.delete.index']._get_name_index_definition('name', where='NOT is_cascade')
+        self._cr.execute(f'CREATE INDEX IF NOT EXISTS soft_delete_journal_name_idx ON "{self._table}" {definition}')
+
+    @api.model
+    def _is_journal_model(self, model_name):
+        return model_name in self.env['soft.delete.model.policy']._get_journal_model_names()
+
+    # ------------------------------------------------------------------
+    # Snapshot
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _snapshot_rows(self, model_name, record_ids):
+        """Return {id: row as JSON} of the given rows, with their many2many links."""
+        cr = self.env.cr
+        Model = self.env[model_name]
+        cr.execute(f'SELECT t.id, to_jsonb(t) FROM "{Model._table}" t WHERE t.id = ANY(%s)', (list(record_ids),))
+        payloads = dict(cr.fetchall())
+        for field in Model._fields.values():
+            if field.type != 'many2many' or not field.store or not payloads:
+                continue
+            cr.execute(f"""
+                SELECT "{field.column1}", array_agg("{field.column2}")
+                FROM "{field.relation}" WHERE "{field.column1}" = ANY(%s)
+                GROUP BY "{field.column1}"
+            """, (list(payloads),))
+            for record_id, target_ids in cr.fetchall():
+                payloads[record_id].setdefault(M2M_KEY, {})[field.name] = target_ids
+        return payloads
+
+    @api.model
+    def _archive(self, records, batch_id=None):
+        """
+        Snapshot ``records`` and their ondelete='cascade' children into the journal,
+        before the caller deletes them. Returns the deletion batch id.
+        """
+        if not records:
+            return batch_id
+        batch_id = batch_id or uuid.uuid4().hex
+        records.flush_model()
+        names = dict(records.name_get())
+        self._archive_ids(records._name, records.ids, batch_id, names=names, seen={})
+        self.env['soft.delete.counter'].sudo()._apply_delta(records._name, len(records))
+        _logger.info(f"Journaled {len(records)} {records._name} records (batch {batch_id})")
+        return batch_id
+
+    @api.model
+    def _archive_ids(self, model_name, record_ids, batch_id, names=None, seen=None):
+        cr = self.env.cr
+        # Guard against cycles in self-referencing hierarchies
+        visited = seen.setdefault(model_name, set())
+        record_ids = [record_id for record_id in record_ids if record_id not in visited]
+        if not record_ids:
+            return
+        visited.update(record_ids)
+
+        payloads = self._snapshot_rows(model_name, record_ids)
+        if not payloads:
+            return
+        is_cascade = names is None
+        ids = list(payloads)
+        cr.execute("""
+            INSERT INTO soft_delete_journal (model, record_id, name, payload, deleted_at, deleted_by, batch_id, is_cascade)
+            SELECT %s, r.record_id, r.name, r.payload::jsonb, now() at time zone 'UTC', %s, %s, %s
+            FROM unnest(%s::int[], %s::varchar[], %s::text[]) AS r(record_id, name, payload)
+        """, (
+            model_name, self.env.uid, batch_id, is_cascade,
+            ids,
+            [(names or {}).get(record_id) or f"Record {record_id}" for record_id in ids],
+            [json.dumps(payloads[record_id]) for record_id in ids],
+        ))
+
+        if is_cascade:
+            # Flagged children leave the source table with their parent
+            flagged = sum(1 for payload in payloads.values() if payload.get('x_is_deleted'))
+            if flagged:
+                self.env['soft.delete.counter'].sudo()._apply_delta(model_name, -flagged)
+
+        for child_model, fk in self.env['soft.delete.cascade']._get_cascade_children(model_name):
+            Child = self.env[child_model]
+            Child.flush_model([fk])
+            cr.execute(f'SELECT id FROM "{Child._table}" WHERE "{fk}" = ANY(%s)', (ids,))
+            child_ids = [row[0] for row in cr.fetchall()]
+            if child_ids:
+                self._archive_ids(child_model, child_ids, batch_id, seen=seen)
+
+    # ------------------------------------------------------------------
+    # Record rules
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _get_rule_query(self, model_name, operation, record_ids=None):
+        """
+        Return (SQL, params) selecting the journaled record ids of ``model_name`` the
+        current user may access for ``operation``, the record rules being evaluated on
+        the snapshots, or None when no rule applies to the user.
+        """
+        Model = self.env[model_name].sudo(False)
+        query = Query(self.env.cr, Model._table)
+        Model._apply_ir_rules(query, operation)
+        from_clause, where_clause, rule_params = query.get_sql()
+        if not where_clause:
+            return None
+        where, params = 'j.model = %s AND NOT j.is_cascade', [model_name]
+        if record_ids is not None:
+            where += ' AND j.record_id = ANY(%s)'
+            params.append(list(record_ids))
+        # The CTE named after the table makes the rule clauses read the snapshots
+        return f"""
+            WITH "{Model._table}" AS (
+                SELECT r.* FROM soft_delete_journal j, jsonb_populate_record(NULL::"{Model._table}", j.payload) r
+                WHERE {where}
+            )
+            SELECT "{Model._table}".id FROM {from_clause} WHERE {where_clause}
+        """, params + rule_params
+
+    @api.model
+    def _check_access_rule(self, model_name, record_ids, operation):
+        """Raise AccessError unless the record rules let the current user ``operation`` every journaled record."""
+        rule_query = self._get_rule_query(model_name, operation, record_ids)
+        if rule_query is None:
+            return
+        self.env.cr.execute(*rule_query)
+        denied = set(record_ids) - {row[0] for row in self.env.cr.fetchall()}
+        if denied:
+            _logger.info(f"Access denied on journaled {model_name} records {sorted(denied)[:20]} for uid {self.env.uid}")
+            raise AccessError(_("You are not allowed to %(operation)s some deleted %(model)s records.",
+                                operation=operation, model=model_name))
+
+    # ------------------------------------------------------------------
+    # Restore and purge
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _reinsert(self, model_name, entries):
+        """Re-insert journal ``entries`` [(journal id, payload)] into the source table with their original ids."""
+        cr = self.env.cr
+        Model = self.env[model_name]
+        payloads = [payload for __, payload in entries]
+        try:
+            with cr.savepoint():
+                cr.execute(f"""
+                    INSERT INTO "{Model._table}"
+                    SELECT * FROM jsonb_populate_recordset(NULL::"{Model._table}", %s::jsonb)
+                """, (json.dumps(payloads),))
+                for field in Model._fields.values():
+                    if field.type != 'many2many' or not field.store:
+                        continue
+                    links = [
+                        (payload['id'], target_id)
+                        for payload in payloads
+                        for target_id in payload.get(M2M_KEY, {}).get(field.name, [])
+                    ]
+                    if not links:
+                        continue
+                    # Links to records deleted in the meantime are dropped
+                    cr.execute(f"""
+                        INSERT INTO "{field.relation}" ("{field.column1}", "{field.column2}")
+                        SELECT r.source_id, r.target_id
+                        FROM unnest(%s::int[], %s::int[]) AS r(source_id, target_id)
+                        WHERE EXISTS (SELECT 1 FROM "{self.env[field.comodel_name]._table}" c WHERE c.id = r.target_id)
+                        ON CONFLICT DO NOTHING
+                    """, ([link[0] for link in links], [link[1] for link in links]))
+        except psycopg2.IntegrityError as e:
+            raise UserError(_("Cannot restore %(model)s records from the journal: %(error)s",
+                              model=model_name, error=str(e).strip()))
+        cr.execute("DELETE FROM soft_delete_journal WHERE id = ANY(%s)", ([entry_id for entry_id, __ in entries],))
+        Model.invalidate_model()
+
+    @api.model
+    def _restore(self, model_name, record_ids):
+        """
+        Re-insert the journaled ``record_ids`` of ``model_name``, then the children
+        deleted with them, level by level. Returns the number of restored records.
+        """
+        cr = self.env.cr
+        self.flush_model()
+        cr.execute("""
+            SELECT id, payload, batch_id FROM soft_delete_journal
+            WHERE model = %s AND record_id = ANY(%s) AND NOT is_cascade
+            ORDER BY id
+        """, (model_name, list(record_ids)))
+        rows = cr.fetchall()
+        if not rows:
+            return 0
+        # Rows flagged before the switch to journal mode were journaled with their flag: bring them back live
+        cleared = {field: None for field in METADATA_FIELDS}
+        cleared['x_is_deleted'] = False
+        self._reinsert(model_name, [
+            (row[0], dict(row[1], **{key: value for key, value in cleared.items() if key in row[1]}))
+            for row in rows
+        ])
+        self.env['soft.delete.counter'].sudo()._apply_delta(model_name, -len(rows))
+
+        batch_ids = list({row[2] for row in rows})
+        self._restore_children(model_name, [row[1]['id'] for row in rows], batch_ids)
+        self.invalidate_model()
+        _logger.info(f"Restored {len(rows)} {model_name} records from the journal")
+        return len(rows)
+
+    @api.model
+    def _restore_children(self, model_name, parent_ids, batch_ids):
+        cr = self.env.cr
+        for child_model, fk in self.env['soft.delete.cascade']._get_cascade_children(model_name):
+            cr.execute("""
+                SELECT id, payload FROM soft_delete_journal
+                WHERE model = %s AND is_cascade AND batch_id = ANY(%s)
+                  AND (payload ->> %s)::int = ANY(%s)
+                ORDER BY id
+            """, (child_model, batch_ids, fk, list(parent_ids)))
+            rows = cr.fetchall()
+            if not rows:
+                continue
+            self._reinsert(child_model, rows)
+            flagged = sum(1 for __, payload in rows if payload.get('x_is_deleted'))
+            if flagged:
+                self.env['soft.delete.counter'].sudo()._apply_delta(child_model, flagged)
+            self._restore_children(child_model, [payload['id'] for __, payload in rows], batch_ids)
+
+    @api.model
+    def _purge(self, model_name, record_ids):
+        """
+        Drop the journaled ``record_ids`` of ``model_name``, and the children of the
+        batches left without any top-level record. Returns the number of purged records.
+        """
+        cr = self.env.cr
+        self.flush_model()
+        cr.execute("""
+            DELETE FROM soft_delete_journal
+            WHERE model = %s AND record_id = ANY(%s) AND NOT is_cascade
+            RETURNING batch_id
+        """, (model_name, list(record_ids)))
+        batch_ids = [row[0] for row in cr.fetchall()]
+        if not batch_ids:
+            return 0
+        cr.execute("""
+            DELETE FROM soft_delete_journal j
+            WHERE j.is_cascade AND j.batch_id = ANY(%s)
+              AND NOT EXISTS (
+                  SELECT 1 FROM soft_delete_journal p
+                  WHERE p.batch_id = j.batch_id AND NOT p.is_cascade
+              )
+        """, (list(set(batch_ids)),))
+        self.invalidate_model()
+        self.env['soft.delete.counter'].sudo()._apply_delta(model_name, -len(batch_ids))
+        _logger.info(f"Purged {len(batch_ids)} {model_name} records from the journal")
+        return len(batch_ids)
+
+    @api.model
+    def _count(self, model_name):
+        self.flush_model()
+        self.env.cr.execute(
+            "SELECT COUNT(*) FROM soft_delete_journal WHERE model = %s AND NOT is_cascade", (model_name,))
+        return self.env.cr.fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Storage mode changes
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _move_flagged_to_journal(self, model_name):
+        """Journal the rows flagged x_is_deleted, keeping their deletion metadata, then delete them."""
+        Model = self.env[model_name].with_context(active_test=False, soft_delete_include_deleted=True)
+        records = Model.search([('x_is_deleted', '=', True)])
+        if not records:
+            return 0
+        records.flush_model()
+        names = self.env['soft.delete.wizard.sync']._compute_display_names(model_name, records.ids)
+        for batch_id, record_ids in self._group_by_batch(records).items():
+            self._archive_ids(model_name, record_ids, batch_id, names=names, seen={})
+        if 'x_deleted_at' in Model._fields:
+            self.env.cr.execute("""
+                UPDATE soft_delete_journal
+                SET deleted_at = COALESCE((payload ->> 'x_deleted_at')::timestamp, deleted_at),
+                    deleted_by = COALESCE((payload ->> 'x_deleted_by')::int, deleted_by)
+                WHERE model = %s AND record_id = ANY(%s) AND NOT is_cascade
+            """, (model_name, records.ids))
+        # The counter already includes the flagged rows
+        if hasattr(records, 'unlink_original'):
+            records.unlink_original()
+        else:
+            records.unlink()
+        _logger.info(f"Moved {len(records)} soft-deleted {model_name} records to the journal")
+        return len(records)
+
+    @api.model
+    def _group_by_batch(self, records):
+        """Return {batch id: record ids}; rows flagged before batches existed share a new batch."""
+        groups = {}
+        for record in records:
+            batch_id = 'x_delete_batch_id' in records._fields and record.x_delete_batch_id
+            groups.setdefault(batch_id or False, []).append(record.id)
+        if False in groups:
+            groups[uuid.uuid4().hex] = groups.pop(False)
+        return groups
+
+    @api.model
+    def _move_journal_to_flagged(self, model_name):
+        """Re-insert the journaled rows as soft-deleted (flagged) rows."""
+        cr = self.env.cr
+        Model = self.env[model_name]
+        self.flush_model()
+        cr.execute("""
+            SELECT record_id, deleted_at, deleted_by, batch_id FROM soft_delete_journal
+            WHERE model = %s AND NOT is_cascade
+        """, (model_name,))
+        rows = cr.fetchall()
+        if not rows:
+            return 0
+        self._restore(model_name, [row[0] for row in rows])
+        metadata = ''
+        if 'x_deleted_at' in Model._fields:
+            metadata = ', x_deleted_at = r.deleted_at, x_deleted_by = r.deleted_by, x_delete_batch_id = r.batch_id'
+        cr.execute(f"""
+            UPDATE "{Model._table}" t SET x_is_deleted = TRUE{metadata}
+            FROM unnest(%s::int[], %s::timestamp[], %s::int[], %s::varchar[]) AS r(id, deleted_at, deleted_by, batch_id)
+            WHERE t.id = r.id
+        """, tuple(list(column) for column in zip(*rows)))
+        Model.invalidate_model()
+        self.env['soft.delete.counter'].sudo()._apply_delta(model_name, len(rows))
+        _logger.info(f"Moved {len(rows)} journaled {model_name} records back to the source table")
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Recovery screen
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _fetch_page(self, model_name, cursor=False, limit=DEFAULT_PAGE_SIZE, order='id', search='',
+                    deleted_from=False, deleted_to=False):
+        """Same contract as soft.delete.recovery.browser.fetch_page, read from the journal."""
+        domain = [('model', '=', model_name), ('is_cascade', '=', False)]
+        if deleted_from:
+            domain.append(('deleted_at', '>=', deleted_from))
+        if deleted_to:
+            domain.append(('deleted_at', '<=', deleted_to))
+        search = (search or '').strip()
+        if search:
+            search_domain = [
+                self.env['soft.delete.index']._get_name_search_domain(
+                    'name', self._table, search, where='model = %s AND NOT is_cascade', params=[model_name]),
+                [('deleted_by', 'in', self.env['soft.delete.recovery.browser']._search_user_ids(search))],
+            ]
+            if search.isdigit():
+                search_domain.append([('record_id', '=', int(search))])
+            domain += ['|'] * (len(search_domain) - 1) + [leaf for leaves in search_domain for leaf in leaves]
+
+        # Only the records the user may read, like the non-sudo search of the flag mode
+        rule_query = self._get_rule_query(model_name, 'read')
+        if rule_query is not None:
+            domain.append(('record_id', 'inselect', rule_query))
+
+        if order == 'name':
+            if cursor:
+                value, last_id = cursor
+                domain += ['|', ('name', '>', value), '&', ('name', '=', value), ('record_id', '>', last_id)]
+            order_by = 'name asc, record_id asc'
+        else:
+            if cursor:
+                domain.append(('record_id', '<', cursor[1]))
+            order_by = 'record_id desc'
+
+        entries = self.search(domain, order=order_by, limit=limit + 1)
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+        next_cursor = False
+        if has_more and entries:
+            last = entries[-1]
+            next_cursor = [last.name if order == 'name' else last.record_id, last.record_id]
+
+        counter = self.env['soft.delete.counter'].sudo().search([('model', '=', model_name)], limit=1)
+        return {
+            'records': [{
+                'id': entry.record_id,
+                'display_name': entry.name,
+                'deleted_at': entry.deleted_at,
+                'deleted_by': entry.deleted_by.name or False,
+            } for entry in entries],
+            'next_cursor': next_cursor,
+            'total': counter.deleted_count,
+            'can_sort_by_name': True,
+            'has_metadata': True,
+        }
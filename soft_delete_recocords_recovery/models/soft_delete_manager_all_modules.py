@@ -1,4 +1,4 @@
-from odoo import models, fields, tools
+from odoo import models, fields, api, tools
 import logging
 
 _logger = logging.getLogger(__name__)
@@ -14,44 +14,16 @@ class SoftDeleteManagerAllModules(models.Model):
     model_display_name = fields.Char(string='Model Name', compute='_compute_model_display_name', readonly=True)
 
     def _query(self):
-        cr = self._cr
-        cr.execute("""
-            SELECT id, model FROM ir_model
-            WHERE model LIKE 'x_%%_wizard'
-        """)
-        rows = cr.fetchall()
-
-        union_sql = []
-        row_id = 1
-        for model_id, model_name in rows:
-            table_name = model_name.replace('.', '_')
-            try:
-                # Check if table exists
-                cr.execute("""
-                    SELECT COUNT(*) FROM information_schema.tables 
-                    WHERE table_name = %s
-                """, [table_name])
-                if cr.fetchone()[0] == 1:
-                    cr.execute(f"SELECT COUNT(*) FROM {table_name}")
-                    count = cr.fetchone()[0]
-                else:
-                    count = 0
-            except Exception as e:
-                _logger.warning(f"⚠️ Cannot count rows for model: {model_name} (table: {table_name}): {e}")
-                count = 0
-
-            union_sql.append(f"""
-                SELECT {row_id} AS id,
-                       CAST({model_id} AS INTEGER) AS model_id,
-                       {int(count)} AS record_count_for_pivot
-            """)
-            row_id += 1
-
-        if not union_sql:
-            union_sql.append("SELECT 1 AS id, NULL::INTEGER AS model_id, 0 AS record_count_for_pivot")
-
-        return " UNION ALL ".join(union_sql)
-
+        # Counts are maintained incrementally in soft_delete_counter by the
+        # soft delete, restore and permanent delete paths, so the view stays
+        # current without counting the source tables.
+        return """
+            SELECT c.id AS id,
+                   w.id AS model_id,
+                   c.deleted_count AS record_count_for_pivot
+            FROM soft_delete_counter c
+            JOIN ir_model w ON w.model = 'x_' || replace(c.model, '.', '_') || '_wizard'
+        """
 
     def init(self):
         tools.drop_view_if_exists(self._cr, self._table)
@@ -76,3 +48,11 @@ class SoftDeleteManagerAllModules(models.Model):
     def _compute_model_count(self):
         for record in self:
             record.model_count = record.record_count_for_pivot
+
+    @api.model
+    def action_reconcile_counters(self):
+        self.env['soft.delete.counter']._reconcile_counters()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'reload',
+        }
@@ -0,0 +1,216 @@
+from odoo import models, fields, api, tools
+from datetime import timedelta
+import logging
+import time
+
+from .soft_delete_purge import _process_chunk
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_PURGE_BATCH_SIZE = 1000
+DEFAULT_PURGE_TIME_BUDGET = 300
+
+
+class SoftDeleteModelPolicy(models.Model):
+    _name = 'soft.delete.model.policy'
+    _description = 'Soft Delete Model Policy'
+    _order = 'model'
+
+    model_id = fields.Many2one(
+        'ir.model', string='Model', required=True, ondelete='cascade',
+        domain="[('transient', '=', False)]"
+    )
+    model = fields.Char(related='model_id.model', string='Model Name', store=True, readonly=True)
+    active = fields.Boolean(default=True)
+    retention_days = fields.Integer(
+        string='Purge After (Days)',
+        help='Soft-deleted records older than this are permanently deleted by the purge cron. 0 keeps them forever.'
+    )
+    storage_mode = fields.Selection([
+        ('flag', 'Flag (x_is_deleted)'),
+        ('journal', 'Journal'),
+        ('trigger', 'Database Trigger'),
+    ], string='Storage', default='flag', required=True,
+        help='Flag: deleted records stay in their table, flagged with x_is_deleted.\n'
+             'Journal: deleted records are moved to the shared trash journal and removed from their table, '
+             'keeping its indexes and live queries lean.\n'
+             'Database Trigger: deleted records are flagged by a BEFORE DELETE trigger, which also catches '
+             'raw SQL deletes; deletes run as a single statement.'
+    )
+    require_export = fields.Boolean(
+        string='Export Before Purge',
+        help='Deleted records are exported to a gzipped file before being permanently deleted; '
+             'the purge is aborted when the export fails.'
+    )
+    last_purge_date = fields.Datetime(string='Last Purge', readonly=True)
+    last_purge_count = fields.Integer(string='Last Purged Records', readonly=True)
+
+    _sql_constraints = [
+        ('model_uniq', 'unique(model_id)', 'A policy already exists for this model.'),
+        ('retention_days_positive', 'CHECK(retention_days >= 0)', 'The retention period cannot be negative.'),
+    ]
+
+    @api.model
+    @tools.ormcache()
+    def _get_journal_model_names(self):
+        """Models in journal storage mode, cached per registry."""
+        self.env.cr.execute("""
+            SELECT model FROM soft_delete_model_policy WHERE active AND storage_mode = 'journal'
+        """)
+        return frozenset(row[0] for row in self.env.cr.fetchall())
+
+    @api.model
+    @tools.ormcache()
+    def _get_trigger_model_names(self):
+        """Models in database trigger mode, cached per registry."""
+        self.env.cr.execute("""
+            SELECT model FROM soft_delete_model_policy WHERE active AND storage_mode = 'trigger'
+        """)
+        return frozenset(row[0] for row in self.env.cr.fetchall())
+
+    @api.model
+    @tools.ormcache()
+    def _get_export_required_model_names(self):
+        """Models whose deleted records must be exported before a purge, cached per registry."""
+        self.env.cr.execute("""
+            SELECT model FROM soft_delete_model_policy WHERE active AND require_export
+        """)
+        return frozenset(row[0] for row in self.env.cr.fetchall())
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        policies = super().create(vals_list)
+        if any(policy.require_export for policy in policies):
+            self.flush_model()
+            self.clear_caches()
+        for mode in ('journal', 'trigger'):
+            mode_policies = policies.filtered(lambda policy: policy.storage_mode == mode and policy.active)
+            if mode_policies:
+                self._switch_storage(mode_policies.mapped('model'), mode)
+        return policies
+
+    def write(self, vals):
+        previous = {policy.id: policy._get_effective_mode() for policy in self}
+        res = super().write(vals)
+        if 'require_export' in vals or 'active' in vals:
+            self.flush_model()
+            self.clear_caches()
+        if 'storage_mode' in vals or 'active' in vals:
+            for policy in self:
+                mode = policy._get_effective_mode()
+                if mode != previous[policy.id]:
+                    self._switch_storage([policy.model], mode)
+        return res
+
+    def unlink(self):
+        switched_models = [policy.model for policy in self if policy._get_effective_mode() != 'flag']
+        res = super().unlink()
+        self.clear_caches()
+        if switched_models:
+            self._switch_storage(switched_models, 'flag')
+        return res
+
+    def _get_effective_mode(self):
+        self.ensure_one()
+        return self.storage_mode if self.active else 'flag'
+
+    @api.model
+    def _switch_storage(self, model_names, mode):
+        """Move the deleted records of ``model_names`` to their new storage."""
+        self.flush_model()
+        self.clear_caches()
+        # Triggers first: moving rows to the journal deletes them from their table
+        self.env['soft.delete.trigger'].sudo()._sync_triggers()
+        Journal = self.env['soft.delete.journal'].sudo()
+        for model_name in model_names:
+            if model_name not in self.env or 'x_is_deleted' not in self.env[model_name]._fields:
+                continue
+            if mode == 'journal':
+                Journal._move_flagged_to_journal(model_name)
+            else:
+                Journal._move_journal_to_flagged(model_name)
+
+    @api.model
+    def _get_purge_params(self):
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        batch_size = int(ICPSudo.get_param('soft_delete_recocords_recovery.purge_batch_size', DEFAULT_PURGE_BATCH_SIZE))
+        time_budget = int(ICPSudo.get_param('soft_delete_recocords_recovery.purge_time_budget', DEFAULT_PURGE_TIME_BUDGET))
+        return max(batch_size, 1), time_budget
+
+    def _get_expired_domain(self):
+        """Domain of the soft-deleted records older than the retention period."""
+        self.ensure_one()
+        cutoff = fields.Datetime.now() - timedelta(days=self.retention_days)
+        if 'x_deleted_at' not in self.env[self.model]._fields:
+            # write_date is set by the soft delete write
+            return [('x_is_deleted', '=', True), ('write_date', '<', cutoff)]
+        # Records soft-deleted before x_deleted_at existed fall back on write_date
+        return [
+            ('x_is_deleted', '=', True),
+            '|', ('x_deleted_at', '<', cutoff),
+            '&', ('x_deleted_at', '=', False), ('write_date', '<', cutoff),
+        ]
+
+    def _purge_expired(self, batch_size, deadline):
+        """
+        Permanently delete the expired records of the policy's model through the
+        original unlink, one committed batch at a time, until ``deadline``. Each
+        batch runs under a savepoint and the records that cannot be deleted are
+        skipped, so they do not block the retention. Returns the number of purged records.
+        """
+        self.ensure_one()
+        model_name = self.model
+        if model_name not in self.env or 'x_is_deleted' not in self.env[model_name]._fields:
+            _logger.warning(f"Soft delete is not enabled on {model_name}, skipping retention purge")
+            return 0
+
+        Model = self.env[model_name].with_context(active_test=False)
+        settings = self.env['res.config.settings'].with_context(soft_delete_job_running=True)
+        domain = self._get_expired_domain()
+        if self.storage_mode == 'journal':
+            # The journal keeps the original ids: the purge goes through the same API
+            Model = self.env['soft.delete.journal'].sudo()
+            domain = [('model', '=', model_name), ('is_cascade', '=', False),
+                      ('deleted_at', '<', fields.Datetime.now() - timedelta(days=self.retention_days))]
+        purged = skipped = last_id = 0
+        start = time.perf_counter()
+
+        while time.monotonic() < deadline:
+            # Keyset pagination: the skipped records are expired too and must not be selected again
+            batch = Model.search(domain + [('id', '>', last_id)], limit=batch_size, order='id')
+            if not batch:
+                break
+            last_id = batch[-1].id
+            batch_ids = batch.mapped('record_id') if self.storage_mode == 'journal' else batch.ids
+            skipped_ids = _process_chunk(
+                self.env, lambda ids: settings.permanent_delete_records(model_name, ids), model_name, batch_ids)
+            purged += len(batch_ids) - len(skipped_ids)
+            skipped += len(skipped_ids)
+            self.write({'last_purge_date': fields.Datetime.now(), 'last_purge_count': purged})
+            self.env.cr.commit()
+
+        duration = time.perf_counter() - start
+        if purged or skipped:
+            _logger.info(
+                f"Retention purge of {model_name}: {purged} records in {duration:.1f}s "
+                f"({purged / duration if duration else 0:.1f} rows/s), {skipped} skipped"
+            )
+        return purged
+
+    @api.model
+    def _cron_purge_expired(self):
+        """Purge expired soft-deleted records of every policy within the configured time budget."""
+        batch_size, time_budget = self._get_purge_params()
+        deadline = time.monotonic() + time_budget
+        policies = self.search([('retention_days', '>', 0)])
+        total = 0
+        for policy in policies:
+            if time.monotonic() >= deadline:
+                _logger.info("Retention purge time budget exhausted, resuming on the next run")
+                break
+            try:
+                total += policy._purge_expired(batch_size, deadline)
+            except Exception as e:
+                self.env.cr.rollback()
+                _logger.error(f"Retention purge failed for {policy.model}: {str(e)}")
+        _logger.info(f"Retention purge finished: {total} records purged")
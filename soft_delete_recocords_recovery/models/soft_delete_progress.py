@@ -0,0 +1,42 @@
+from odoo import models, fields, api
+
+
+class SoftDeleteProgress(models.Model):
+    """
+    Resume position of the chunked purges and uninstall restores. Written with
+    plain SQL on each chunk: unlike ir.config_parameter, saving a position does
+    not clear the registry caches nor signal the other workers.
+    """
+    _name = 'soft.delete.progress'
+    _description = 'Soft Delete Progress'
+    _log_access = False
+
+    key = fields.Char(string='Key', required=True, readonly=True)
+    last_id = fields.Integer(string='Last ID', readonly=True)
+
+    _sql_constraints = [
+        ('key_uniq', 'unique(key)', 'A progress already exists for this key.'),
+    ]
+
+    @api.model
+    def _get(self, key):
+        """Last processed id saved under ``key``, 0 when there is none."""
+        self.env.cr.execute("SELECT last_id FROM soft_delete_progress WHERE key = %s", (key,))
+        row = self.env.cr.fetchone()
+        return row[0] if row else 0
+
+    @api.model
+    def _set(self, key, last_id):
+        self.env.cr.execute("""
+            INSERT INTO soft_delete_progress (key, last_id) VALUES (%s, %s)
+            ON CONFLICT (key) DO UPDATE SET last_id = EXCLUDED.last_id
+        """, (key, last_id))
+
+    @api.model
+    def _clear(self, key):
+        self.env.cr.execute("DELETE FROM soft_delete_progress WHERE key = %s", (key,))
+
+    @api.model
+    def _clear_prefix(self, prefix):
+        """Drop the positions whose key starts with ``prefix``."""
+        self.env.cr.execute("DELETE FROM soft_delete_progress WHERE left(key, %s) = %s", (len(prefix), prefix))
@@ -0,0 +1,225 @@
+from odoo import models, api, tools, _
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_PURGE_WORKERS = 4
+DEFAULT_CHUNK_SIZE = 1000
+# soft.delete.progress key of the last purged id of each model, so that an interrupted purge resumes where it stopped
+PROGRESS_KEY = 'purge:%s'
+
+
+def _iter_id_chunks(env, query, params, last_id, chunk_size):
+    """Yield the ids returned by ``query`` chunk by chunk, keyset-paginated on id: nothing is loaded at once."""
+    while True:
+        env.cr.execute(query, params + [last_id, chunk_size])
+        ids = [row[0] for row in env.cr.fetchall()]
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+def _process_chunk(env, operation, model_name, ids):
+    """
+    Run ``operation`` on ``ids`` under a savepoint. A failing chunk is bisected
+    down to the records that fail on their own, which are logged and skipped.
+    Returns the list of skipped ids.
+    """
+    try:
+        with env.cr.savepoint():
+            operation(ids)
+        return []
+    except Exception as e:
+        env.invalidate_all()
+        if len(ids) == 1:
+            _logger.warning(f"Skipping {model_name} record {ids[0]}: {e}")
+            return ids
+        middle = len(ids) // 2
+        return (_process_chunk(env, operation, model_name, ids[:middle])
+                + _process_chunk(env, operation, model_name, ids[middle:]))
+
+
+def _purge_model_in_worker(registry, uid, context, model_name, chunk_size):
+    """Purge one model on a cursor of its own, in a pool thread. Failures are returned, not raised."""
+    threading.current_thread().dbname = registry.db_name
+    start = time.perf_counter()
+    result = {'model': model_name, 'purged': 0, 'skipped': 0, 'error': False}
+    try:
+        with registry.cursor() as cr:
+            env = api.Environment(cr, uid, context)
+            result.update(env['soft.delete.purge']._purge_model(model_name, chunk_size, commit=True))
+    except Exception as e:
+        _logger.exception(f"Parallel purge of {model_name} failed")
+        result['error'] = str(e)
+    result['duration_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+class SoftDeletePurge(models.AbstractModel):
+    _name = 'soft.delete.purge'
+    _description = 'Soft Delete Parallel Purge'
+
+    @api.model
+    def _get_purge_levels(self, model_names):
+        """
+        Split ``model_names`` into levels of models without foreign keys between them.
+        A model comes after every model referencing it through a stored many2one, so
+        children are purged before their parents. Models in a reference cycle are
+        purged one at a time at the end.
+        """
+        names = set(model_names)
+        referrers = {model_name: set() for model_name in names}
+        for model_name in names:
+            for field in self.env[model_name]._fields.values():
+                if (field.type == 'many2one' and field.store
+                        and field.comodel_name in names and field.comodel_name != model_name):
+                    referrers[field.comodel_name].add(model_name)
+
+        levels, done = [], set()
+        while referrers:
+            level = sorted(model_name for model_name, refs in referrers.items() if refs <= done)
+            if not level:
+                _logger.warning(f"Reference cycle between {sorted(referrers)}, purging them one at a time")
+                levels.extend([model_name] for model_name in sorted(referrers))
+                break
+            levels.append(level)
+            done.update(level)
+            for model_name in level:
+                del referrers[model_name]
+        return levels
+
+    @api.model
+    def _get_worker_count(self):
+        """Configured pool size, capped so the pool and the calling cursor fit in the connection pool."""
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        workers = int(ICPSudo.get_param('soft_delete_recocords_recovery.purge_workers', DEFAULT_PURGE_WORKERS))
+        return max(1, min(workers, tools.config['db_maxconn'] - 1))
+
+    @api.model
+    def _purge_model(self, model_name, chunk_size=DEFAULT_CHUNK_SIZE, commit=False):
+        """
+        Permanently delete every soft-deleted record of ``model_name``, ``chunk_size``
+        at a time. Each chunk runs under a savepoint and a failing chunk is bisected
+        down to the records that cannot be deleted, which are skipped. The last purged
+        id is saved with each chunk, and each chunk is committed when ``commit`` is
+        set: an interrupted purge resumes after it. Returns {'purged', 'skipped'}.
+        """
+        Progress = self.env['soft.delete.progress'].sudo()
+        progress_key = PROGRESS_KEY % model_name
+        last_id = Progress._get(progress_key)
+        settings = self.env['res.config.settings'].with_context(soft_delete_job_running=True)
+        Export = self.env['soft.delete.export'].sudo()
+        if Export._is_export_required(model_name):
+            # One archive for the whole model rather than one per chunk, made again when resuming
+            Export._export(model_name)
+            settings = settings.with_context(soft_delete_exported=True)
+        if self.env['soft.delete.journal'].sudo()._is_journal_model(model_name):
+            query = """
+                SELECT record_id FROM soft_delete_journal
+                WHERE model = %s AND NOT is_cascade AND record_id > %s
+                ORDER BY record_id LIMIT %s
+            """
+            params = [model_name]
+        else:
+            Model = self.env[model_name]
+            Model.flush_model(['x_is_deleted'])
+            query = f'SELECT id FROM "{Model._table}" WHERE x_is_deleted AND id > %s ORDER BY id LIMIT %s'
+            params = []
+
+        purged = skipped = 0
+        for ids in _iter_id_chunks(self.env, query, params, last_id, chunk_size):
+            skipped_ids = _process_chunk(
+                self.env, lambda chunk: settings.permanent_delete_records(model_name, chunk), model_name, ids)
+            purged += len(ids) - len(skipped_ids)
+            skipped += len(skipped_ids)
+            Progress._set(progress_key, ids[-1])
+            if commit:
+                self.env.cr.commit()
+        # Done: the next purge starts over, retrying the skipped records
+        Progress._clear(progress_key)
+        _logger.info(f"Purged {purged} {model_name} records, {skipped} skipped")
+        return {'purged': purged, 'skipped': skipped}
+
+    @api.model
+    def purge(self, model_names=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Permanently delete the soft-deleted records of ``model_names`` (default: every
+        enabled model), spreading the models of each dependency level over a pool of
+        workers, each with its own cursor. The workers only see committed data and
+        the current transaction is not committed: callers with pending changes on
+        the purged tables commit them first.
+
+        Returns {'models': [{'model', 'purged', 'skipped', 'duration_ms', 'error'}],
+        'purged', 'skipped', 'failed', 'workers', 'duration_ms'}.
+        """
+        if model_names is None:
+            model_names = self.env['res.config.settings']._get_enabled_model_names()
+        model_names = [name for name in model_names if name in self.env and 'x_is_deleted' in self.env[name]._fields]
+        start = time.perf_counter()
+        workers = self._get_worker_count()
+        levels = self._get_purge_levels(model_names)
+        lines = []
+
+        self.env.flush_all()
+        if self.env.registry.in_test_mode():
+            # Test cursors cannot be shared with other threads: purge sequentially
+            for level in levels:
+                for model_name in level:
+                    model_start = time.perf_counter()
+                    line = {'model': model_name, 'error': False}
+                    line.update(self._purge_model(model_name, chunk_size))
+                    line['duration_ms'] = round((time.perf_counter() - model_start) * 1000, 1)
+                    lines.append(line)
+        else:
+            for index, level in enumerate(levels):
+                pool_size = min(workers, len(level))
+                _logger.info(f"Purge level {index + 1}/{len(levels)}: {len(level)} models on {pool_size} workers")
+                with ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='soft_delete_purge') as executor:
+                    lines += executor.map(
+                        lambda model_name: _purge_model_in_worker(
+                            self.env.registry, self.env.uid, dict(self.env.context), model_name, chunk_size),
+                        level,
+                    )
+            self.env.invalidate_all()
+
+        report = {
+            'models': lines,
+            'purged': sum(line['purged'] for line in lines),
+            'skipped': sum(line['skipped'] for line in lines),
+            'failed': [line['model'] for line in lines if line['error']],
+            'workers': workers,
+            'duration_ms': round((time.perf_counter() - start) * 1000, 1),
+        }
+        _logger.info(
+            f"Purged {report['purged']} records in {len(lines)} models with {workers} workers "
+            f"in {report['duration_ms']:.0f}ms, {report['skipped']} skipped, "
+            f"{len(report['failed'])} failed: {report['failed']}"
+        )
+        return report
+
+    @api.model
+    def action_purge_all(self):
+        report = self.purge()
+        if report['failed']:
+            message = _("%(purged)s deleted records purged. Failed models: %(failed)s.",
+                        purged=report['purged'], failed=', '.join(report['failed']))
+        elif report['skipped']:
+            message = _("%(purged)s deleted records purged, %(skipped)s could not be deleted and were skipped.",
+                        purged=report['purged'], skipped=report['skipped'])
+        else:
+            message = _("%(purged)s deleted records purged in %(seconds).1fs.",
+                        purged=report['purged'], seconds=report['duration_ms'] / 1000)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Purge'),
+                'message': message,
+                'type': 'warning' if report['failed'] or report['skipped'] else 'success',
+                'sticky': bool(report['failed'] or report['skipped']),
+            },
+        }
@@ -0,0 +1,184 @@
+from odoo import models, api, tools, _
+from odoo.exceptions import UserError
+import logging
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 80
+
+
+class SoftDeleteRecoveryBrowser(models.AbstractModel):
+    _name = 'soft.delete.recovery.browser'
+    _description = 'Soft Delete Recovery Browser'
+
+    @api.model
+    def get_recovery_mode(self, model_name):
+        """Return 'virtual' to browse the source table directly, 'wizard' for the copied wizard table."""
+        if self.env['soft.delete.journal']._is_journal_model(model_name):
+            return 'virtual'
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        return ICPSudo.get_param('soft_delete_recocords_recovery.recovery_mode', 'virtual')
+
+    @api.model
+    @tools.ormcache('model_name')
+    def _get_recovery_config(self, model_name):
+        """
+        Return the (recovery mode, wizard model name) pair of an enabled model, or
+        False. Cached until the configuration or the registry changes.
+        """
+        if model_name not in self.env or 'x_is_deleted' not in self.env[model_name]._fields:
+            return False
+        mode = self.get_recovery_mode(model_name)
+        wizard_model_name = f"x_{model_name.replace('.', '_')}_wizard"
+        return (mode, wizard_model_name if wizard_model_name in self.env else False)
+
+    @api.model
+    def get_recover_action(self, model_name, view_type='list'):
+        """
+        Everything the Recover button needs in one call: populate the wizard table
+        when the recovery screen is a wizard, and return the action to open with the
+        number of deleted records.
+        """
+        config = self._get_recovery_config(model_name)
+        if not config:
+            raise UserError(_("Soft delete is not enabled for model %s.", model_name))
+        self._check_model(model_name)
+        mode, wizard_model_name = config
+        # cargo.short.name.master -> Cargo Short Name Master
+        title = _("%s Recover Deleted Records", ' '.join(word[:1].upper() + word[1:] for word in model_name.split('.')))
+
+        if mode == 'virtual':
+            action = {
+                'type': 'ir.actions.client',
+                'tag': 'soft_delete_recovery_browser',
+                'name': title,
+                'params': {'model': model_name},
+                'target': 'current',
+            }
+        else:
+            if not wizard_model_name:
+                raise UserError(_(
+                    "The recovery wizard of %s is missing. Please ensure the model is configured "
+                    "in Soft Delete Manager settings.", model_name))
+            self.env['res.config.settings'].populate_wizard_records(model_name, wizard_model_name)
+            view_mode = 'kanban' if view_type == 'kanban' else 'tree'
+            action = {
+                'type': 'ir.actions.act_window',
+                'name': title,
+                'res_model': wizard_model_name,
+                'view_mode': view_mode,
+                'views': [[False, view_mode]],
+                'target': 'current',
+                'domain': [('x_model_id.model', '=', model_name)],
+            }
+
+        counter = self.env['soft.delete.counter'].sudo().search([('model', '=', model_name)], limit=1)
+        return {'action': action, 'deleted_count': counter.deleted_count}
+
+    @api.model
+    def _get_sort_field(self, model):
+        """Name of the stored, untranslated char field usable for sorting and searching, if any."""
+        field = model._fields.get(model._rec_name)
+        if field and field.store and field.type == 'char' and not field.translate:
+            return field.name
+        return False
+
+    @api.model
+    def _search_user_ids(self, search):
+        """Ids of the users whose name matches ``search``, for the 'deleted by' part of the search box."""
+        return list(self.env['res.users'].sudo().with_context(active_test=False)._search([('name', 'ilike', search)]))
+
+    @api.model
+    def _check_model(self, model_name):
+        if model_name not in self.env or 'x_is_deleted' not in self.env[model_name]._fields:
+            raise UserError(_("Soft delete is not enabled for model %s.", model_name))
+        model = self.env[model_name].with_context(active_test=False, soft_delete_include_deleted=True)
+        model.check_access_rights('read')
+        return model
+
+    @api.model
+    def fetch_page(self, model_name, cursor=False, limit=DEFAULT_PAGE_SIZE, order='id', search='',
+                   deleted_from=False, deleted_to=False):
+        """
+        Return one page of soft-deleted records read directly from the source table.
+
+        Pagination is keyset based: ``cursor`` is the ``[sort_value, id]`` pair of the
+        last row of the previous page, so every page is an index range scan whatever
+        its position. ``order`` is ``'id'`` (newest first) or ``'name'`` (alphabetical,
+        only when the model's _rec_name is a stored char column). ``deleted_from`` and
+        ``deleted_to`` restrict the page to a deletion time range (x_deleted_at index).
+        ``search`` matches the name (trigram index), the original id or the user who
+        deleted the record.
+        """
+        model = self._check_model(model_name)
+        Journal = self.env['soft.delete.journal'].sudo()
+        if Journal._is_journal_model(model_name):
+            return Journal._fetch_page(model_name, cursor, limit, order, search, deleted_from, deleted_to)
+        sort_field = self._get_sort_field(model)
+        if order == 'name' and not sort_field:
+            order = 'id'
+
+        domain = [('x_is_deleted', '=', True)]
+        has_metadata = 'x_deleted_at' in model._fields
+        if has_metadata and deleted_from:
+            domain.append(('x_deleted_at', '>=', deleted_from))
+        if has_metadata and deleted_to:
+            domain.append(('x_deleted_at', '<=', deleted_to))
+
+        search = (search or '').strip()
+        if search:
+            search_domain = []
+            if sort_field:
+                search_domain.append(self.env['soft.delete.index']._get_name_search_domain(
+                    sort_field, model._table, search, where='x_is_deleted'))
+            if search.isdigit():
+                search_domain.append([('id', '=', int(search))])
+            if has_metadata:
+                search_domain.append([('x_deleted_by', 'in', self._search_user_ids(search))])
+            if not search_domain:
+                search_domain.append([('id', '=', 0)])
+            domain += ['|'] * (len(search_domain) - 1) + [leaf for leaves in search_domain for leaf in leaves]
+
+        if order == 'name':
+            if cursor:
+                value, last_id = cursor
+                domain += ['|', (sort_field, '>', value), '&', (sort_field, '=', value), ('id', '>', last_id)]
+            order_by = f'{sort_field} asc, id asc'
+        else:
+            if cursor:
+                domain += [('id', '<', cursor[1])]
+            order_by = 'id desc'
+
+        records = model.search(domain, order=order_by, limit=limit + 1)
+        has_more = len(records) > limit
+        records = records[:limit]
+
+        rows = [{'id': rec_id, 'display_name': name or f"Record {rec_id}"} for rec_id, name in records.name_get()]
+        if has_metadata:
+            metadata = {row['id']: row for row in records.read(['x_deleted_at', 'x_deleted_by'])}
+            for row in rows:
+                row['deleted_at'] = metadata[row['id']]['x_deleted_at']
+                row['deleted_by'] = metadata[row['id']]['x_deleted_by'] and metadata[row['id']]['x_deleted_by'][1]
+        next_cursor = False
+        if has_more and records:
+            last = records[-1]
+            next_cursor = [last[sort_field] if order == 'name' else last.id, last.id]
+
+        counter = self.env['soft.delete.counter'].sudo().search([('model', '=', model_name)], limit=1)
+        return {
+            'records': rows,
+            'next_cursor': next_cursor,
+            'total': counter.deleted_count,
+            'can_sort_by_name': bool(sort_field),
+            'has_metadata': has_metadata,
+        }
+
+    @api.model
+    def restore(self, model_name, record_ids):
+        self._check_model(model_name)
+        return self.env['res.config.settings'].restore_records(model_name, record_ids)
+
+    @api.model
+    def permanent_delete(self, model_name, record_ids):
+        self._check_model(model_name)
+        return self.env['res.config.settings'].permanent_delete_records(model_name, record_ids)
@@ -0,0 +1,160 @@
+from odoo import models, api, _
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Number of skipped record ids listed in the restore notification
+NOTIFICATION_ID_LIMIT = 20
+
+
+class SoftDeleteRestoreCheck(models.AbstractModel):
+    """
+    Pre-check of a restore: each selected record is classified as restorable,
+    conflicting (a unique key is now used by a live record) or orphaned (a
+    parent it requires is deleted), with one set-based query for the whole selection.
+    """
+    _name = 'soft.delete.restore.check'
+    _description = 'Soft Delete Restore Pre-Check'
+
+    @api.model
+    def _get_unique_keys(self, model):
+        """
+        Return [(constraint name, columns)] of the unique constraints and indexes of
+        the model's table, the primary key, expression and partial indexes excluded.
+        """
+        self.env.cr.execute("""
+            SELECT c.relname, array_agg(a.attname ORDER BY k.position)
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            JOIN unnest(i.indkey::int2[]) WITH ORDINALITY AS k(attnum, position) ON TRUE
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+            WHERE i.indrelid = %s::regclass AND i.indisunique AND NOT i.indisprimary
+              AND i.indexprs IS NULL AND i.indpred IS NULL
+            GROUP BY c.relname
+            ORDER BY c.relname
+        """, (f'"{model._table}"',))
+        return self.env.cr.fetchall()
+
+    @api.model
+    def _get_source_query(self, model, record_ids, journal):
+        """Rows to restore, with the columns of the model's table."""
+        if journal:
+            return f"""
+                SELECT (jsonb_populate_record(NULL::"{model._table}", j.payload)).*
+                FROM soft_delete_journal j
+                WHERE j.model = %s AND NOT j.is_cascade AND j.record_id = ANY(%s)
+            """, [model._name, list(record_ids)]
+        return f'SELECT * FROM "{model._table}" WHERE id = ANY(%s) AND x_is_deleted', [list(record_ids)]
+
+    @api.model
+    def _get_checks(self, model, record_ids, journal):
+        """Return [(SQL selecting the ids failing the check from ``s``, params, kind, reason)]."""
+        table = model._table
+        checks = []
+        # Other live rows, and the other rows of the selection, holding the same key
+        live = '' if journal else ' AND o.x_is_deleted IS NOT TRUE'
+        for constraint, columns in self._get_unique_keys(model):
+            same_key = ' AND '.join(f'o."{column}" = s."{column}"' for column in columns)
+            labels = ', '.join(model._fields[column].string if column in model._fields else column for column in columns)
+            checks.append((f"""
+                SELECT s.id FROM s WHERE EXISTS (SELECT 1 FROM "{table}" o WHERE o.id <> s.id{live} AND {same_key})
+                                      OR EXISTS (SELECT 1 FROM s o WHERE o.id < s.id AND {same_key})
+            """, [], 'conflicting', _("%s already used", labels)))
+        if journal:
+            checks.append((
+                f'SELECT s.id FROM s WHERE EXISTS (SELECT 1 FROM "{table}" o WHERE o.id = s.id)',
+                [], 'conflicting', _("ID already used")))
+
+        for field in model._fields.values():
+            if field.type != 'many2one' or not field.store or field.comodel_name not in self.env:
+                continue
+            Target = self.env[field.comodel_name]
+            if Target._abstract or not Target._auto:
+                continue
+            # Parents restored in the same selection are not missing
+            restored_together = ''
+            params = []
+            if field.comodel_name == model._name:
+                restored_together = f' AND NOT s."{field.name}" = ANY(%s)'
+                params = [list(record_ids)]
+            if field.required:
+                deleted = ' OR p.x_is_deleted' if 'x_is_deleted' in Target._fields else ''
+                condition = f"""
+                    s."{field.name}" IS NULL OR (
+                        EXISTS (SELECT 1 FROM "{Target._table}" p WHERE p.id = s."{field.name}" AND (FALSE{deleted}))
+                        OR NOT EXISTS (SELECT 1 FROM "{Target._table}" p WHERE p.id = s."{field.name}")
+                    ){restored_together}
+                """
+            elif journal:
+                # The re-inserted row would break the foreign key
+                condition = f"""
+                    s."{field.name}" IS NOT NULL
+                    AND NOT EXISTS (SELECT 1 FROM "{Target._table}" p WHERE p.id = s."{field.name}"){restored_together}
+                """
+            else:
+                continue
+            checks.append((f'SELECT s.id FROM s WHERE {condition}', params, 'orphaned',
+                           _("%s is deleted", field.string)))
+        return checks
+
+    @api.model
+    def _classify(self, model_name, record_ids):
+        """
+        Classify the selected records of ``model_name`` before a restore with one
+        query. Returns {'restorable': [ids], 'conflicting': {id: [reasons]},
+        'orphaned': {id: [reasons]}}; a record failing both checks is conflicting.
+        """
+        model = self.env[model_name]
+        journal = self.env['soft.delete.journal']._is_journal_model(model_name)
+        record_ids = list(dict.fromkeys(record_ids))
+        result = {'restorable': record_ids, 'conflicting': {}, 'orphaned': {}}
+        checks = self._get_checks(model, record_ids, journal)
+        if not record_ids or not checks:
+            return result
+
+        if not journal:
+            model.flush_model()
+        source, params = self._get_source_query(model, record_ids, journal)
+        parts = []
+        for index, (query, check_params, __, __) in enumerate(checks):
+            parts.append(f'SELECT {index} AS check_index, failed.id FROM ({query}) failed')
+            params += check_params
+        self.env.cr.execute(f'WITH s AS ({source}) ' + ' UNION ALL '.join(parts), params)
+
+        for index, record_id in self.env.cr.fetchall():
+            __, __, kind, reason = checks[index]
+            result[kind].setdefault(record_id, []).append(reason)
+        for record_id in result['conflicting']:
+            result['orphaned'].pop(record_id, None)
+        skipped = set(result['conflicting']) | set(result['orphaned'])
+        result['restorable'] = [record_id for record_id in record_ids if record_id not in skipped]
+        if skipped:
+            _logger.warning(
+                f"Restore pre-check of {model_name}: {len(result['conflicting'])} conflicting, "
+                f"{len(result['orphaned'])} orphaned records skipped"
+            )
+        return result
+
+    @api.model
+    def _get_skipped_notification(self, model_name, result):
+        """Notification action listing the records left out of the restore, or False."""
+        lines = []
+        for kind, title in (('conflicting', _("Conflicting")), ('orphaned', _("Orphaned"))):
+            for record_id, reasons in list(result[kind].items())[:NOTIFICATION_ID_LIMIT]:
+                lines.append(f"{title} #{record_id}: {'; '.join(reasons)}")
+        if not lines:
+            return False
+        skipped = len(result['conflicting']) + len(result['orphaned'])
+        if skipped > len(lines):
+            lines.append(_("... and %s more", skipped - len(lines)))
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _("%(restored)s %(model)s records restored, %(skipped)s skipped",
+                           restored=len(result['restorable']), model=model_name, skipped=skipped),
+                'message': '\n'.join(lines),
+                'type': 'warning',
+                'sticky': True,
+            },
+        }
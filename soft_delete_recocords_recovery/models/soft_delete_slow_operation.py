@@ -0,0 +1,119 @@
+from odoo import models, fields, api
+from contextlib import contextmanager
+from datetime import timedelta
+import cProfile
+import io
+import json
+import logging
+import pstats
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_SLOW_THRESHOLD_MS = 1000
+SLOW_OPERATION_RETENTION_DAYS = 30
+
+# Only the outermost operation of a thread is profiled: cProfile cannot nest
+_profiling = threading.local()
+
+
+class SoftDeleteProfiler:
+    """Collects wall time, SQL query count and row count of an operation and its phases."""
+
+    def __init__(self, env, operation, model_name=False):
+        self.env = env
+        self.operation = operation
+        self.model_name = model_name
+        self.rows = 0
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name):
+        """Measure one phase; the yielded dict's 'rows' entry may be set by the caller."""
+        cr = self.env.cr
+        stats = {'rows': 0}
+        queries = cr.sql_log_count
+        start = time.perf_counter()
+        yield stats
+        self.phases.append({
+            'phase': name,
+            'duration_ms': round((time.perf_counter() - start) * 1000, 1),
+            'queries': cr.sql_log_count - queries,
+            'rows': stats['rows'],
+        })
+
+
+@contextmanager
+def soft_delete_profiler(env, operation, model_name=False):
+    """
+    Profile a soft delete operation. Operations slower than the configured threshold
+    are stored in soft.delete.slow.operation, with a cProfile report when profiling
+    is enabled (setting, or ``soft_delete_profile`` context key).
+    """
+    ICPSudo = env['ir.config_parameter'].sudo()
+    threshold_ms = int(ICPSudo.get_param('soft_delete_recocords_recovery.slow_threshold_ms', DEFAULT_SLOW_THRESHOLD_MS))
+    profile_enabled = (
+        env.context.get('soft_delete_profile')
+        or ICPSudo.get_param('soft_delete_recocords_recovery.profile', 'False') == 'True'
+    )
+
+    profiler = SoftDeleteProfiler(env, operation, model_name)
+    cprofile = None
+    if profile_enabled and not getattr(_profiling, 'active', False):
+        cprofile = cProfile.Profile()
+        _profiling.active = True
+        cprofile.enable()
+
+    queries = env.cr.sql_log_count
+    start = time.perf_counter()
+    try:
+        yield profiler
+    finally:
+        if cprofile:
+            cprofile.disable()
+            _profiling.active = False
+
+    duration_ms = (time.perf_counter() - start) * 1000
+    query_count = env.cr.sql_log_count - queries
+    _logger.debug(
+        f"{operation} on {model_name or '-'}: {duration_ms:.1f}ms, {query_count} queries, "
+        f"{profiler.rows} rows, phases={profiler.phases}"
+    )
+    if threshold_ms and duration_ms >= threshold_ms:
+        profile_report = False
+        if cprofile:
+            stream = io.StringIO()
+            pstats.Stats(cprofile, stream=stream).sort_stats('cumulative').print_stats(40)
+            profile_report = stream.getvalue()
+        env['soft.delete.slow.operation'].sudo().create({
+            'operation': operation,
+            'model': model_name,
+            'duration_ms': duration_ms,
+            'query_count': query_count,
+            'row_count': profiler.rows,
+            'phases': json.dumps(profiler.phases, indent=2),
+            'user_id': env.uid,
+            'profile': profile_report,
+        })
+        _logger.warning(f"Slow soft delete operation {operation} on {model_name or '-'}: {duration_ms:.0f}ms, {query_count} queries")
+
+
+class SoftDeleteSlowOperation(models.Model):
+    _name = 'soft.delete.slow.operation'
+    _description = 'Soft Delete Slow Operation'
+    _order = 'id desc'
+
+    operation = fields.Char(string='Operation', required=True, readonly=True, index=True)
+    model = fields.Char(string='Model Name', readonly=True, index=True)
+    duration_ms = fields.Float(string='Duration (ms)', readonly=True, digits=(16, 1))
+    query_count = fields.Integer(string='SQL Queries', readonly=True)
+    row_count = fields.Integer(string='Rows', readonly=True)
+    phases = fields.Text(string='Phases', readonly=True)
+    user_id = fields.Many2one('res.users', string='User', readonly=True, ondelete='set null')
+    profile = fields.Text(string='Profile', readonly=True)
+
+    @api.autovacuum
+    def _gc_slow_operations(self):
+        limit_date = fields.Datetime.now() - timedelta(days=SLOW_OPERATION_RETENTION_DAYS)
+        self.search([('create_date', '<', limit_date)]).unlink()
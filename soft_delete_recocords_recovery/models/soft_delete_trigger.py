@@ -0,0 +1,182 @@
+from odoo import models, api
+from contextlib import contextmanager
+import hashlib
+import logging
+import psycopg2
+import uuid
+
+_logger = logging.getLogger(__name__)
+
+# Bump when the generated trigger function changes: outdated triggers are replaced on the next sync
+TRIGGER_VERSION = 2
+TRIGGER_NAME = 'soft_delete_before_delete'
+COUNT_TRIGGER_NAME = 'soft_delete_after_delete_count'
+TRIGGER_COMMENT = 'soft_delete_recocords_recovery:v%s'
+FUNCTION_SUFFIX = 'soft_delete_fn'
+
+
+@contextmanager
+def soft_delete_trigger_bypass(cr):
+    """Let the DELETE statements run inside the block reach the tables in database mode."""
+    cr.execute("SELECT set_config('soft_delete.bypass', 'on', true)")
+    try:
+        yield
+    finally:
+        try:
+            cr.execute("SELECT set_config('soft_delete.bypass', 'off', true)")
+        except psycopg2.errors.InFailedSqlTransaction:
+            # The setting is transaction-local: it goes away with the rollback
+            pass
+
+
+class SoftDeleteTrigger(models.AbstractModel):
+    """
+    Database mode: a BEFORE DELETE trigger turns every DELETE on the table, from
+    the ORM or from raw SQL, into an UPDATE flagging the row as deleted. The rows
+    are tallied in a transaction-local setting and added to the deleted counter
+    once per statement by an AFTER DELETE statement trigger.
+    """
+    _name = 'soft.delete.trigger'
+    _description = 'Soft Delete Database Trigger'
+
+    @api.model
+    def _is_trigger_model(self, model_name):
+        return model_name in self.env['soft.delete.model.policy']._get_trigger_model_names()
+
+    @api.model
+    def _get_function_name(self, table_name):
+        """Build the trigger function name, shortened with a hash to fit PostgreSQL's 63 characters."""
+        name = f"{table_name}_{FUNCTION_SUFFIX}"
+        if len(name) > 63:
+            digest = hashlib.md5(table_name.encode()).hexdigest()[:8]
+            name = f"{table_name[:62 - len(FUNCTION_SUFFIX) - 9]}_{digest}_{FUNCTION_SUFFIX}"
+        return name
+
+    @api.model
+    def _get_installed_triggers(self):
+        """Return {table name: (function name, comment)} of the installed soft delete triggers."""
+        self.env.cr.execute("""
+            SELECT c.relname, p.proname, obj_description(p.oid, 'pg_proc')
+            FROM pg_trigger t
+            JOIN pg_class c ON c.oid = t.tgrelid
+            JOIN pg_proc p ON p.oid = t.tgfoid
+            WHERE t.tgname = %s
+        """, (TRIGGER_NAME,))
+        return {row[0]: (row[1], row[2]) for row in self.env.cr.fetchall()}
+
+    @api.model
+    def _install(self, model_name):
+        """Create or replace the trigger function and trigger of ``model_name``."""
+        cr = self.env.cr
+        Model = self.env[model_name]
+        table = Model._table
+        function_name = self._get_function_name(table)
+
+        assignments = ["x_is_deleted = TRUE"]
+        if 'x_deleted_at' in Model._fields:
+            # Raw SQL deletes have no batch set by the ORM: one batch per statement
+            assignments += [
+                "x_deleted_at = now() at time zone 'UTC'",
+                "x_deleted_by = NULLIF(current_setting('soft_delete.uid', true), '')::int",
+                "x_delete_batch_id = COALESCE(NULLIF(current_setting('soft_delete.batch_id', true), ''), "
+                "'db-' || txid_current() || '-' || floor(extract(epoch FROM statement_timestamp()) * 1000))",
+            ]
+        if Model._log_access:
+            assignments.append("write_date = now() at time zone 'UTC'")
+
+        # The same function serves both triggers: each converted row bumps a
+        # transaction-local tally, the statement trigger upserts the counter once.
+        # A transition table would stay empty, the BEFORE trigger cancelling the deletes.
+        cr.execute(f"""
+            CREATE OR REPLACE FUNCTION "{function_name}"() RETURNS trigger LANGUAGE plpgsql AS $fn$
+            DECLARE
+                converted int;
+            BEGIN
+                IF TG_LEVEL = 'STATEMENT' THEN
+                    converted := COALESCE(NULLIF(current_setting(%(tally)s, true), ''), '0')::int;
+                    IF converted > 0 THEN
+                        PERFORM set_config(%(tally)s, '0', true);
+                        INSERT INTO soft_delete_counter (model, model_id, deleted_count, create_date, write_date)
+                        VALUES (%(model)s, (SELECT id FROM ir_model WHERE model = %(model)s), converted,
+                                now() at time zone 'UTC', now() at time zone 'UTC')
+                        ON CONFLICT (model) DO UPDATE
+                        SET deleted_count = soft_delete_counter.deleted_count + EXCLUDED.deleted_count;
+                    END IF;
+                    RETURN NULL;
+                END IF;
+                IF current_setting('soft_delete.bypass', true) = 'on' THEN
+                    RETURN OLD;
+                END IF;
+                IF OLD.x_is_deleted IS NOT TRUE THEN
+                    UPDATE "{table}" SET {', '.join(assignments)} WHERE id = OLD.id;
+                    PERFORM set_config(%(tally)s, (COALESCE(NULLIF(current_setting(%(tally)s, true), ''), '0')::int + 1)::text, true);
+                END IF;
+                RETURN NULL;
+            END
+            $fn$
+        """, {'model': model_name, 'tally': f'soft_delete.converted_{table}'})
+        cr.execute(f'COMMENT ON FUNCTION "{function_name}"() IS %s', (TRIGGER_COMMENT % TRIGGER_VERSION,))
+        cr.execute(f'DROP TRIGGER IF EXISTS {TRIGGER_NAME} ON "{table}"')
+        cr.execute(f'DROP TRIGGER IF EXISTS {COUNT_TRIGGER_NAME} ON "{table}"')
+        cr.execute(f"""
+            CREATE TRIGGER {TRIGGER_NAME} BEFORE DELETE ON "{table}"
+            FOR EACH ROW EXECUTE FUNCTION "{function_name}"()
+        """)
+        cr.execute(f"""
+            CREATE TRIGGER {COUNT_TRIGGER_NAME} AFTER DELETE ON "{table}"
+            FOR EACH STATEMENT EXECUTE FUNCTION "{function_name}"()
+        """)
+        _logger.info(f"Installed soft delete trigger v{TRIGGER_VERSION} on {table}")
+
+    @api.model
+    def _uninstall(self, table_name, function_name):
+        self.env.cr.execute(f'DROP FUNCTION IF EXISTS "{function_name}"() CASCADE')
+        _logger.info(f"Removed soft delete trigger from {table_name}")
+
+    @api.model
+    def _sync_triggers(self):
+        """
+        Install the triggers of the enabled models in database mode, replace the
+        outdated ones and remove those of the other models.
+        """
+        enabled = set(self.env['res.config.settings']._get_enabled_model_names())
+        wanted = {
+            self.env[model_name]._table: model_name
+            for model_name in self.env['soft.delete.model.policy']._get_trigger_model_names()
+            if model_name in enabled and model_name in self.env and 'x_is_deleted' in self.env[model_name]._fields
+        }
+        installed = self._get_installed_triggers()
+        for table_name, (function_name, comment) in installed.items():
+            if table_name not in wanted:
+                self._uninstall(table_name, function_name)
+        for table_name, model_name in wanted.items():
+            if installed.get(table_name, (None, None))[1] != TRIGGER_COMMENT % TRIGGER_VERSION:
+                self.env[model_name].flush_model()
+                self._install(model_name)
+
+    @api.model
+    def _delete(self, records):
+        """
+        Soft-delete ``records`` of a model in database mode with a single DELETE
+        statement, converted by the trigger, then soft-delete their ondelete='cascade'
+        children in the same batch. Returns the deletion batch id.
+        """
+        cr = self.env.cr
+        model_name = records._name
+        records.check_access_rights('unlink')
+        records.check_access_rule('unlink')
+        records.flush_model()
+        to_delete = records.filtered(lambda rec: not rec.x_is_deleted)
+        batch_id = uuid.uuid4().hex
+        cr.execute("""
+            SELECT set_config('soft_delete.uid', %s, true), set_config('soft_delete.batch_id', %s, true)
+        """, (str(self.env.uid), batch_id))
+        cr.execute(f'DELETE FROM "{records._table}" WHERE id = ANY(%s)', (records.ids,))
+        cr.execute("SELECT set_config('soft_delete.uid', '', true), set_config('soft_delete.batch_id', '', true)")
+        records.invalidate_model()
+
+        Counter = self.env['soft.delete.counter'].sudo()
+        Counter.invalidate_model(['deleted_count'])
+        Counter._invalidate_deleted_count_cache([model_name])
+        self.env['soft.delete.cascade'].sudo()._cascade_soft_delete(model_name, to_delete.ids, batch_id)
+        return batch_id
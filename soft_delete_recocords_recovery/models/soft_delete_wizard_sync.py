@@ -0,0 +1,197 @@
+from odoo import models, api
+from odoo.tools import sql
+import logging
+import time
+
+_logger = logging.getLogger(__name__)
+
+# Number of records whose display name is computed per name_get() call
+DISPLAY_NAME_CHUNK_SIZE = 1000
+
+
+class SoftDeleteWizardSync(models.AbstractModel):
+    _name = 'soft.delete.wizard.sync'
+    _description = 'Soft Delete Wizard Sync Engine'
+
+    @api.model
+    def _ensure_wizard_unique_index(self, wizard_model_name):
+        """
+        Ensure the (x_model_id, x_record_id) unique index exists on the wizard table,
+        removing duplicated rows left by the previous row-by-row population first.
+        """
+        cr = self.env.cr
+        table = self.env[wizard_model_name]._table
+        index_name = f"{table}_model_record_uniq"
+
+        if sql.index_exists(cr, index_name):
+            return index_name
+
+        cr.execute(f"""
+            DELETE FROM "{table}" a
+            USING "{table}" b
+            WHERE a.x_model_id = b.x_model_id
+              AND a.x_record_id = b.x_record_id
+              AND a.id > b.id
+        """)
+        if cr.rowcount:
+            _logger.info(f"Removed {cr.rowcount} duplicated rows from {table}")
+
+        sql.create_unique_index(cr, index_name, table, ['"x_model_id"', '"x_record_id"'])
+        _logger.info(f"Created unique index {index_name} on {table}")
+        return index_name
+
+    @api.model
+    def _ensure_wizard_name_index(self, wizard_model_name):
+        """Ensure the wizard table has a name search index on x_display_name (trigram when available)."""
+        cr = self.env.cr
+        table = self.env[wizard_model_name]._table
+        index_name = f"{table}_display_name_search_idx"
+        if not sql.index_exists(cr, index_name):
+            definition = self.env['soft.delete.index']._get_name_index_definition('x_display_name')
+            cr.execute(f'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{table}" {definition}')
+            _logger.info(f"Created name search index {index_name} on {table}")
+        return index_name
+
+    @api.model
+    def _get_stored_name_column(self, model):
+        """
+        Column holding the display name as is: the model keeps the default name_get()
+        and its _rec_name is a stored, untranslated char column. False otherwise.
+        """
+        model_class = type(model)
+        if (model_class.name_get is not models.BaseModel.name_get
+                or model_class._compute_display_name is not models.BaseModel._compute_display_name):
+            return False
+        return self.env['soft.delete.recovery.browser']._get_sort_field(model)
+
+    @api.model
+    def _get_display_name_dependencies(self, model):
+        """Field paths read by the display name: the declared dependencies and the _rec_name."""
+        paths = set(model.pool.field_depends[model._fields['display_name']])
+        if model._rec_name:
+            paths.add(model._rec_name)
+        return sorted(path for path in paths if path.split('.')[0] in model._fields)
+
+    @api.model
+    def _get_prefetched_models(self, model, dependencies):
+        """The model and the comodels traversed by the display name dependencies."""
+        prefetched = {model._name: model}
+        for path in dependencies:
+            current = model
+            for name in path.split('.'):
+                field = current._fields.get(name)
+                if not field or not field.relational:
+                    break
+                current = current.env[field.comodel_name]
+                prefetched.setdefault(current._name, current)
+        return list(prefetched.values())
+
+    @api.model
+    def _compute_display_names(self, model_name, record_ids):
+        """
+        Return {record_id: display_name} computed in chunks of DISPLAY_NAME_CHUNK_SIZE.
+
+        When the display name is a stored column it is selected directly. Otherwise the
+        display name dependencies of each chunk are prefetched with one query per field
+        before name_get(), and the cache of the prefetched models is emptied after each chunk
+        so that memory is bounded by the chunk size rather than by the number of deleted records.
+        """
+        model = self.env[model_name].with_context(active_test=False, soft_delete_include_deleted=True)
+        names = {}
+        column = self._get_stored_name_column(model)
+        if column:
+            model.flush_model([column])
+            for start in range(0, len(record_ids), DISPLAY_NAME_CHUNK_SIZE):
+                self.env.cr.execute(
+                    f'SELECT id, "{column}" FROM "{model._table}" WHERE id = ANY(%s)',
+                    (record_ids[start:start + DISPLAY_NAME_CHUNK_SIZE],)
+                )
+                names.update(self.env.cr.fetchall())
+            return names
+
+        dependencies = self._get_display_name_dependencies(model)
+        prefetched = self._get_prefetched_models(model, dependencies)
+        for start in range(0, len(record_ids), DISPLAY_NAME_CHUNK_SIZE):
+            records = model.browse(record_ids[start:start + DISPLAY_NAME_CHUNK_SIZE])
+            for path in dependencies:
+                records.mapped(path)
+            names.update(records.name_get())
+            for Prefetched in prefetched:
+                Prefetched.invalidate_model()
+        return names
+
+    @api.model
+    def sync(self, model_name, wizard_model_name):
+        """
+        Reconcile the wizard table of ``model_name`` with its soft-deleted records
+        using set-based statements:
+
+        - one INSERT ... SELECT with an anti-join for the missing rows,
+        - one UPDATE per chunk to fill the display names of the inserted rows,
+        - one DELETE ... WHERE NOT EXISTS for the stale rows.
+
+        Returns a dict with the number of inserted and removed rows and the duration.
+        """
+        start = time.perf_counter()
+        cr = self.env.cr
+        model = self.env[model_name]
+        wizard_model = self.env[wizard_model_name]
+        source_table = model._table
+        wizard_table = wizard_model._table
+
+        ir_model_id = self.env['ir.model']._get_id(model_name)
+        self._ensure_wizard_unique_index(wizard_model_name)
+        self._ensure_wizard_name_index(wizard_model_name)
+
+        # Flush pending ORM writes (e.g. soft deletes of this transaction) before raw SQL
+        model.flush_model(['x_is_deleted'])
+        wizard_model.flush_model()
+
+        cr.execute(f"""
+            DELETE FROM "{wizard_table}" w
+            WHERE w.x_model_id = %s
+              AND NOT EXISTS (
+                  SELECT 1 FROM "{source_table}" s
+                  WHERE s.id = w.x_record_id AND s.x_is_deleted
+              )
+        """, (ir_model_id,))
+        removed = cr.rowcount
+
+        cr.execute(f"""
+            INSERT INTO "{wizard_table}"
+                (x_model_id, x_record_id, create_uid, write_uid, create_date, write_date)
+            SELECT %s, s.id, %s, %s, now() at time zone 'UTC', now() at time zone 'UTC'
+            FROM "{source_table}" s
+            WHERE s.x_is_deleted
+              AND NOT EXISTS (
+                  SELECT 1 FROM "{wizard_table}" w
+                  WHERE w.x_model_id = %s AND w.x_record_id = s.id
+              )
+            ON CONFLICT (x_model_id, x_record_id) DO NOTHING
+            RETURNING x_record_id
+        """, (ir_model_id, self.env.uid, self.env.uid, ir_model_id))
+        inserted_ids = [row[0] for row in cr.fetchall()]
+
+        if inserted_ids:
+            names = self._compute_display_names(model_name, inserted_ids)
+            for chunk_start in range(0, len(inserted_ids), DISPLAY_NAME_CHUNK_SIZE):
+                chunk = inserted_ids[chunk_start:chunk_start + DISPLAY_NAME_CHUNK_SIZE]
+                cr.execute(f"""
+                    UPDATE "{wizard_table}" w
+                    SET x_display_name = n.name
+                    FROM unnest(%s::int[], %s::varchar[]) AS n(record_id, name)
+                    WHERE w.x_model_id = %s AND w.x_record_id = n.record_id
+                """, (chunk, [names.get(rid) or f"Record {rid}" for rid in chunk], ir_model_id))
+
+        wizard_model.invalidate_model()
+
+        result = {
+            'inserted': len(inserted_ids),
+            'removed': removed,
+            'duration': time.perf_counter() - start,
+        }
+        _logger.info(
+            f"Synced {wizard_model_name} for {model_name}: "
+            f"{result['inserted']} inserted, {result['removed']} removed in {result['duration']:.3f}s"
+        )
+        return result
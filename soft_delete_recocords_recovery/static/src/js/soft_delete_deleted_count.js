@@ -0,0 +1,45 @@
+/** @odoo-module */
+import { useService, useBus } from "@web/core/utils/hooks";
+import { debounce } from "@web/core/utils/timing";
+import { onMounted, useState } from "@odoo/owl";
+
+// Models whose count was asked during the current tick, answered by one request
+let pending = null;
+
+function fetchDeletedCount(rpc, modelName) {
+    if (!pending) {
+        const batch = { models: new Set(), promise: null };
+        batch.promise = Promise.resolve().then(() => {
+            pending = null;
+            return rpc("/soft_delete_recocords_recovery/deleted_counts", {
+                models: [...batch.models],
+            });
+        });
+        pending = batch;
+    }
+    pending.models.add(modelName);
+    return pending.promise.then((counts) => counts[modelName] || 0);
+}
+
+/**
+ * Deleted-record count of the controller's model for the header badge. It is
+ * loaded after the view is mounted, so it never delays opening the view, and
+ * refreshed, debounced, when the records of the view are reloaded.
+ */
+export function useDeletedCount(controller) {
+    const rpc = useService("rpc");
+    const state = useState({ deletedCount: 0 });
+    const load = async () => {
+        try {
+            state.deletedCount = await fetchDeletedCount(rpc, controller.props.resModel);
+        } catch (err) {
+            console.warn("Could not load the deleted record count", {
+                model: controller.props.resModel,
+                error: err.message || err,
+            });
+        }
+    };
+    onMounted(load);
+    useBus(controller.model, "update", debounce(load, 500));
+    return state;
+}
@@ -3,13 +3,15 @@ import { KanbanController } from "@web/views/kanban/kanban_controller";
 import { registry } from "@web/core/registry";
 import { kanbanView } from "@web/views/kanban/kanban_view";
 import { useService } from "@web/core/utils/hooks";
+import { useDeletedCount } from "./soft_delete_deleted_count";
 
 export class SoftDeleteManagerKanbanController extends KanbanController {
     setup() {
         super.setup();
-        this.orm = useService("orm");
+        this.rpc = useService("rpc");
         this.actionService = useService("action");
         this.notification = useService("notification");
+        this.softDelete = useDeletedCount(this);
 
         console.info("SoftDeleteManagerKanbanController initialized", {
             model: this.props.resModel,
@@ -19,68 +21,23 @@ export class SoftDeleteManagerKanbanController extends KanbanController {
     async onRecoverClick() {
         console.log("Recover button clicked in Kanban");
         const modelName = this.props.resModel;
-        const wizardModelName = `x_${modelName.replace(/\./g, '_')}_wizard`;
-
-        console.info("Preparing to populate wizard records", {
-            modelName,
-            wizardModelName,
-        });
 
         try {
-            // Find the server action
-            const serverActions = await this.orm.searchRead(
-                'ir.actions.server',
-                [['name', '=', `Populate ${wizardModelName} Records`]],
-                ['id'],
-                { limit: 1 }
-            );
-
-            if (!serverActions.length) {
-                console.error("Server action not found", {
-                    actionName: `Populate ${wizardModelName} Records`,
-                    wizardModelName,
-                    modelName,
-                });
-                this.notification.add(
-                    `Server action 'Populate ${wizardModelName} Records' not found. Please ensure the model '${modelName}' is configured in Soft Delete Manager settings.`,
-                    { type: "danger", sticky: true }
-                );
-                return;
-            }
-
-            const serverActionId = serverActions[0].id;
-            console.info("Found server action", { serverActionId, wizardModelName });
-
-            // Execute the server action
-            await this.orm.call('ir.actions.server', 'run', [serverActionId]);
-            console.info("Wizard records populated successfully", { wizardModelName });
-
-            // Nice display name: cargo.short.name.master → Cargo Short Name Master
-            const displayModelName = modelName
-                .split('.')
-                .map(word => word.charAt(0).toUpperCase() + word.slice(1))
-                .join(' ');
-
-            // Open the recovery wizard
-            await this.actionService.doAction({
-                type: 'ir.actions.act_window',
-                name: `${displayModelName} Recover Deleted Records`,
-                res_model: wizardModelName,
-                view_mode: 'kanban',
-                views: [[false, 'kanban']],
-                target: 'current',
-                domain: [['x_model_id.model', '=', modelName]],
+            // One round trip: the server populates the trash when needed and returns the action to open
+            const result = await this.rpc("/soft_delete_recocords_recovery/recover", {
+                model: modelName,
+                view_type: "kanban",
             });
-
-            console.log("Recovery wizard opened", {
-                wizardModelName,
-                title: `${displayModelName} Recover Deleted Records`
+            this.softDelete.deletedCount = result.deleted_count;
+            await this.actionService.doAction(result.action);
+            console.info("Recovery screen opened", {
+                modelName,
+                deletedCount: result.deleted_count,
             });
         } catch (err) {
             console.error("Error in onRecoverClick (Kanban)", {
                 error: err.message || err,
                 modelName,
-                wizardModelName,
             });
             this.notification.add(
                 `Error: ${err.message || "Could not recover records"}`,
@@ -0,0 +1,178 @@
+/** @odoo-module */
+import { Component, onWillStart, useState } from "@odoo/owl";
+import { registry } from "@web/core/registry";
+import { useService } from "@web/core/utils/hooks";
+import { ConfirmationDialog } from "@web/core/confirmation_dialog/confirmation_dialog";
+
+// Recovery screen reading soft-deleted records straight from the source table,
+// page by page (keyset pagination), without copying them to a wizard model.
+export class SoftDeleteRecoveryBrowser extends Component {
+    setup() {
+        this.orm = useService("orm");
+        this.dialog = useService("dialog");
+        this.notification = useService("notification");
+        this.actionService = useService("action");
+        this.modelName = this.props.action.params.model;
+
+        this.state = useState({
+            records: [],
+            selectedIds: [],
+            search: "",
+            deletedFrom: "",
+            deletedTo: "",
+            hasMetadata: false,
+            order: "id",
+            // cursors[i] is the cursor used to load page i
+            cursors: [false],
+            page: 0,
+            nextCursor: false,
+            total: 0,
+            canSortByName: false,
+            loading: false,
+        });
+
+        console.info("SoftDeleteRecoveryBrowser initialized", { model: this.modelName });
+        onWillStart(() => this.loadPage());
+    }
+
+    async loadPage() {
+        this.state.loading = true;
+        try {
+            const result = await this.orm.call(
+                'soft.delete.recovery.browser',
+                'fetch_page',
+                [this.modelName],
+                {
+                    cursor: this.state.cursors[this.state.page],
+                    order: this.state.order,
+                    search: this.state.search,
+                    deleted_from: this.state.deletedFrom || false,
+                    // Inclusive upper bound: the whole selected day
+                    deleted_to: this.state.deletedTo ? `${this.state.deletedTo} 23:59:59` : false,
+                }
+            );
+            this.state.records = result.records;
+            this.state.nextCursor = result.next_cursor;
+            this.state.total = result.total;
+            this.state.canSortByName = result.can_sort_by_name;
+            this.state.hasMetadata = result.has_metadata;
+            this.state.selectedIds = [];
+        } finally {
+            this.state.loading = false;
+        }
+    }
+
+    reset() {
+        this.state.cursors = [false];
+        this.state.page = 0;
+        return this.loadPage();
+    }
+
+    onSearchKeydown(ev) {
+        if (ev.key === "Enter") {
+            this.state.search = ev.target.value;
+            this.reset();
+        }
+    }
+
+    onDeletedFromChange(ev) {
+        this.state.deletedFrom = ev.target.value;
+        this.reset();
+    }
+
+    onDeletedToChange(ev) {
+        this.state.deletedTo = ev.target.value;
+        this.reset();
+    }
+
+    onSortClick(order) {
+        this.state.order = order;
+        this.reset();
+    }
+
+    onNextClick() {
+        if (!this.state.nextCursor) {
+            return;
+        }
+        this.state.cursors = [...this.state.cursors.slice(0, this.state.page + 1), this.state.nextCursor];
+        this.state.page += 1;
+        this.loadPage();
+    }
+
+    onPreviousClick() {
+        if (!this.state.page) {
+            return;
+        }
+        this.state.page -= 1;
+        this.loadPage();
+    }
+
+    isSelected(recordId) {
+        return this.state.selectedIds.includes(recordId);
+    }
+
+    get allSelected() {
+        return this.state.records.length > 0 && this.state.selectedIds.length === this.state.records.length;
+    }
+
+    toggleRecord(recordId) {
+        if (this.isSelected(recordId)) {
+            this.state.selectedIds = this.state.selectedIds.filter((id) => id !== recordId);
+        } else {
+            this.state.selectedIds = [...this.state.selectedIds, recordId];
+        }
+    }
+
+    toggleAll() {
+        this.state.selectedIds = this.allSelected ? [] : this.state.records.map((record) => record.id);
+    }
+
+    onRestoreClick() {
+        this.confirmAndRun(
+            "Are you sure you want to restore the selected records?",
+            'restore',
+            "restored"
+        );
+    }
+
+    onPermanentDeleteClick() {
+        this.confirmAndRun(
+            "Are you sure you want to permanently delete the selected records?",
+            'permanent_delete',
+            "permanently deleted"
+        );
+    }
+
+    confirmAndRun(body, method, verb) {
+        const recordIds = [...this.state.selectedIds];
+        if (!recordIds.length) {
+            return;
+        }
+        this.dialog.add(ConfirmationDialog, {
+            body,
+            confirm: async () => {
+                try {
+                    const result = await this.orm.call('soft.delete.recovery.browser', method, [this.modelName, recordIds]);
+                    if (result && result.type) {
+                        // Large selections are queued as a background job
+                        await this.actionService.doAction(result);
+                    } else {
+                        this.notification.add(`${recordIds.length} records ${verb}.`, { type: "success" });
+                    }
+                    console.info("Recovery browser operation done", { method, model: this.modelName, count: recordIds.length });
+                } catch (err) {
+                    console.error("Error in recovery browser operation", { method, error: err.message || err });
+                    this.notification.add(
+                        `Error: ${err.message || "Operation failed"}`,
+                        { type: "danger", sticky: true }
+                    );
+                }
+                await this.loadPage();
+            },
+        });
+    }
+}
+
+SoftDeleteRecoveryBrowser.template = "soft_delete_manager.RecoveryBrowser";
+
+registry.category("actions").add("soft_delete_recovery_browser", SoftDeleteRecoveryBrowser);